@@ -0,0 +1,448 @@
+"""
+Escenarios del juego (mapas del campus).
+
+Cada zona (Zona Verde, Auditorio, Parqueo) es una imagen de fondo de la raíz
+del repo más un mapa de baldosas en GUI/Mapas/<zona>.json. En "filas" cada
+carácter es una baldosa de `tile` píxeles (la primera fila es la de arriba
+de la imagen):
+
+    .   libre
+    #   colisión (paredes, árboles, carros...)
+    :   pasto alto (puede salir un pokemon salvaje)
+    A-Z warp: al pisarlo se pasa a warps[letra]["destino"] en "llegada"
+
+Las coordenadas de baldosa (col, fila) cuentan desde abajo a la izquierda,
+como las de arcade.
+
+- MapaTiles: las capas lógicas (colisión, pasto, warps), sin OpenGL.
+- FondoPorChunks: la imagen de fondo partida en pedazos que se cargan en
+  segundo plano según la distancia a la cámara; solo se dibujan los que
+  se ven. El costo por frame y la memoria de GPU dependen de la ventana,
+  no del tamaño del mapa.
+- Escenario: el fondo, una SpriteList por capa de depuración
+  (colisión/pasto/warps), la grilla de colisiones de la zona
+  (GUI/colisiones.py) donde también se registran los NPCs y la grilla de
+  rutas para los NPCs (GUI/navegacion.py).
+- GestorEscenarios: arma todos los escenarios una vez con el fondo de los
+  puntos de llegada ya subido; cambiar de zona es elegir otro Escenario.
+
+Benchmark (la cámara recorriendo mapas de distintos tamaños):
+    python -m GUI.Escenarios
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Tuple
+
+import arcade
+
+from GUI.colisiones import HashEspacial
+from GUI.navegacion import GrillaNavegacion
+from Logic.Class.Paquete import IMAGENES, TAMAÑO_CHUNK, paquete_juego, recortar_chunk
+
+MAPAS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Mapas")
+MAPAS = ("zona_verde", "auditorio", "parqueo")
+
+LIBRE = "."
+COLISION = "#"
+PASTO = ":"
+
+# Colores de las capas de depuración (F3 en el juego)
+COLOR_DEBUG_COLISION = (220, 40, 40, 110)
+COLOR_DEBUG_PASTO = (40, 220, 80, 90)
+COLOR_DEBUG_WARP = (60, 140, 255, 150)
+
+# Fondo por pedazos: cuánto más allá de la vista se carga y desde qué
+# distancia se descarga, cuántos pedazos se suben por frame y qué tan lejos
+# de una llegada queda siempre cargado
+MARGEN_CARGA = 120
+DISTANCIA_DESCARGA = 240
+MAX_SUBIDAS_POR_FRAME = 4
+RADIO_ANCLA = 480
+TAMAÑO_ATLAS_FONDOS = (2048, 2048)
+
+
+class Warp(NamedTuple):
+    destino: str
+    llegada: Tuple[int, int]
+
+
+class MapaTiles:
+    """Capas lógicas de una zona. Cada capa es un bytearray de columnas x filas."""
+
+    def __init__(self, clave: str, nombre: str, imagen: str, tile: int, filas, warps: dict,
+                 inicio):
+        filas = list(reversed(filas))  # de abajo hacia arriba, como arcade
+        self.clave = clave
+        self.nombre = nombre
+        self.imagen = imagen
+        self.tile = tile
+        self.columnas = len(filas[0])
+        self.filas = len(filas)
+        if any(len(fila) != self.columnas for fila in filas):
+            raise ValueError(f"Mapa {clave}: todas las filas deben tener el mismo largo")
+        self.inicio = tuple(inicio)
+        self.colision = bytearray(self.columnas * self.filas)
+        self.pasto = bytearray(self.columnas * self.filas)
+        self.warps = {}
+        for fila, texto in enumerate(filas):
+            for col, caracter in enumerate(texto):
+                i = fila * self.columnas + col
+                if caracter == COLISION:
+                    self.colision[i] = 1
+                elif caracter == PASTO:
+                    self.pasto[i] = 1
+                elif caracter.isalpha():
+                    destino = warps[caracter]
+                    self.warps[(col, fila)] = Warp(destino["destino"], tuple(destino["llegada"]))
+
+    @classmethod
+    def desde_json(cls, clave: str, carpeta: str = MAPAS_DIR) -> "MapaTiles":
+        with open(os.path.join(carpeta, f"{clave}.json"), encoding="utf-8") as f:
+            datos = json.load(f)
+        return cls(
+            clave, datos["nombre"], datos["imagen"], datos["tile"], datos["filas"],
+            datos.get("warps", {}), datos["inicio"],
+        )
+
+    @property
+    def ancho(self) -> int:
+        return self.columnas * self.tile
+
+    @property
+    def alto(self) -> int:
+        return self.filas * self.tile
+
+    def celda(self, x: float, y: float):
+        """Baldosa (col, fila) que contiene el punto en píxeles."""
+        return int(x // self.tile), int(y // self.tile)
+
+    def centro(self, col: int, fila: int):
+        return (col + 0.5) * self.tile, (fila + 0.5) * self.tile
+
+    def dentro(self, col: int, fila: int) -> bool:
+        return 0 <= col < self.columnas and 0 <= fila < self.filas
+
+    def es_solido(self, col: int, fila: int) -> bool:
+        """Colisión; fuera del mapa también cuenta como pared."""
+        return not self.dentro(col, fila) or self.colision[fila * self.columnas + col] == 1
+
+    def es_pasto(self, col: int, fila: int) -> bool:
+        return self.dentro(col, fila) and self.pasto[fila * self.columnas + col] == 1
+
+    def warp_en(self, col: int, fila: int):
+        return self.warps.get((col, fila))
+
+    def celdas(self, capa: bytearray):
+        """Genera (col, fila) de cada baldosa marcada en la capa."""
+        columnas = self.columnas
+        for i, marcada in enumerate(capa):
+            if marcada:
+                yield i % columnas, i // columnas
+
+
+class FuenteChunks:
+    """
+    De dónde salen las imágenes de los pedazos de un fondo. Se llama desde
+    los hilos de carga: primero busca el pedazo en el paquete de datos; si
+    no está, lo recorta del PNG completo (que se decodifica una sola vez).
+    """
+
+    def __init__(self, imagen: str, tamaño: int = TAMAÑO_CHUNK):
+        self.imagen = imagen
+        self.tamaño = tamaño
+        self._completa = None
+        self._lock = threading.Lock()
+
+    def cargar(self, cx: int, cy: int):
+        paquete = paquete_juego()
+        if paquete is not None and self.tamaño == TAMAÑO_CHUNK:
+            imagen = paquete.chunk(self.imagen, cx, cy)
+            if imagen is not None:
+                return imagen.convert("RGBA")
+        with self._lock:
+            if self._completa is None:
+                from PIL import Image
+
+                self._completa = Image.open(IMAGENES[self.imagen]).convert("RGBA")
+        return recortar_chunk(self._completa, cx, cy, self.tamaño)
+
+
+class FondoPorChunks:
+    """
+    Fondo partido en pedazos de tamaño x tamaño píxeles que se cargan y
+    descargan según lo que se ve.
+
+    actualizar(vista) cada frame:
+    - pide en segundo plano los pedazos a menos de `margen` de la vista,
+    - sube a la GPU como mucho MAX_SUBIDAS_POR_FRAME de los que ya llegaron,
+    - descarga los que quedaron a más de `descarga` (salvo las anclas),
+    - y solo deja visibles los que tocan la vista.
+    Así lo que se dibuja y lo que ocupa la GPU depende del tamaño de la
+    ventana, no del tamaño del mapa.
+    """
+
+    def __init__(self, ancho: int, alto: int, fuente, atlas=None, margen: int = MARGEN_CARGA,
+                 descarga: int = DISTANCIA_DESCARGA):
+        self.ancho = ancho
+        self.alto = alto
+        self.fuente = fuente
+        self.tamaño = fuente.tamaño
+        self.margen = margen
+        self.descarga = descarga
+        self.columnas = -(-ancho // self.tamaño)
+        self.filas = -(-alto // self.tamaño)
+        self.lista = arcade.SpriteList(atlas=atlas)
+        self.cargados = {}   # (cx, cy) -> Sprite
+        self.pendientes = {}  # (cx, cy) -> Future con la PIL.Image
+        self.anclas = set()
+
+    def chunks_en(self, izquierda, abajo, derecha, arriba) -> set:
+        t = self.tamaño
+        cx0 = max(0, int(izquierda // t))
+        cy0 = max(0, int(abajo // t))
+        cx1 = min(self.columnas - 1, int(derecha // t))
+        cy1 = min(self.filas - 1, int(arriba // t))
+        return {(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)}
+
+    def chunks_cerca(self, x: float, y: float, radio: float) -> set:
+        return self.chunks_en(x - radio, y - radio, x + radio, y + radio)
+
+    def _subir(self, chunk, imagen):
+        cx, cy = chunk
+        textura = arcade.Texture(
+            imagen, hash=f"chunk:{self.fuente.imagen}:{cx}_{cy}:{self.tamaño}",
+            hit_box_algorithm=arcade.hitbox.algo_bounding_box,
+        )
+        sprite = arcade.Sprite(textura)
+        sprite.position = (
+            cx * self.tamaño + textura.width / 2, cy * self.tamaño + textura.height / 2,
+        )
+        self.lista.append(sprite)
+        self.cargados[chunk] = sprite
+
+    def _descargar(self, chunk):
+        # Sin referencias a la textura, el atlas libera su espacio solo
+        self.cargados.pop(chunk).remove_from_sprite_lists()
+
+    def cargar_ya(self, chunks):
+        """Carga y sube estos pedazos ahora mismo (para la primera carga)."""
+        for chunk in chunks:
+            if chunk not in self.cargados:
+                self.pendientes.pop(chunk, None)
+                self._subir(chunk, self.fuente.cargar(*chunk))
+
+    def anclar(self, x: float, y: float, radio: float):
+        """Pedazos alrededor de (x, y) que nunca se descargan (llegadas, inicio)."""
+        chunks = self.chunks_cerca(x, y, radio)
+        self.anclas |= chunks
+        self.cargar_ya(chunks)
+
+    def actualizar(self, izquierda, abajo, derecha, arriba):
+        m = self.margen
+        visibles = self.chunks_en(izquierda, abajo, derecha, arriba)
+        cercanos = self.chunks_en(izquierda - m, abajo - m, derecha + m, arriba + m)
+
+        for chunk in cercanos:
+            if chunk not in self.cargados and chunk not in self.pendientes:
+                self.pendientes[chunk] = _hilos_carga().submit(self.fuente.cargar, *chunk)
+
+        # Primero los visibles, después el resto
+        listos = [c for c, futuro in self.pendientes.items() if futuro.done()]
+        listos.sort(key=lambda c: c not in visibles)
+        for chunk in listos[:MAX_SUBIDAS_POR_FRAME]:
+            self._subir(chunk, self.pendientes.pop(chunk).result())
+
+        lejos = self.descarga
+        conservar = self.chunks_en(izquierda - lejos, abajo - lejos, derecha + lejos, arriba + lejos)
+        for chunk in [c for c in self.cargados if c not in conservar and c not in self.anclas]:
+            self._descargar(chunk)
+        for chunk in [c for c in self.pendientes if c not in conservar]:
+            self.pendientes.pop(chunk).cancel()
+
+        for chunk, sprite in self.cargados.items():
+            sprite.visible = chunk in visibles
+
+    def soltar(self):
+        """Descarga todo menos las anclas (al salir de la zona)."""
+        for chunk in [c for c in self.cargados if c not in self.anclas]:
+            self._descargar(chunk)
+        for futuro in self.pendientes.values():
+            futuro.cancel()
+        self.pendientes.clear()
+
+    def draw(self):
+        self.lista.draw(pixelated=True)
+
+
+_hilos = None
+_atlas = None
+
+
+def _hilos_carga() -> ThreadPoolExecutor:
+    global _hilos
+    if _hilos is None:
+        _hilos = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chunks")
+    return _hilos
+
+
+def atlas_fondos():
+    """
+    Atlas propio para los pedazos de fondo: como los pedazos viejos se
+    liberan, el atlas se reorganiza en vez de crecer.
+    """
+    global _atlas
+    if _atlas is None:
+        _atlas = arcade.DefaultTextureAtlas(TAMAÑO_ATLAS_FONDOS)
+    return _atlas
+
+
+class Escenario:
+    """
+    Lo que se dibuja de una zona: el fondo por pedazos (FondoPorChunks) y,
+    para depurar, una SpriteList por capa de colisión/pasto/warps.
+    """
+
+    def __init__(self, mapa: MapaTiles, fuente=None):
+        self.mapa = mapa
+        self.fondo = FondoPorChunks(
+            mapa.ancho, mapa.alto, fuente or FuenteChunks(mapa.imagen), atlas_fondos()
+        )
+        self._debug = None
+        # Paredes, pasto y warps como rectángulos; los NPCs se agregan aparte
+        self.grilla = HashEspacial.desde_mapa(mapa)
+        # Baldosas caminables y rutas ya calculadas (A*) para los NPCs
+        self.navegacion = GrillaNavegacion.desde_mapa(mapa)
+
+    def _capa_debug(self, celdas, color) -> arcade.SpriteList:
+        capa = arcade.SpriteList()
+        tile = self.mapa.tile
+        for col, fila in celdas:
+            x, y = self.mapa.centro(col, fila)
+            capa.append(arcade.SpriteSolidColor(tile, tile, x, y, color))
+        return capa
+
+    def capas_debug(self):
+        """Capas de colisión, pasto y warps (se arman la primera vez que se piden)."""
+        if self._debug is None:
+            mapa = self.mapa
+            self._debug = (
+                self._capa_debug(mapa.celdas(mapa.colision), COLOR_DEBUG_COLISION),
+                self._capa_debug(mapa.celdas(mapa.pasto), COLOR_DEBUG_PASTO),
+                self._capa_debug(mapa.warps, COLOR_DEBUG_WARP),
+            )
+        return self._debug
+
+    def anclar(self, celda, radio: float = RADIO_ANCLA):
+        """Deja siempre cargado el fondo alrededor de una baldosa."""
+        self.fondo.anclar(*self.mapa.centro(*celda), radio)
+
+    def actualizar(self, camara: arcade.Camera2D):
+        """Carga/descarga pedazos según lo que ve la cámara."""
+        x, y = camara.position
+        medio_ancho = camara.viewport_width / camara.zoom / 2
+        medio_alto = camara.viewport_height / camara.zoom / 2
+        self.fondo.actualizar(x - medio_ancho, y - medio_alto, x + medio_ancho, y + medio_alto)
+
+    def draw(self, debug: bool = False):
+        self.fondo.draw()
+        if debug:
+            for capa in self.capas_debug():
+                capa.draw()
+
+
+class GestorEscenarios:
+    """
+    Todas las zonas del campus. precargar() arma cada escenario y sube el
+    fondo alrededor del inicio y de cada punto de llegada de un warp, así
+    que cambiar() de zona no espera a nada: el resto del fondo llega por
+    pedazos mientras el jugador camina.
+    """
+
+    def __init__(self, claves=MAPAS):
+        self.mapas = {clave: MapaTiles.desde_json(clave) for clave in claves}
+        self.escenarios = {}
+        self.actual = None
+        self.ms_ultimo_cambio = 0.0
+
+    def escenario(self, clave: str) -> Escenario:
+        escenario = self.escenarios.get(clave)
+        if escenario is None:
+            mapa = self.mapas[clave]
+            escenario = self.escenarios[clave] = Escenario(mapa)
+            escenario.anclar(mapa.inicio)
+            for otro in self.mapas.values():
+                for warp in otro.warps.values():
+                    if warp.destino == clave:
+                        escenario.anclar(warp.llegada)
+        return escenario
+
+    def precargar(self):
+        for clave in self.mapas:
+            self.escenario(clave)
+
+    def cambiar(self, clave: str) -> Escenario:
+        inicio = time.perf_counter()
+        nuevo = self.escenario(clave)
+        if self.actual is not None and self.actual is not nuevo:
+            self.actual.fondo.soltar()
+        self.actual = nuevo
+        self.ms_ultimo_cambio = (time.perf_counter() - inicio) * 1000
+        return self.actual
+
+
+# ================= BENCHMARK =================
+
+class _FuentePrueba:
+    """Pedazos de un color liso: mapas de cualquier tamaño sin tener el PNG."""
+
+    imagen = "prueba"
+
+    def __init__(self, tamaño: int = TAMAÑO_CHUNK):
+        self.tamaño = tamaño
+
+    def cargar(self, cx, cy):
+        from PIL import Image
+
+        color = (40 + cx * 37 % 200, 60 + cy * 53 % 180, 90, 255)
+        return Image.new("RGBA", (self.tamaño, self.tamaño), color)
+
+
+def benchmark_camara(lados=(1_100, 10_000, 50_000), frames=240, ventana=(800, 600)):
+    """
+    La cámara recorre en diagonal mapas cada vez más grandes. El tiempo por
+    frame, los pedazos en memoria y el tamaño del atlas deberían quedar
+    iguales en todos.
+    """
+    window = arcade.Window(*ventana, "Benchmark cámara", visible=False)
+    camara = arcade.Camera2D()
+    atlas = arcade.DefaultTextureAtlas(TAMAÑO_ATLAS_FONDOS)
+    print(f"{'Mapa (px)':>14} {'ms/frame':>9} {'peor ms':>8} {'pedazos máx':>12} {'atlas':>10}")
+    for lado in lados:
+        fondo = FondoPorChunks(lado, lado, _FuentePrueba(), atlas)
+        tiempos = []
+        maximo = 0
+        recorrido = min(lado, 20_000) - max(ventana)
+        for frame in range(frames):
+            inicio = time.perf_counter()
+            x = ventana[0] / 2 + recorrido * frame / frames
+            y = ventana[1] / 2 + recorrido * frame / frames
+            camara.position = (x, y)
+            fondo.actualizar(x - ventana[0] / 2, y - ventana[1] / 2, x + ventana[0] / 2, y + ventana[1] / 2)
+            window.clear()
+            with camara.activate():
+                fondo.draw()
+            window.ctx.finish()
+            tiempos.append(time.perf_counter() - inicio)
+            maximo = max(maximo, len(fondo.cargados))
+        fondo.soltar()
+        tiempos.sort()
+        print(f"{lado:>6}x{lado:<7} {sum(tiempos) / frames * 1000:>9.2f} {tiempos[-1] * 1000:>8.2f} "
+              f"{maximo:>12} {atlas.width:>4}x{atlas.height:<5}")
+    window.close()
+
+
+if __name__ == "__main__":
+    benchmark_camara()
@@ -0,0 +1,176 @@
+"""
+Hoja de sprites: los sprites del jugador, los NPCs y la interfaz juntos
+en pocas imágenes grandes, con una tabla de dónde quedó cada uno.
+
+Cada fuente de SPRITES se escala una sola vez al tamaño con que se dibuja
+en el juego (player.png mide 303x517 y en el campus se ve de 2 baldosas
+de alto). Si la fuente es una tira de cuadros se corta en cuadros
+"<nombre>/<i>". Después todo se acomoda en hojas de ANCHO_HOJA px de ancho
+por estantes: se ordena por alto y se llena fila por fila.
+
+La tabla guarda por cada sprite la hoja, el rectángulo en píxeles y las
+coordenadas UV (0 a 1, con v desde arriba como en PIL). Al armar el
+paquete de datos (python -m Logic.Class.Paquete) se guardan las hojas
+como imagen/sprites_<n> y la tabla como atlas/sprites. Si el paquete no
+está, GUI/recursos.py arma las hojas al vuelo con las mismas funciones.
+
+Todos los sprites salen de la misma hoja y arcade los sube juntos al
+atlas de la ventana, así que el campus y el combate dibujan sin cambiar
+de textura.
+
+Armar las hojas y comparar contra cargar cada PNG suelto:
+    python -m GUI.atlas
+"""
+import io
+import json
+import os
+from typing import NamedTuple, Tuple
+
+GUI_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ANCHO_HOJA = 1024
+BORDE = 1   # píxeles transparentes entre sprites (evita que se mezclen al filtrar)
+
+
+class FuenteSprite(NamedTuple):
+    """Un PNG de arte. alto es el alto en píxeles con que se dibuja en el juego."""
+
+    ruta: str
+    alto: int
+    cuadros: Tuple[int, int] = (1, 1)   # columnas y filas si es una tira de cuadros
+
+
+SPRITES = {
+    "player": FuenteSprite(os.path.join(GUI_DIR, "player.png"), 40),
+}
+
+
+def cargar_fuentes(sprites: dict = SPRITES) -> dict:
+    """clave -> PIL.Image RGBA ya escalada al tamaño del juego."""
+    from PIL import Image
+
+    imagenes = {}
+    for nombre, fuente in sprites.items():
+        with Image.open(fuente.ruta) as original:
+            original = original.convert("RGBA")
+        columnas, filas = fuente.cuadros
+        ancho_cuadro = original.width // columnas
+        alto_cuadro = original.height // filas
+        ancho = max(1, round(ancho_cuadro * fuente.alto / alto_cuadro))
+        for fila in range(filas):
+            for col in range(columnas):
+                cuadro = original.crop((
+                    col * ancho_cuadro, fila * alto_cuadro,
+                    (col + 1) * ancho_cuadro, (fila + 1) * alto_cuadro,
+                ))
+                clave = nombre if columnas * filas == 1 else f"{nombre}/{fila * columnas + col}"
+                imagenes[clave] = cuadro.resize((ancho, fuente.alto), Image.LANCZOS)
+    return imagenes
+
+
+def empaquetar(imagenes: dict, ancho: int = ANCHO_HOJA, borde: int = BORDE):
+    """
+    Acomoda las imágenes en hojas de `ancho` x `ancho` como máximo (el alto
+    se recorta a la siguiente potencia de 2). Devuelve (hojas, regiones)
+    con regiones[clave] = (hoja, x, y, ancho, alto).
+    """
+    from PIL import Image
+
+    orden = sorted(imagenes, key=lambda c: (-imagenes[c].height, -imagenes[c].width, c))
+    regiones = {}
+    usados = []          # alto usado en cada hoja
+    hoja = x = y = alto_estante = 0
+    for clave in orden:
+        w, h = imagenes[clave].size
+        if w + 2 * borde > ancho or h + 2 * borde > ancho:
+            raise ValueError(f"El sprite {clave} ({w}x{h}) no cabe en una hoja de {ancho} px")
+        if x + w + 2 * borde > ancho:  # estante lleno: uno nuevo más abajo
+            x, y = 0, y + alto_estante
+            alto_estante = 0
+        if y + h + 2 * borde > ancho:  # hoja llena: otra hoja
+            usados.append(y)
+            hoja, x, y, alto_estante = hoja + 1, 0, 0, 0
+        regiones[clave] = (hoja, x + borde, y + borde, w, h)
+        x += w + 2 * borde
+        alto_estante = max(alto_estante, h + 2 * borde)
+    usados.append(y + alto_estante)
+
+    hojas = []
+    for alto_usado in usados:
+        alto = 1
+        while alto < alto_usado:
+            alto *= 2
+        hojas.append(Image.new("RGBA", (ancho, alto), (0, 0, 0, 0)))
+    for clave, (i, x, y, _, _) in regiones.items():
+        hojas[i].paste(imagenes[clave], (x, y))
+    return hojas, regiones
+
+
+def tabla_uv(hojas, regiones) -> dict:
+    """La tabla que se guarda: clave -> [hoja, x, y, ancho, alto, u0, v0, u1, v1]."""
+    tabla = {}
+    for clave, (i, x, y, w, h) in sorted(regiones.items()):
+        ancho, alto = hojas[i].size
+        tabla[clave] = [i, x, y, w, h, x / ancho, y / alto, (x + w) / ancho, (y + h) / alto]
+    return tabla
+
+
+def construir(sprites: dict = SPRITES):
+    """(hojas, tabla) a partir de los PNG fuente."""
+    hojas, regiones = empaquetar(cargar_fuentes(sprites))
+    return hojas, tabla_uv(hojas, regiones)
+
+
+def entradas_sprites(sprites: dict = SPRITES):
+    """Genera las entradas (clave, bytes) del paquete de datos."""
+    hojas, tabla = construir(sprites)
+    yield "atlas/sprites", json.dumps(tabla).encode("utf-8")
+    for i, hoja in enumerate(hojas):
+        salida = io.BytesIO()
+        hoja.save(salida, "PNG", optimize=True)
+        yield f"imagen/sprites_{i}", salida.getvalue()
+
+
+def recortar(hojas, tabla: dict, clave: str):
+    """El sprite `clave` como PIL.Image, recortado de su hoja."""
+    i, x, y, w, h = tabla[clave][:5]
+    return hojas[i].crop((x, y, x + w, y + h))
+
+
+# ================= ARMADO Y MEDICIÓN =================
+
+def medir(sprites: dict = SPRITES, repeticiones: int = 20):
+    """Cargar desde la hoja armada contra decodificar y escalar cada PNG fuente."""
+    import time
+
+    from PIL import Image
+
+    entradas = dict(entradas_sprites(sprites))
+    tabla = json.loads(entradas["atlas/sprites"])
+    n_hojas = sum(clave.startswith("imagen/sprites_") for clave in entradas)
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        cargar_fuentes(sprites)
+    ms_fuentes = (time.perf_counter() - inicio) / repeticiones * 1000
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        hojas = [Image.open(io.BytesIO(entradas[f"imagen/sprites_{i}"])) for i in range(n_hojas)]
+        for hoja in hojas:
+            hoja.load()
+        for clave in tabla:
+            recortar(hojas, tabla, clave)
+    ms_hojas = (time.perf_counter() - inicio) / repeticiones * 1000
+
+    bytes_fuentes = sum(os.path.getsize(f.ruta) for f in sprites.values())
+    bytes_hojas = sum(len(datos) for clave, datos in entradas.items() if clave.startswith("imagen/"))
+    print(f"{len(sprites)} fuentes -> {len(tabla)} sprites en {n_hojas} hoja(s):")
+    for clave, (i, x, y, w, h, *_) in tabla.items():
+        print(f"  {clave:<16} hoja {i} en ({x}, {y}), {w}x{h}")
+    print(f"  PNG fuente:  {bytes_fuentes / 1024:8.1f} KB, decodificar y escalar {ms_fuentes:6.2f} ms")
+    print(f"  Hojas:       {bytes_hojas / 1024:8.1f} KB, decodificar y recortar {ms_hojas:6.2f} ms")
+
+
+if __name__ == "__main__":
+    medir()
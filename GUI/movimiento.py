@@ -1,111 +1,252 @@
-import arcade
-
 """
-Starting Template
+Movimiento del jugador por el mapa con paso de simulación fijo.
+
+La lógica avanza siempre en pasos de PASO segundos, sin importar cuántos
+frames por segundo dibuje la máquina. BucleFijo acumula el delta_time de
+cada frame y corre los pasos que correspondan. Si un frame tarda mucho,
+corre varios pasos seguidos y el jugador no atraviesa paredes ni va más
+lento. Si no alcanza para un paso, no corre ninguno.
+
+El dibujo va aparte: BucleFijo devuelve qué fracción del siguiente paso
+ya pasó (alpha) y Caminante.interpolado(alpha) da la posición entre el
+paso anterior y el actual. Así el sprite se mueve suave aunque la
+simulación vaya a 60 pasos por segundo y la pantalla a 144 (o a 30).
+
+    teclas = EstadoTeclas(TECLAS)              # qué teclas están apretadas
+    caminante = Caminante(grilla, ancho, alto, tile)
+    bucle = BucleFijo()
 
-Once you have learned how to use classes, you can begin your program with this
-template.
+    def on_update(self, delta_time):
+        alpha = bucle.avanzar(delta_time, lambda dt: caminante.paso(dt, teclas.direccion()))
+        sprite.position = caminante.interpolado(alpha)
 
-If Python and Arcade are installed, this example can be run from the command line with:
-python -m arcade.examples.starting_template
+Las colisiones son contra la grilla del escenario (GUI/colisiones.py), con
+una caja a los pies del jugador. Nada de este módulo usa arcade ni
+OpenGL, así que la simulación también corre sin ventana:
+    python -m GUI.movimiento
 """
-import arcade
+import math
 
-WINDOW_WIDTH = 1280
-WINDOW_HEIGHT = 720
-WINDOW_TITLE = "Starting Template"
+from GUI.colisiones import NPC, PARED, Rect
 
+PASO = 1 / 60           # segundos de simulación por paso
+MAX_ATRASO = 0.25       # si un frame tarda más, el resto se descarta
+VELOCIDAD = 100.0       # píxeles por segundo (5 baldosas de 20 px)
+
+# Caja de colisión a los pies del jugador
+ANCHO_PIES = 14
+ALTO_PIES = 8
+
+SOLIDOS = frozenset((PARED, NPC))
 
-class GameView(arcade.View):
-    """
-    Main application class.
 
-    NOTE: Go ahead and delete the methods you don't need.
-    If you do need a method, delete the 'pass' and replace it
-    with your own code. Don't leave 'pass' in this program.
+class EstadoTeclas:
+    """
+    Teclas de movimiento apretadas en este momento. teclas es
+    {código de tecla: (dx, dy)}. Si dos teclas se contradicen (izquierda y
+    derecha a la vez) gana la última que se apretó.
     """
 
-    def __init__(self):
-        super().__init__()
+    __slots__ = ("teclas", "_apretadas")
 
-        self.background_color = arcade.color.AMAZON
+    def __init__(self, teclas: dict):
+        self.teclas = teclas
+        self._apretadas = []
 
-        # If you have sprite lists, you should create them here,
-        # and set them to None
+    def presionar(self, tecla) -> bool:
+        """True si la tecla es de movimiento."""
+        if tecla not in self.teclas:
+            return False
+        if tecla not in self._apretadas:
+            self._apretadas.append(tecla)
+        return True
 
-    def reset(self):
-        """Reset the game to the initial state."""
-        # Do changes needed to restart the game here if you want to support that
-        pass
+    def soltar(self, tecla):
+        if tecla in self._apretadas:
+            self._apretadas.remove(tecla)
 
-    def on_draw(self):
-        """
-        Render the screen.
-        """
+    def limpiar(self):
+        """Suelta todo (al cambiar de vista no llegan los on_key_release)."""
+        self._apretadas.clear()
 
-        # This command should happen before we start drawing. It will clear
-        # the screen to the background color, and erase what we drew last frame.
-        self.clear()
+    def direccion(self):
+        """(dx, dy) con cada eje en -1, 0 o 1."""
+        dx = dy = 0
+        for tecla in self._apretadas:
+            tx, ty = self.teclas[tecla]
+            dx = tx or dx
+            dy = ty or dy
+        return dx, dy
 
-        # Call draw() on all your sprite lists below
 
-    def on_update(self, delta_time):
-        """
-        All the logic to move, and the game logic goes here.
-        Normally, you'll call update() on the sprite lists that
-        need it.
-        """
-        pass
+class BucleFijo:
+    """Acumulador de tiempo que corre la simulación en pasos de `paso` segundos."""
 
-    def on_key_press(self, key, key_modifiers):
-        """
-        Called whenever a key on the keyboard is pressed.
+    __slots__ = ("paso", "max_atraso", "acumulado", "pasos")
 
-        For a full list of keys, see:
-        https://api.arcade.academy/en/latest/arcade.key.html
-        """
-        pass
+    def __init__(self, paso: float = PASO, max_atraso: float = MAX_ATRASO):
+        self.paso = paso
+        self.max_atraso = max_atraso
+        self.acumulado = 0.0
+        self.pasos = 0
 
-    def on_key_release(self, key, key_modifiers):
+    def avanzar(self, delta_time: float, paso_fijo) -> float:
         """
-        Called whenever the user lets off a previously pressed key.
+        Corre paso_fijo(paso) las veces que quepan en el tiempo acumulado y
+        devuelve alpha, la fracción del siguiente paso que ya pasó (0 a 1).
+        Con un frame de más de max_atraso (una pausa, arrastrar la ventana)
+        solo se simula max_atraso: mejor un tirón que una espiral de pasos.
         """
-        pass
+        self.acumulado += min(delta_time, self.max_atraso)
+        # El margen evita perder un paso por redondeo (30 frames de 1/30 s
+        # tienen que dar 60 pasos, no 59)
+        while self.acumulado >= self.paso - 1e-9:
+            paso_fijo(self.paso)
+            self.acumulado -= self.paso
+            self.pasos += 1
+        return max(0.0, self.acumulado) / self.paso
 
-    def on_mouse_motion(self, x, y, delta_x, delta_y):
-        """
-        Called whenever the mouse moves.
-        """
-        pass
 
-    def on_mouse_press(self, x, y, button, key_modifiers):
-        """
-        Called when the user presses a mouse button.
-        """
-        pass
+class Caminante:
+    """
+    Algo que camina por un escenario: el jugador (y después los NPCs).
+    (x, y) es el punto medio de los pies; anterior es dónde estaba antes
+    del último paso, para interpolar el dibujo.
+    """
 
-    def on_mouse_release(self, x, y, button, key_modifiers):
+    __slots__ = ("grilla", "ancho_mapa", "alto_mapa", "tile", "velocidad",
+                 "x", "y", "anterior", "celda", "mirando")
+
+    def __init__(self, grilla, ancho_mapa: float, alto_mapa: float, tile: int,
+                 velocidad: float = VELOCIDAD):
+        self.grilla = grilla
+        self.ancho_mapa = ancho_mapa
+        self.alto_mapa = alto_mapa
+        self.tile = tile
+        self.velocidad = velocidad
+        self.x = self.y = 0.0
+        self.anterior = (0.0, 0.0)
+        self.celda = (0, 0)
+        self.mirando = (0, -1)
+
+    def rect(self, x: float = None, y: float = None) -> Rect:
+        x = self.x if x is None else x
+        y = self.y if y is None else y
+        return Rect(x - ANCHO_PIES / 2, y, ANCHO_PIES, ALTO_PIES)
+
+    def colocar(self, x: float, y: float):
+        """Teletransporta (warps, inicio): sin interpolar desde donde estaba."""
+        self.x, self.y = x, y
+        self.anterior = (x, y)
+        self.celda = (int(x // self.tile), int(y // self.tile))
+
+    def paso(self, dt: float, direccion) -> bool:
         """
-        Called when a user releases a mouse button.
+        Un paso de simulación. Mueve cada eje por separado para que el
+        jugador se deslice a lo largo de una pared en vez de trabarse.
+        Devuelve True si los pies pasaron a otra baldosa.
         """
-        pass
-
-
-def main():
-    """ Main function """
-    # Create a window class. This is what actually shows up on screen
-    window = arcade.Window(WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE)
-
-    # Create and setup the GameView
-    game = GameView()
-
-    # Show GameView on screen
-    window.show_view(game)
-
-    # Start the arcade game loop
-    arcade.run()
-
+        self.anterior = (self.x, self.y)
+        dx, dy = direccion
+        if not dx and not dy:
+            return False
+        self.mirando = (dx, dy)
+        distancia = self.velocidad * dt
+        if dx and dy:
+            distancia /= math.sqrt(2)  # en diagonal no se camina más rápido
+        if dx:
+            self.x = self._mover_eje(self.x + dx * distancia, self.y, dx, 0)
+        if dy:
+            self.y = self._mover_eje(self.x, self.y + dy * distancia, 0, dy)
+
+        celda = (int(self.x // self.tile), int(self.y // self.tile))
+        if celda != self.celda:
+            self.celda = celda
+            return True
+        return False
+
+    def _mover_eje(self, x: float, y: float, dx: int, dy: int) -> float:
+        """La coordenada del eje que se movió, pegada al primer obstáculo."""
+        medio = ANCHO_PIES / 2
+        if dx:
+            x = min(max(x, medio), self.ancho_mapa - medio)
+        else:
+            y = min(max(y, 0.0), self.alto_mapa - ALTO_PIES)
+        rect = self.rect(x, y)
+        for cuerpo in self.grilla.colisiones(rect):
+            if cuerpo.tipo not in SOLIDOS:
+                continue
+            otro = cuerpo.rect
+            if dx > 0:
+                x = min(x, otro.x - medio)
+            elif dx < 0:
+                x = max(x, otro.x + otro.ancho + medio)
+            elif dy > 0:
+                y = min(y, otro.y - ALTO_PIES)
+            else:
+                y = max(y, otro.y + otro.alto)
+        return x if dx else y
+
+    def interpolado(self, alpha: float):
+        """Posición para dibujar, entre el paso anterior y el actual."""
+        ax, ay = self.anterior
+        return ax + (self.x - ax) * alpha, ay + (self.y - ay) * alpha
+
+
+# ================= PRUEBA SIN VENTANA =================
+
+def simular(caminante: Caminante, segundos: float, fps: float, direccion,
+            tirones=(), paso: float = PASO):
+    """
+    Corre `segundos` de juego a `fps` con la dirección fija, como lo haría
+    on_update. tirones son (segundo, duración) de frames que se trabaron.
+    Devuelve la posición final y cuántos pasos se corrieron.
+    """
+    bucle = BucleFijo(paso)
+    tirones = sorted(tirones)
+    t = 0.0
+    while t < segundos - 1e-9:
+        delta = min(1 / fps, segundos - t)
+        while tirones and tirones[0][0] <= t:
+            delta += tirones.pop(0)[1]
+        t += delta
+        bucle.avanzar(delta, lambda dt: caminante.paso(dt, direccion))
+    return (caminante.x, caminante.y), bucle.pasos
+
+
+def prueba(segundos: float = 2.0):
+    """
+    El mismo recorrido a distintos fps (y con frames trabados) termina en el
+    mismo lugar; y contra una pared el jugador se detiene y se desliza.
+    Lo mismo, con más detalle, revisa tests/test_movimiento.py.
+    """
+    from GUI.colisiones import Cuerpo, HashEspacial
+
+    def nuevo():
+        grilla = HashEspacial()
+        grilla.agregar(Cuerpo(PARED, Rect(300, 0, 20, 1_000)))   # pared de todo el alto
+        caminante = Caminante(grilla, 1_000, 1_000, 20)
+        caminante.colocar(50, 100)
+        return caminante
+
+    print(f"{segundos:.0f} s caminando en diagonal (paso fijo de {PASO * 1000:.2f} ms):")
+    finales = set()
+    for fps, tirones in ((30, ()), (60, ()), (144, ()), (60, ((0.5, 0.2), (1.2, 0.1)))):
+        caminante = nuevo()
+        (x, y), pasos = simular(caminante, segundos, fps, (1, 1), tirones)
+        finales.add((round(x, 6), round(y, 6)))
+        detalle = f" con tirones de {sum(d for _, d in tirones) * 1000:.0f} ms" if tirones else ""
+        print(f"  {fps:>3} fps{detalle:<24} -> ({x:7.2f}, {y:7.2f}) en {pasos} pasos")
+    print(f"  Posiciones distintas: {len(finales)}")
+    assert len(finales) == 1, "el recorrido depende de los fps"
+
+    caminante = nuevo()
+    simular(caminante, 5.0, 60, (1, 1))
+    print(f"  Contra la pared en x=300: x = {caminante.x:.2f} (pies hasta {caminante.x + ANCHO_PIES / 2:.2f}), "
+          f"y siguió a {caminante.y:.2f}")
+    assert caminante.x + ANCHO_PIES / 2 <= 300, "atravesó la pared"
+    assert caminante.y > 400, "se trabó en la pared en vez de deslizarse"
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    prueba()
@@ -0,0 +1,426 @@
+"""
+Rutas por baldosas para NPCs y entrenadores (A*).
+
+GrillaNavegacion es la capa de colisión de una zona como bytearray de
+baldosas caminables. Se arma una sola vez por escenario. Los NPCs parados
+bloquean su baldosa con bloquear() y la liberan con desbloquear().
+
+- A* con heapq, vecinos en 4 direcciones y distancia Manhattan como
+  heurística (el jugador y los NPCs caminan por baldosas).
+- Caché de rutas por (inicio, fin). Bloquear una baldosa borra solo las
+  rutas que pasan por ella. Desbloquear puede abrir atajos, así que
+  borra todas.
+- PlanificadorRutas reparte las búsquedas entre frames: procesar() corre
+  búsquedas hasta gastar presupuesto_ms y sigue en el frame siguiente.
+  Una búsqueda larga también se corta y se retoma donde quedó: A* mira el
+  reloj cada EXPANSIONES_POR_TANDA nodos y para si no le entran dos
+  tandas más a lo que costó la última (el margen cubre una tanda que
+  sale más cara). Varios NPCs que piden la misma ruta comparten una sola
+  búsqueda.
+
+    planificador = PlanificadorRutas(escenario.navegacion)
+    solicitud = planificador.pedir((3, 4), (40, 20))
+    ...
+    planificador.procesar()            # en on_update
+    if solicitud.lista:
+        seguir(solicitud.ruta)         # lista de (col, fila), o None si no hay camino
+
+Nada de este módulo usa arcade. Benchmark con 100 rutas pedidas a la vez
+en la Zona Verde (1100x720 px):
+    python -m GUI.navegacion
+"""
+import time
+from collections import deque
+from heapq import heappop, heappush
+
+PRESUPUESTO_MS = 2.0          # por frame, de los ~16 ms a 60 fps
+EXPANSIONES_POR_TANDA = 32    # cada cuánto se mira el reloj
+MAX_RUTAS = 4_096
+
+
+class GrillaNavegacion:
+    """Baldosas caminables de una zona y las rutas ya calculadas sobre ellas."""
+
+    def __init__(self, columnas: int, filas: int, colision):
+        if len(colision) != columnas * filas:
+            raise ValueError("La capa de colisión no coincide con columnas x filas")
+        self.columnas = columnas
+        self.filas = filas
+        self._fija = bytes(colision)
+        self.caminable = bytearray(0 if c else 1 for c in colision)
+        self._ocupadas = {}      # índice -> cuántos la bloquean
+        self.version = 0
+        self._rutas = {}         # (inicio, fin) -> tupla de índices, o None
+        self._por_celda = {}     # índice -> claves de las rutas que pasan por ahí
+        self.aciertos = 0
+        self.fallos = 0
+
+    @classmethod
+    def desde_mapa(cls, mapa) -> "GrillaNavegacion":
+        """Desde la capa de colisión de un GUI.Escenarios.MapaTiles."""
+        return cls(mapa.columnas, mapa.filas, mapa.colision)
+
+    def indice(self, col: int, fila: int) -> int:
+        return fila * self.columnas + col
+
+    def celda(self, indice: int):
+        return indice % self.columnas, indice // self.columnas
+
+    def es_caminable(self, col: int, fila: int) -> bool:
+        return (0 <= col < self.columnas and 0 <= fila < self.filas
+                and self.caminable[fila * self.columnas + col] == 1)
+
+    # --- Obstáculos que cambian ---
+
+    def bloquear(self, col: int, fila: int):
+        """Un NPC parado en la baldosa: las rutas que pasan por ahí se descartan."""
+        i = self.indice(col, fila)
+        cuenta = self._ocupadas.get(i, 0)
+        self._ocupadas[i] = cuenta + 1
+        if cuenta == 0 and self.caminable[i]:
+            self.caminable[i] = 0
+            self.version += 1
+            for clave in list(self._por_celda.get(i, ())):
+                self._olvidar(clave)
+
+    def desbloquear(self, col: int, fila: int):
+        i = self.indice(col, fila)
+        cuenta = self._ocupadas.get(i, 0)
+        if cuenta == 0:
+            raise ValueError(f"La baldosa {(col, fila)} no estaba bloqueada")
+        if cuenta > 1:
+            self._ocupadas[i] = cuenta - 1
+            return
+        del self._ocupadas[i]
+        if not self._fija[i]:
+            self.caminable[i] = 1
+            self.version += 1
+            self.olvidar_rutas()
+
+    # --- Caché ---
+
+    def _olvidar(self, clave):
+        indices = self._rutas.pop(clave)
+        for i in indices or ():
+            claves = self._por_celda[i]
+            claves.discard(clave)
+            if not claves:
+                del self._por_celda[i]
+
+    def olvidar_rutas(self):
+        self._rutas.clear()
+        self._por_celda.clear()
+
+    def guardar(self, inicio, fin, indices):
+        clave = (inicio, fin)
+        if clave in self._rutas:
+            self._olvidar(clave)
+        elif len(self._rutas) >= MAX_RUTAS:
+            # Se descarta la mitad más vieja (los dict guardan el orden de inserción)
+            for vieja in list(self._rutas)[:MAX_RUTAS // 2]:
+                self._olvidar(vieja)
+        self._rutas[clave] = indices
+        for i in indices or ():
+            self._por_celda.setdefault(i, set()).add(clave)
+
+    def en_cache(self, inicio, fin):
+        """(True, ruta) si la ruta ya está calculada; (False, None) si no."""
+        clave = (tuple(inicio), tuple(fin))
+        if clave in self._rutas:
+            self.aciertos += 1
+            return True, self._a_celdas(self._rutas[clave])
+        return False, None
+
+    def _a_celdas(self, indices):
+        if indices is None:
+            return None
+        columnas = self.columnas
+        return [(i % columnas, i // columnas) for i in indices]
+
+    def ruta(self, inicio, fin):
+        """Lista de (col, fila) de inicio a fin (ambos incluidos), o None."""
+        encontrada, ruta = self.en_cache(inicio, fin)
+        if encontrada:
+            return ruta
+        busqueda = BusquedaAStar(self, inicio, fin)
+        busqueda.avanzar()
+        return busqueda.ruta
+
+
+class BusquedaAStar:
+    """
+    Una búsqueda A* que se puede cortar: avanzar(n) expande como mucho n
+    nodos, avanzar(limite=t) para antes de que time.perf_counter() pase
+    de t: mira el reloj cada `tanda` nodos y no sigue si no entran dos
+    tandas más de lo que costó la última (segundos_tanda). Devuelve True
+    cuando terminó. Al terminar deja la ruta en la caché de la grilla.
+    """
+
+    __slots__ = ("grilla", "inicio", "fin", "version", "ruta", "terminada", "expandidos",
+                 "segundos_tanda", "_destino", "_abiertos", "_g", "_padre")
+
+    def __init__(self, grilla: GrillaNavegacion, inicio, fin):
+        self.grilla = grilla
+        self.inicio = tuple(inicio)
+        self.fin = tuple(fin)
+        self.version = grilla.version
+        self.ruta = None
+        self.terminada = False
+        self.expandidos = 0
+        self.segundos_tanda = 0.0
+        grilla.fallos += 1
+        if not (grilla.es_caminable(*self.inicio) and grilla.es_caminable(*self.fin)):
+            self._terminar(None)
+            return
+        origen = grilla.indice(*self.inicio)
+        self._destino = grilla.indice(*self.fin)
+        self._abiertos = [(self._h(origen), 0, origen)]  # (f, -g, índice)
+        self._g = {origen: 0}
+        self._padre = {origen: -1}
+
+    def _h(self, i: int) -> int:
+        columnas = self.grilla.columnas
+        return abs(i % columnas - self.fin[0]) + abs(i // columnas - self.fin[1])
+
+    def _terminar(self, indices):
+        self.terminada = True
+        self.grilla.guardar(self.inicio, self.fin, indices)
+        self.ruta = self.grilla._a_celdas(indices)
+
+    def avanzar(self, max_expansiones: int = None, limite: float = None,
+                tanda: int = EXPANSIONES_POR_TANDA) -> bool:
+        if self.terminada:
+            return True
+        grilla = self.grilla
+        caminable = grilla.caminable
+        columnas = grilla.columnas
+        total = len(caminable)
+        fin_col, fin_fila = self.fin
+        destino = self._destino
+        abiertos, g, padre = self._abiertos, self._g, self._padre
+        expandidos = 0
+        reloj = tanda if limite is not None else None   # cuándo se mira el reloj
+        antes = time.perf_counter() if limite is not None else 0.0
+        while abiertos:
+            if max_expansiones is not None and expandidos >= max_expansiones:
+                self.expandidos += expandidos
+                return False
+            if expandidos == reloj:
+                ahora = time.perf_counter()
+                self.segundos_tanda = ahora - antes
+                if ahora + 2 * self.segundos_tanda >= limite:
+                    self.expandidos += expandidos
+                    return False
+                antes = ahora
+                reloj += tanda
+            _, menos_g, i = heappop(abiertos)
+            g_actual = -menos_g
+            if g_actual > g[i]:
+                continue  # entrada vieja: ya se llegó más barato
+            if i == destino:
+                indices = []
+                while i != -1:
+                    indices.append(i)
+                    i = padre[i]
+                indices.reverse()
+                self.expandidos += expandidos
+                self._terminar(tuple(indices))
+                return True
+            expandidos += 1
+            col = i % columnas
+            g_vecino = g_actual + 1
+            for vecino in (
+                i + 1 if col + 1 < columnas else -1,
+                i - 1 if col > 0 else -1,
+                i + columnas if i + columnas < total else -1,
+                i - columnas,
+            ):
+                if vecino < 0 or not caminable[vecino] or g_vecino >= g.get(vecino, total):
+                    continue
+                g[vecino] = g_vecino
+                padre[vecino] = i
+                h = abs(vecino % columnas - fin_col) + abs(vecino // columnas - fin_fila)
+                # A igual f, primero el más avanzado (menos nodos expandidos)
+                heappush(abiertos, (g_vecino + h, -g_vecino, vecino))
+        self.expandidos += expandidos
+        self._terminar(None)
+        return True
+
+
+class SolicitudRuta:
+    """Una ruta pedida al planificador. ruta vale cuando lista es True."""
+
+    __slots__ = ("inicio", "fin", "ruta", "lista")
+
+    def __init__(self, inicio, fin):
+        self.inicio = inicio
+        self.fin = fin
+        self.ruta = None
+        self.lista = False
+
+    def __repr__(self):
+        estado = f"{len(self.ruta)} pasos" if self.ruta else ("sin camino" if self.lista else "pendiente")
+        return f"SolicitudRuta({self.inicio} -> {self.fin}, {estado})"
+
+
+class PlanificadorRutas:
+    """Cola de rutas pedidas que se resuelven dentro de un presupuesto por frame."""
+
+    def __init__(self, grilla: GrillaNavegacion, presupuesto_ms: float = PRESUPUESTO_MS,
+                 expansiones_por_tanda: int = EXPANSIONES_POR_TANDA):
+        self.grilla = grilla
+        self.presupuesto_ms = presupuesto_ms
+        self.expansiones_por_tanda = expansiones_por_tanda
+        self._pendientes = {}    # (inicio, fin) -> [SolicitudRuta], en orden de llegada
+        self._cola = deque()
+        self._actual = None
+        self._segundos_tanda = 0.0   # lo que costó la última tanda de A*
+
+    def __len__(self):
+        return len(self._pendientes)
+
+    def pedir(self, inicio, fin) -> SolicitudRuta:
+        inicio, fin = tuple(inicio), tuple(fin)
+        solicitud = SolicitudRuta(inicio, fin)
+        encontrada, ruta = self.grilla.en_cache(inicio, fin)
+        if encontrada:
+            solicitud.ruta, solicitud.lista = ruta, True
+            return solicitud
+        clave = (inicio, fin)
+        esperando = self._pendientes.get(clave)
+        if esperando is None:
+            self._pendientes[clave] = [solicitud]
+            self._cola.append(clave)
+        else:
+            esperando.append(solicitud)
+        return solicitud
+
+    def cancelar(self, solicitud: SolicitudRuta):
+        esperando = self._pendientes.get((solicitud.inicio, solicitud.fin))
+        if esperando and solicitud in esperando:
+            esperando.remove(solicitud)
+
+    def _resolver(self, clave, ruta):
+        for solicitud in self._pendientes.pop(clave):
+            solicitud.ruta = None if ruta is None else list(ruta)
+            solicitud.lista = True
+
+    def procesar(self) -> int:
+        """Trabaja en la cola hasta gastar el presupuesto. Devuelve cuántas rutas terminó."""
+        limite = time.perf_counter() + self.presupuesto_ms / 1000
+        terminadas = 0
+        grilla = self.grilla
+        # Una vuelta siempre (para no quedarse sin avanzar si una tanda salió
+        # carísima); después, solo si alcanza para otra tanda dentro del frame
+        primera = True
+        while self._cola and (primera or time.perf_counter() + 2 * self._segundos_tanda < limite):
+            primera = False
+            clave = self._cola[0]
+            if not self._pendientes[clave]:  # todas canceladas
+                self._cola.popleft()
+                del self._pendientes[clave]
+                self._actual = None
+                continue
+            busqueda = self._actual
+            if busqueda is None or busqueda.version != grilla.version:
+                encontrada, ruta = grilla.en_cache(*clave)
+                if encontrada:
+                    self._cola.popleft()
+                    self._resolver(clave, ruta)
+                    terminadas += 1
+                    continue
+                # Nueva, o la grilla cambió a media búsqueda: se empieza de nuevo
+                busqueda = self._actual = BusquedaAStar(grilla, *clave)
+            terminada = busqueda.avanzar(limite=limite, tanda=self.expansiones_por_tanda)
+            if busqueda.segundos_tanda:
+                self._segundos_tanda = busqueda.segundos_tanda
+            if terminada:
+                self._cola.popleft()
+                self._actual = None
+                self._resolver(clave, busqueda.ruta)
+                terminadas += 1
+        return terminadas
+
+
+# ================= BENCHMARK =================
+
+def benchmark(clave: str = "zona_verde", rutas: int = 100, seed: int = 5, fps: int = 60):
+    """
+    100 NPCs piden ruta en el mismo frame. Se compara buscar todas cada
+    frame (sin caché), el planificador con presupuesto por frame y pedir
+    las mismas rutas otra vez (caché); después un NPC se para en medio de
+    varias rutas.
+    """
+    import random
+
+    from GUI.Escenarios import MapaTiles
+
+    mapa = MapaTiles.desde_json(clave)
+    grilla = GrillaNavegacion.desde_mapa(mapa)
+    rng = random.Random(seed)
+    libres = [grilla.celda(i) for i, c in enumerate(grilla.caminable) if c]
+    pedidos = [(rng.choice(libres), rng.choice(libres)) for _ in range(rutas)]
+    print(f"{mapa.nombre}: {mapa.ancho}x{mapa.alto} px, {grilla.columnas}x{grilla.filas} baldosas, "
+          f"{len(libres)} caminables; {rutas} rutas a la vez")
+
+    # Sin caché: cada búsqueda completa, todas en el mismo frame (la mejor de 3)
+    ms_todas = float("inf")
+    for _ in range(3):
+        inicio = time.perf_counter()
+        expandidos = 0
+        for a, b in pedidos:
+            busqueda = BusquedaAStar(grilla, a, b)
+            busqueda.avanzar()
+            expandidos += busqueda.expandidos
+        ms_todas = min(ms_todas, (time.perf_counter() - inicio) * 1000)
+    print(f"  Todas en un frame, sin caché:     {ms_todas:7.2f} ms ({expandidos:,} nodos expandidos)")
+
+    # Planificador: mismo trabajo repartido en frames de presupuesto fijo (la mejor de 3)
+    frames = None
+    for _ in range(3):
+        grilla.olvidar_rutas()
+        planificador = PlanificadorRutas(grilla)
+        solicitudes = [planificador.pedir(a, b) for a, b in pedidos]
+        vuelta = []
+        while len(planificador):
+            inicio = time.perf_counter()
+            planificador.procesar()
+            vuelta.append((time.perf_counter() - inicio) * 1000)
+        if frames is None or max(vuelta) < max(frames):
+            frames = vuelta
+    con_camino = sum(s.ruta is not None for s in solicitudes)
+    print(f"  Planificador ({planificador.presupuesto_ms:.0f} ms por frame):    "
+          f"{len(frames)} frames, peor frame {max(frames):.2f} ms; {con_camino} con camino")
+    assert max(frames) <= planificador.presupuesto_ms, "el planificador se pasó del presupuesto"
+
+    # Las mismas rutas otra vez: salen de la caché
+    inicio = time.perf_counter()
+    for a, b in pedidos:
+        assert planificador.pedir(a, b).lista
+    ms_cache = (time.perf_counter() - inicio) * 1000
+    print(f"  Pedirlas otra vez (caché):        {ms_cache:7.2f} ms")
+    print(f"  Buscar todas cada frame costaría {ms_todas * fps / 10:.0f}% de cada segundo a {fps} fps; "
+          f"con la caché, {ms_cache * fps / 10:.1f}%")
+
+    # Un NPC se para en la baldosa más transitada
+    uso = {}
+    for s in solicitudes:
+        for celda in s.ruta or ():
+            if celda not in (s.inicio, s.fin):
+                uso[celda] = uso.get(celda, 0) + 1
+    celda, afectadas = max(uso.items(), key=lambda par: par[1])
+    fallos = grilla.fallos
+    grilla.bloquear(*celda)
+    nuevas = [planificador.pedir(a, b) for a, b in pedidos]
+    inicio = time.perf_counter()
+    while len(planificador):
+        planificador.procesar()
+    ms_invalidar = (time.perf_counter() - inicio) * 1000
+    assert all(celda not in (s.ruta or ()) for s in nuevas)
+    recalculadas = grilla.fallos - fallos
+    print(f"  NPC parado en {celda} (lo cruzaban {afectadas} rutas): {recalculadas} recalculadas "
+          f"en {ms_invalidar:.2f} ms, las otras {rutas - recalculadas} salieron de la caché")
+
+
+if __name__ == "__main__":
+    benchmark()
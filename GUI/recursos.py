@@ -0,0 +1,72 @@
+"""
+Texturas del juego.
+
+textura("player") devuelve la arcade.Texture de esa imagen; las siguientes
+veces devuelve la misma textura. Así solo se cargan las imágenes que de
+verdad se usan.
+
+- Sprites (jugador, NPCs, interfaz): salen de la hoja de sprites
+  (GUI/atlas.py), ya escalados al tamaño del juego. La primera vez que se
+  pide uno se cargan todas las hojas del paquete de datos
+  (Logic/Class/Paquete.py) y se crean las texturas de todos los sprites;
+  si el paquete no está armado, las hojas se arman al vuelo desde los
+  PNG fuente.
+- Fondos: imagen/<nombre> del paquete y si no está, el PNG suelto.
+
+Las colisiones van por la grilla del escenario (GUI/colisiones.py), así
+que el hit box de cada textura es su rectángulo: calcular el contorno de
+una imagen de 1100x720 toma cientos de ms y no se usa.
+"""
+import arcade
+
+from Logic.Class.Paquete import IMAGENES, paquete_juego
+
+_texturas = {}
+_sprites = None
+
+
+def _texturas_sprites() -> dict:
+    """clave -> Texture de cada sprite de las hojas (se arman una sola vez)."""
+    global _sprites
+    if _sprites is None:
+        from GUI.atlas import construir, recortar
+
+        paquete = paquete_juego()
+        if paquete is not None and "atlas/sprites" in paquete:
+            tabla = paquete.json("atlas/sprites")
+            n_hojas = 1 + max((datos[0] for datos in tabla.values()), default=-1)
+            hojas = [paquete.imagen(f"sprites_{i}").convert("RGBA") for i in range(n_hojas)]
+        else:
+            hojas, tabla = construir()
+        _sprites = {
+            clave: arcade.Texture(
+                recortar(hojas, tabla, clave), hash=f"pokeu:sprite:{clave}",
+                hit_box_algorithm=arcade.hitbox.algo_bounding_box,
+            )
+            for clave in tabla
+        }
+    return _sprites
+
+
+def textura(nombre: str) -> arcade.Texture:
+    tex = _texturas.get(nombre)
+    if tex is None:
+        if nombre not in IMAGENES:
+            tex = _texturas_sprites()[nombre]
+        else:
+            paquete = paquete_juego()
+            if paquete is not None and f"imagen/{nombre}" in paquete:
+                imagen = paquete.imagen(nombre).convert("RGBA")
+                tex = arcade.Texture(
+                    imagen, hash=f"pokeu:{nombre}", hit_box_algorithm=arcade.hitbox.algo_bounding_box
+                )
+            else:
+                tex = arcade.load_texture(
+                    IMAGENES[nombre], hit_box_algorithm=arcade.hitbox.algo_bounding_box
+                )
+        _texturas[nombre] = tex
+    return tex
+
+
+def texturas_cargadas() -> tuple:
+    return tuple(_texturas)
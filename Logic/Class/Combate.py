@@ -0,0 +1,387 @@
+"""
+Motor de combate por turnos, sin nada de arcade (se puede correr sin ventana).
+
+Un Combate enfrenta dos equipos de Pokemon (lado 0 y lado 1). En cada turno
+cada lado elige una acción:
+    (ATACAR, i)  usar el movimiento i del pokemon activo
+    (CAMBIAR, j) mandar al pokemon j del equipo
+Un lado sin movimientos ni nadie a quien cambiar se queda: (CAMBIAR, activo)
+no hace nada. Los cambios van primero; después atacan por orden de velocidad. Si un
+pokemon se debilita entra automáticamente el siguiente que siga en pie.
+
+Toda la aleatoriedad del combate (precisión, críticos, daño, empates de
+velocidad) sale de un random.Random con la semilla del combate, así que la
+misma semilla + las mismas acciones dan exactamente el mismo combate.
+Cada Combate guarda su semilla y las acciones jugadas (historial, un byte
+por acción), que es todo lo que Logic.Class.Repeticion necesita para
+grabarlo y reproducirlo.
+
+simular_batallas() juega muchos combates repartidos en varios procesos y
+devuelve la tasa de victorias con su intervalo de confianza:
+    python -m Logic.Class.Combate
+"""
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from Logic.Class.Tipo import tabla_tipos
+from Logic.Funcs.calcularDaño import calcularDaño
+
+ATACAR = 0
+CAMBIAR = 1
+
+EMPATE = -1
+MAX_TURNOS = 500
+PROBABILIDAD_CRITICO = 1 / 24
+MAX_INDICE_ACCION = 0x7F
+
+
+def codificar_accion(accion) -> int:
+    """(tipo, indice) -> un byte: el bit alto es el tipo y los 7 bajos el índice."""
+    tipo, indice = accion
+    if not 0 <= indice <= MAX_INDICE_ACCION:
+        raise ValueError(f"Índice de acción fuera de rango: {indice}")
+    return tipo << 7 | indice
+
+
+def decodificar_accion(byte: int):
+    return byte >> 7, byte & MAX_INDICE_ACCION
+
+
+class Combate:
+    """Estado de un combate entre dos equipos. No modifica los equipos originales."""
+
+    __slots__ = (
+        "equipos", "activos", "rng", "turno", "ganador", "tabla", "max_turnos",
+        "semilla", "iniciales", "historial",
+    )
+
+    def __init__(self, equipo_a, equipo_b, semilla: int = 0, max_turnos: int = MAX_TURNOS):
+        self.equipos = ([p.copia() for p in equipo_a], [p.copia() for p in equipo_b])
+        # Para grabar el combate: los equipos tal como entraron (copias: lo que
+        # el dueño les haga después no cambia la repetición), la semilla y las
+        # acciones (dos bytes por turno, ver codificar_accion)
+        self.iniciales = (tuple(p.copia() for p in equipo_a), tuple(p.copia() for p in equipo_b))
+        self.semilla = semilla
+        self.historial = bytearray()
+        self.activos = [0, 0]
+        self.rng = random.Random(semilla)
+        self.turno = 0
+        self.ganador = None
+        self.tabla = tabla_tipos()
+        self.max_turnos = max_turnos
+        for lado in (0, 1):
+            self._entrar_siguiente(lado)
+        self._revisar_fin()
+
+    def clonar(self, semilla: int = None) -> "Combate":
+        """
+        Copia independiente del estado actual. Con semilla el clon tiene su
+        propio azar (lo que usa la IA para imaginar turnos sin "ver" los
+        resultados del combate real); esos clones no se pueden grabar.
+        """
+        otro = Combate.__new__(Combate)
+        otro.equipos = tuple([p.copia() for p in equipo] for equipo in self.equipos)
+        otro.activos = list(self.activos)
+        otro.turno = self.turno
+        otro.ganador = self.ganador
+        otro.tabla = self.tabla
+        otro.max_turnos = self.max_turnos
+        if semilla is None:
+            otro.rng = random.Random()
+            otro.rng.setstate(self.rng.getstate())
+            otro.semilla = self.semilla
+            otro.iniciales = self.iniciales
+            otro.historial = bytearray(self.historial)
+        else:
+            otro.rng = random.Random(semilla)
+            otro.semilla = semilla
+            otro.iniciales = None
+            otro.historial = bytearray()
+        return otro
+
+    @property
+    def terminado(self) -> bool:
+        return self.ganador is not None
+
+    def activo(self, lado: int):
+        return self.equipos[lado][self.activos[lado]]
+
+    def acciones(self, lado: int) -> list:
+        """
+        Acciones válidas para el lado en este turno. Nunca está vacía: si el
+        activo no tiene movimientos y no hay a quién cambiar, la única es
+        quedarse (cambiar al mismo pokemon), y el combate sigue hasta que el
+        otro lado gane o se llegue a max_turnos.
+        """
+        activo = self.activo(lado)
+        acciones = [(ATACAR, i) for i in range(len(activo.movimientos))]
+        acciones += [
+            (CAMBIAR, j) for j, p in enumerate(self.equipos[lado])
+            if j != self.activos[lado] and not p.debilitado
+        ]
+        return acciones or [(CAMBIAR, self.activos[lado])]
+
+    def jugar_turno(self, accion_a, accion_b):
+        if self.terminado:
+            raise ValueError("El combate ya terminó")
+        acciones = (accion_a, accion_b)
+        self.historial.append(codificar_accion(accion_a))
+        self.historial.append(codificar_accion(accion_b))
+
+        # 1. Cambios
+        for lado in (0, 1):
+            tipo, indice = acciones[lado]
+            if tipo == CAMBIAR:
+                if self.equipos[lado][indice].debilitado:
+                    raise ValueError(f"El lado {lado} no puede cambiar a un pokemon debilitado")
+                self.activos[lado] = indice
+
+        # 2. Ataques, el más rápido primero (empate de velocidad: moneda)
+        velocidad_a = self.activo(0).velocidad
+        velocidad_b = self.activo(1).velocidad
+        if velocidad_a != velocidad_b:
+            orden = (0, 1) if velocidad_a > velocidad_b else (1, 0)
+        else:
+            orden = (0, 1) if self.rng.random() < 0.5 else (1, 0)
+        for lado in orden:
+            tipo, indice = acciones[lado]
+            if tipo == ATACAR and not self.activo(lado).debilitado:
+                self._atacar(lado, indice)
+
+        # 3. Reemplazar debilitados y revisar si alguien ganó
+        for lado in (0, 1):
+            if self.activo(lado).debilitado:
+                self._entrar_siguiente(lado)
+        self.turno += 1
+        self._revisar_fin()
+
+    def _atacar(self, lado: int, indice: int):
+        atacante = self.activo(lado)
+        defensor = self.activo(1 - lado)
+        if defensor.debilitado:
+            return
+        movimiento = atacante.movimientos[indice]
+        rng = self.rng
+        if rng.random() * 100 >= movimiento.precision:
+            return  # falló
+        critico = rng.random() < PROBABILIDAD_CRITICO
+        efectividad = self.tabla.efectividad_doble(movimiento.tipo, defensor.tipo1, defensor.tipo2)
+        stab = 1.5 if movimiento.tipo in (atacante.tipo1, atacante.tipo2) else 1.0
+        daño = calcularDaño(
+            atacante.nivel, atacante.ataque, defensor.defensa, movimiento.poder,
+            efectividad, stab, critico=critico, rng=rng,
+        )
+        defensor.recibir_daño(daño)
+
+    def _entrar_siguiente(self, lado: int):
+        if not self.activo(lado).debilitado:
+            return
+        for j, pokemon in enumerate(self.equipos[lado]):
+            if not pokemon.debilitado:
+                self.activos[lado] = j
+                return
+
+    def _revisar_fin(self):
+        vivos = [any(not p.debilitado for p in equipo) for equipo in self.equipos]
+        if not vivos[0] and not vivos[1]:
+            self.ganador = EMPATE
+        elif not vivos[0]:
+            self.ganador = 1
+        elif not vivos[1]:
+            self.ganador = 0
+        elif self.turno >= self.max_turnos:
+            self.ganador = EMPATE
+
+
+# ================= POLÍTICAS =================
+# politica(combate, lado, rng) -> acción. Usan su propio rng para no
+# alterar la secuencia aleatoria del combate.
+
+def politica_aleatoria(combate: Combate, lado: int, rng: random.Random):
+    return rng.choice(combate.acciones(lado))
+
+
+def politica_mas_daño(combate: Combate, lado: int, rng: random.Random):
+    """Usa el movimiento con más daño esperado; nunca cambia por gusto."""
+    atacante = combate.activo(lado)
+    defensor = combate.activo(1 - lado)
+    mejor = None
+    mejor_valor = -1.0
+    for i, movimiento in enumerate(atacante.movimientos):
+        valor = (
+            movimiento.poder * movimiento.precision
+            * combate.tabla.efectividad_doble(movimiento.tipo, defensor.tipo1, defensor.tipo2)
+            * (1.5 if movimiento.tipo in (atacante.tipo1, atacante.tipo2) else 1.0)
+        )
+        if valor > mejor_valor:
+            mejor, mejor_valor = (ATACAR, i), valor
+    if mejor is not None:
+        return mejor
+    acciones = combate.acciones(lado)
+    return acciones[0] if rng is None else rng.choice(acciones)
+
+
+def jugar_combate(equipo_a, equipo_b, semilla: int,
+                  politica_a=politica_mas_daño, politica_b=politica_mas_daño, escritor=None):
+    """
+    Juega un combate completo. Devuelve (ganador, turnos).
+    Con escritor (un Logic.Class.Repeticion.EscritorRepeticiones) lo graba.
+    """
+    combate = Combate(equipo_a, equipo_b, semilla)
+    rng_politicas = random.Random(semilla ^ 0x5EED)
+    while not combate.terminado:
+        combate.jugar_turno(
+            politica_a(combate, 0, rng_politicas),
+            politica_b(combate, 1, rng_politicas),
+        )
+    if escritor is not None:
+        escritor.escribir(combate)
+    return combate.ganador, combate.turno
+
+
+# ================= SIMULACIÓN MONTE CARLO =================
+
+class ResultadoSimulacion:
+    """Victorias de cada lado, empates e intervalos de confianza (Wilson)."""
+
+    def __init__(self, victorias_a=0, victorias_b=0, empates=0, turnos=0):
+        self.victorias_a = victorias_a
+        self.victorias_b = victorias_b
+        self.empates = empates
+        self.turnos = turnos
+
+    @property
+    def total(self) -> int:
+        return self.victorias_a + self.victorias_b + self.empates
+
+    def sumar(self, otro: "ResultadoSimulacion"):
+        self.victorias_a += otro.victorias_a
+        self.victorias_b += otro.victorias_b
+        self.empates += otro.empates
+        self.turnos += otro.turnos
+
+    def tasa(self, lado: int = 0) -> float:
+        victorias = self.victorias_a if lado == 0 else self.victorias_b
+        return victorias / self.total if self.total else 0.0
+
+    def intervalo(self, lado: int = 0, z: float = 1.96):
+        """Intervalo de Wilson para la tasa de victorias (z=1.96 -> 95%)."""
+        n = self.total
+        if n == 0:
+            return 0.0, 1.0
+        p = self.tasa(lado)
+        centro = (p + z * z / (2 * n)) / (1 + z * z / n)
+        margen = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return max(0.0, centro - margen), min(1.0, centro + margen)
+
+    def __str__(self):
+        a_min, a_max = self.intervalo(0)
+        b_min, b_max = self.intervalo(1)
+        return (
+            f"{self.total:,} combates ({self.turnos / max(1, self.total):.1f} turnos de media)\n"
+            f"  Equipo A: {self.tasa(0):.2%} [{a_min:.2%}, {a_max:.2%}]\n"
+            f"  Equipo B: {self.tasa(1):.2%} [{b_min:.2%}, {b_max:.2%}]\n"
+            f"  Empates:  {self.empates:,}"
+        )
+
+
+def semilla_lote(semilla: int, lote: int) -> int:
+    """Semilla del lote número `lote`; no depende de cuántos procesos haya."""
+    return random.Random(semilla * 1_000_003 + lote).getrandbits(63)
+
+
+def _simular_lote(equipo_a, equipo_b, cantidad, semilla, politica_a, politica_b):
+    rng = random.Random(semilla)
+    resultado = ResultadoSimulacion()
+    for _ in range(cantidad):
+        ganador, turnos = jugar_combate(
+            equipo_a, equipo_b, rng.getrandbits(63), politica_a, politica_b
+        )
+        if ganador == 0:
+            resultado.victorias_a += 1
+        elif ganador == 1:
+            resultado.victorias_b += 1
+        else:
+            resultado.empates += 1
+        resultado.turnos += turnos
+    return resultado
+
+
+def simular_batallas(equipo_a, equipo_b, n: int, semilla: int = 0, procesos: int = None,
+                     politica_a=politica_mas_daño, politica_b=politica_mas_daño,
+                     tamaño_lote: int = 2_000) -> ResultadoSimulacion:
+    """
+    Juega n combates entre los dos equipos repartidos en un pool de procesos.
+
+    Los combates se dividen en lotes de tamaño fijo y cada lote tiene una
+    semilla propia derivada de `semilla`, así que el resultado es el mismo
+    con 1 o con 32 procesos. Las políticas deben ser funciones de módulo
+    (se mandan a los procesos con pickle).
+    """
+    lotes = [
+        (min(tamaño_lote, n - inicio), semilla_lote(semilla, numero))
+        for numero, inicio in enumerate(range(0, n, tamaño_lote))
+    ]
+    resultado = ResultadoSimulacion()
+    if procesos == 1 or len(lotes) == 1:
+        for cantidad, semilla_de_lote in lotes:
+            resultado.sumar(_simular_lote(
+                equipo_a, equipo_b, cantidad, semilla_de_lote, politica_a, politica_b
+            ))
+        return resultado
+
+    with ProcessPoolExecutor(max_workers=procesos or os.cpu_count()) as pool:
+        futuros = [
+            pool.submit(
+                _simular_lote, equipo_a, equipo_b, cantidad, semilla_de_lote,
+                politica_a, politica_b,
+            )
+            for cantidad, semilla_de_lote in lotes
+        ]
+        for futuro in futuros:
+            resultado.sumar(futuro.result())
+    return resultado
+
+
+# ================= EJEMPLO =================
+
+def equipos_de_ejemplo():
+    from Logic.Class.Movimiento import Movimiento
+    from Logic.Class.Pokemon import Pokemon
+
+    t = tabla_tipos().id
+    placaje = Movimiento("Placaje", t("Normal"), 40)
+    ascuas = Movimiento("Ascuas", t("Fuego"), 40)
+    lanzallamas = Movimiento("Lanzallamas", t("Fuego"), 90)
+    pistola_agua = Movimiento("Pistola Agua", t("Agua"), 40)
+    surf = Movimiento("Surf", t("Agua"), 90)
+    latigo = Movimiento("Látigo Cepa", t("Planta"), 45)
+    rayo = Movimiento("Rayo", t("Eléctrico"), 90)
+    terremoto = Movimiento("Terremoto", t("Tierra"), 100)
+    roca = Movimiento("Avalancha", t("Roca"), 75, 90)
+
+    equipo_a = [
+        Pokemon(4, 30, (39, 52, 43, 65), t("Fuego"), movimientos=(placaje, ascuas, lanzallamas)),
+        Pokemon(25, 30, (35, 55, 40, 90), t("Eléctrico"), movimientos=(placaje, rayo)),
+        Pokemon(74, 30, (40, 80, 100, 20), t("Roca"), t("Tierra"), movimientos=(roca, terremoto)),
+    ]
+    equipo_b = [
+        Pokemon(7, 30, (44, 48, 65, 43), t("Agua"), movimientos=(placaje, pistola_agua, surf)),
+        Pokemon(1, 30, (45, 49, 49, 45), t("Planta"), t("Veneno"), movimientos=(placaje, latigo)),
+        Pokemon(133, 30, (55, 55, 50, 55), t("Normal"), movimientos=(placaje,)),
+    ]
+    return equipo_a, equipo_b
+
+
+if __name__ == "__main__":
+    import time
+
+    equipo_a, equipo_b = equipos_de_ejemplo()
+    n = 200_000
+    inicio = time.perf_counter()
+    resultado = simular_batallas(equipo_a, equipo_b, n, semilla=42)
+    segundos = time.perf_counter() - inicio
+    print(resultado)
+    print(f"{n / segundos * 60:,.0f} combates por minuto con {os.cpu_count()} núcleo(s)")
@@ -0,0 +1,266 @@
+"""
+Entrenadores NPC con IA de combate.
+
+La IA elige su acción con una búsqueda Monte Carlo (MCTS) sobre copias del
+Combate: imagina muchos turnos posibles, cada uno con azar propio, y se
+queda con la acción que mejor resultado dio. Como los dos lados eligen a la
+vez, cada nodo lleva estadísticas separadas para cada lado (UCT
+desacoplado): el rival también juega lo mejor que encuentra.
+
+- Presupuesto: tiempo_ms por turno y/o max_nodos (iteraciones). La
+  dificultad es solo cuánto piensa.
+- Tabla de transposición: los nodos se guardan por estado (vida de cada
+  pokemon + activos) y se reutilizan de un turno al siguiente y cuando dos
+  caminos llegan al mismo estado.
+- pensar() corre la búsqueda en un hilo aparte y devuelve un Future, igual
+  que AuthService: la vista revisa future.done() en on_update y nunca se
+  traba dibujando. El hilo de la IA comparte el GIL, así que un frame
+  puede esperar hasta sys.getswitchinterval() (5 ms), dentro de los 16 ms
+  de un frame a 60 fps.
+
+Prueba (contra la política de más daño y ritmo de frames):
+    python -m Logic.Class.Entrenador
+"""
+import math
+import random
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from Logic.Class.Combate import EMPATE, politica_mas_daño
+
+DIFICULTADES = {"facil": 5, "normal": 30, "dificil": 120}  # ms por turno
+
+MAX_TABLA = 200_000
+PROFUNDIDAD_ARBOL = 30
+PROFUNDIDAD_SIMULACION = 20
+
+_executor = None
+
+
+def _hilo_ia() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="entrenador")
+    return _executor
+
+
+def clave_estado(combate) -> tuple:
+    equipo_a, equipo_b = combate.equipos
+    return (
+        tuple(p.hp for p in equipo_a), combate.activos[0],
+        tuple(p.hp for p in equipo_b), combate.activos[1],
+    )
+
+
+def valor_final(combate) -> float:
+    """Valor para el lado 0: 1 si ganó, 0 si perdió; si no terminó, la
+    fracción de vida total que le queda frente al rival."""
+    if combate.ganador == 0:
+        return 1.0
+    if combate.ganador == 1:
+        return 0.0
+    if combate.ganador == EMPATE:
+        return 0.5
+    vida = [sum(p.hp / p.hp_max for p in equipo) for equipo in combate.equipos]
+    total = vida[0] + vida[1]
+    return vida[0] / total if total else 0.5
+
+
+class Nodo:
+    """Un estado del árbol: acciones de cada lado con visitas y valor acumulado."""
+
+    __slots__ = ("visitas", "acciones", "n", "w")
+
+    def __init__(self, combate):
+        self.visitas = 0
+        self.acciones = (combate.acciones(0), combate.acciones(1))
+        self.n = ([0] * len(self.acciones[0]), [0] * len(self.acciones[1]))
+        self.w = ([0.0] * len(self.acciones[0]), [0.0] * len(self.acciones[1]))
+
+    def elegir(self, lado: int, exploracion: float) -> int:
+        """UCB1: primero cada acción una vez, después la de mejor cota."""
+        n = self.n[lado]
+        w = self.w[lado]
+        log_total = math.log(self.visitas + 1)
+        mejor, mejor_cota = 0, -1.0
+        for i, visitas in enumerate(n):
+            if visitas == 0:
+                return i
+            cota = w[i] / visitas + exploracion * math.sqrt(log_total / visitas)
+            if cota > mejor_cota:
+                mejor, mejor_cota = i, cota
+        return mejor
+
+
+class Entrenador:
+    """
+    Un NPC con su equipo. tiempo_ms y max_nodos limitan la búsqueda de cada
+    turno (lo que se cumpla primero; None = sin ese límite).
+    """
+
+    def __init__(self, nombre: str, equipo, tiempo_ms: float = DIFICULTADES["normal"],
+                 max_nodos: int = None, exploracion: float = 1.4, semilla: int = None):
+        if tiempo_ms is None and max_nodos is None:
+            raise ValueError("Hace falta un límite de tiempo o de nodos")
+        self.nombre = nombre
+        self.equipo = equipo
+        self.tiempo_ms = tiempo_ms
+        self.max_nodos = max_nodos
+        self.exploracion = exploracion
+        self.rng = random.Random(semilla)
+        self._tabla = {}
+        self._iniciales = None
+        self.ultimas_iteraciones = 0
+
+    @classmethod
+    def con_dificultad(cls, nombre: str, equipo, dificultad: str = "normal", **kwargs):
+        return cls(nombre, equipo, tiempo_ms=DIFICULTADES[dificultad], **kwargs)
+
+    def _nodo(self, combate) -> Nodo:
+        clave = clave_estado(combate)
+        nodo = self._tabla.get(clave)
+        if nodo is None:
+            if len(self._tabla) >= MAX_TABLA:
+                # Se descarta la mitad más vieja (los dict guardan el orden de inserción)
+                for vieja in list(self._tabla)[:MAX_TABLA // 2]:
+                    del self._tabla[vieja]
+            nodo = self._tabla[clave] = Nodo(combate)
+        return nodo
+
+    def elegir_accion(self, combate, lado: int):
+        """Busca dentro del presupuesto y devuelve la acción para `lado`."""
+        if combate.iniciales is not self._iniciales:
+            self._tabla.clear()  # otro combate: los estados viejos no sirven
+            self._iniciales = combate.iniciales
+        acciones = combate.acciones(lado)
+        if len(acciones) == 1:
+            return acciones[0]
+
+        raiz = self._nodo(combate)
+        rng = self.rng
+        limite = None if self.tiempo_ms is None else time.perf_counter() + self.tiempo_ms / 1000
+        iteraciones = 0
+        while True:
+            if self.max_nodos is not None and iteraciones >= self.max_nodos:
+                break
+            if limite is not None and time.perf_counter() >= limite:
+                break
+            self._iterar(raiz, combate.clonar(rng.getrandbits(63)), rng)
+            iteraciones += 1
+        self.ultimas_iteraciones = iteraciones
+
+        visitas = raiz.n[lado]
+        return raiz.acciones[lado][max(range(len(visitas)), key=visitas.__getitem__)]
+
+    def _iterar(self, raiz: Nodo, sim, rng):
+        camino = []
+        nodo = raiz
+        while not sim.terminado and len(camino) < PROFUNDIDAD_ARBOL:
+            i_a = nodo.elegir(0, self.exploracion)
+            i_b = nodo.elegir(1, self.exploracion)
+            camino.append((nodo, i_a, i_b))
+            sim.jugar_turno(nodo.acciones[0][i_a], nodo.acciones[1][i_b])
+            if sim.terminado:
+                break
+            visitado = clave_estado(sim) in self._tabla
+            nodo = self._nodo(sim)
+            if not visitado:
+                break
+
+        # Simulación rápida desde la hoja con la política de más daño
+        for _ in range(PROFUNDIDAD_SIMULACION):
+            if sim.terminado:
+                break
+            sim.jugar_turno(politica_mas_daño(sim, 0, rng), politica_mas_daño(sim, 1, rng))
+
+        valor = valor_final(sim)
+        for nodo, i_a, i_b in camino:
+            nodo.visitas += 1
+            nodo.n[0][i_a] += 1
+            nodo.w[0][i_a] += valor
+            nodo.n[1][i_b] += 1
+            nodo.w[1][i_b] += 1.0 - valor
+
+    def pensar(self, combate, lado: int) -> Future:
+        """
+        elegir_accion en el hilo de la IA. El combate se copia antes, así
+        que la vista puede seguir leyéndolo mientras tanto.
+        """
+        return _hilo_ia().submit(self.elegir_accion, combate.clonar(), lado)
+
+    def politica(self, combate, lado: int, rng=None):
+        """Misma firma que las políticas de Combate (para jugar_combate)."""
+        return self.elegir_accion(combate, lado)
+
+    def __repr__(self):
+        return f"Entrenador({self.nombre!r}, {len(self.equipo)} pokemon)"
+
+
+# ================= PRUEBA =================
+
+def evaluar(combates: int = 40, tiempo_ms: float = 20):
+    """
+    Combate espejo (el mismo equipo de los dos lados): el lado B juega con
+    la política de más daño y después con la IA, con las mismas semillas.
+    """
+    from Logic.Class.Combate import equipos_de_ejemplo, jugar_combate
+
+    equipo_a, _ = equipos_de_ejemplo()
+    equipo_b = equipo_a
+    rival = Entrenador("Rival", equipo_b, tiempo_ms=tiempo_ms, semilla=1)
+    resultados = {"más daño": 0, f"IA {tiempo_ms:.0f} ms": 0}
+    iteraciones = []
+    for semilla in range(combates):
+        ganador, _ = jugar_combate(equipo_a, equipo_b, semilla)
+        resultados["más daño"] += ganador == 1
+
+        def politica_ia(combate, lado, rng):
+            accion = rival.politica(combate, lado)
+            iteraciones.append(rival.ultimas_iteraciones)
+            return accion
+
+        ganador, _ = jugar_combate(equipo_a, equipo_b, semilla, politica_b=politica_ia)
+        resultados[f"IA {tiempo_ms:.0f} ms"] += ganador == 1
+    print(f"Victorias del lado B en {combates} combates espejo:")
+    for nombre, victorias in resultados.items():
+        print(f"  {nombre:<12} {victorias / combates:.0%}")
+    print(f"  Iteraciones por turno de la IA: {sum(iteraciones) / max(1, len(iteraciones)):.0f} de media")
+
+
+def prueba_frames(turnos: int = 20, tiempo_ms: float = 100, fps: int = 60):
+    """
+    Bucle de "vista" a fps que pide una jugada con pensar() y mide cuánto
+    tarda cada respuesta y cada frame mientras la IA piensa.
+    """
+    from Logic.Class.Combate import Combate, equipos_de_ejemplo
+
+    equipo_a, equipo_b = equipos_de_ejemplo()
+    rival = Entrenador("Rival", equipo_b, tiempo_ms=tiempo_ms, semilla=2)
+    combate = Combate(equipo_a, equipo_b, semilla=3)
+    presupuesto = 1.0 / fps
+    frames = []
+    esperas = []
+    futuro = None
+    pedido = 0.0
+    while turnos and not combate.terminado:
+        inicio = time.perf_counter()
+        if futuro is None:
+            futuro, pedido = rival.pensar(combate, 1), inicio
+        elif futuro.done():
+            esperas.append(inicio - pedido)
+            combate.jugar_turno(politica_mas_daño(combate, 0, None), futuro.result())
+            futuro = None
+            turnos -= 1
+        frames.append(time.perf_counter() - inicio)
+        time.sleep(max(0.0, presupuesto - (time.perf_counter() - inicio)))
+
+    frames.sort()
+    print(f"{len(esperas)} jugadas pedidas con presupuesto de {tiempo_ms:.0f} ms: "
+          f"respuesta peor {max(esperas) * 1000:.1f} ms (incluye esperar al siguiente frame)")
+    print(f"{len(frames)} frames, trabajo por frame peor {frames[-1] * 1000:.2f} ms "
+          f"(presupuesto {presupuesto * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    evaluar()
+    prueba_frames()
@@ -0,0 +1,21 @@
+"""
+Movimientos (ataques) que puede usar un pokemon en combate.
+
+No confundir con GUI/movimiento.py, que es el movimiento del jugador por el
+mapa.
+"""
+
+
+class Movimiento:
+    """Un ataque. tipo es un id de Logic.Class.Tipo; precision va de 0 a 100."""
+
+    __slots__ = ("nombre", "tipo", "poder", "precision")
+
+    def __init__(self, nombre: str, tipo: int, poder: int, precision: int = 100):
+        self.nombre = nombre
+        self.tipo = tipo
+        self.poder = poder
+        self.precision = precision
+
+    def __repr__(self):
+        return f"Movimiento({self.nombre!r}, tipo={self.tipo}, poder={self.poder})"
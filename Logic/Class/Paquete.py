@@ -0,0 +1,294 @@
+"""
+Paquete de datos del juego: un solo archivo con todas las especies e
+imágenes, leído con mmap.
+
+Formato (little-endian):
+
+    cabecera   b"PKUP", versión (H), cantidad de entradas (I)
+    índice     una entrada de tamaño fijo por registro, ordenadas por clave:
+               clave UTF-8 rellenada con ceros (48s), inicio (Q) y largo (I)
+    datos      los registros crudos uno detrás de otro
+
+Abrir el paquete solo lee la cabecera; el índice se consulta con búsqueda
+binaria directo sobre el mmap, así que abrir no depende de cuánto
+contenido haya. Un registro se lee (y el sistema lo trae del disco) la
+primera vez que se pide, así que en memoria solo queda lo que el jugador
+ya vio.
+
+Claves que usa el juego:
+    especies/indice        id, nombre, tipos y lugares de todas las especies
+    especie/<id>           los datos completos de una especie (JSON)
+    imagen/<nombre>        un PNG (ver IMAGENES)
+    imagen/sprites_<n>     las hojas de sprites (GUI/atlas.py)
+    atlas/sprites          dónde está cada sprite en las hojas (JSON)
+    chunk/<nombre>/<cx>_<cy>
+                           el pedazo de TAMAÑO_CHUNK x TAMAÑO_CHUNK de una
+                           imagen de fondo (cx, cy desde abajo a la izquierda)
+
+Armar el paquete (después de cambiar especies.json o alguna imagen):
+    python -m Logic.Class.Paquete
+Si alguna de esas fuentes es más nueva que el paquete, el juego avisa al
+abrirlo y usa los archivos sueltos (ver fuentes_del_juego).
+"""
+import json
+import mmap
+import os
+import struct
+
+from Logic.Class.Tipo import DATA_DIR
+
+RAIZ = os.path.dirname(os.path.dirname(DATA_DIR))
+PAQUETE = os.path.join(DATA_DIR, "pokeu.pak")
+
+# nombre -> ruta del PNG original (los sprites van aparte, en GUI/atlas.py)
+IMAGENES = {
+    "Zona_Verde": os.path.join(RAIZ, "Zona_Verde.png"),
+    "Auditorio": os.path.join(RAIZ, "Auditorio.png"),
+    "Parqueo": os.path.join(RAIZ, "Parqueo_.png"),
+}
+
+# Fondos que se dibujan por pedazos (ver GUI/Escenarios.py)
+FONDOS = ("Zona_Verde", "Auditorio", "Parqueo")
+TAMAÑO_CHUNK = 240
+
+MAGIC = b"PKUP"
+VERSION = 1
+LARGO_CLAVE = 48
+
+_CABECERA = struct.Struct("<4sHI")
+_ENTRADA = struct.Struct(f"<{LARGO_CLAVE}sQI")
+
+
+class Paquete:
+    """Un paquete abierto en solo lectura. Usar con `with` o llamar cerrar()."""
+
+    def __init__(self, ruta: str = PAQUETE):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        try:
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.cantidad = _CABECERA.unpack_from(self._mapa, 0)
+        except (ValueError, struct.error):
+            self._archivo.close()
+            raise ValueError(f"{ruta} no es un paquete de datos") from None
+        if magic != MAGIC or version != VERSION:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es un paquete de datos v{VERSION}")
+        self._json = {}
+
+    def _entrada(self, i: int):
+        return _ENTRADA.unpack_from(self._mapa, _CABECERA.size + i * _ENTRADA.size)
+
+    def _buscar(self, clave: str):
+        """(inicio, largo) del registro, o None. Búsqueda binaria en el índice."""
+        buscada = clave.encode("utf-8").ljust(LARGO_CLAVE, b"\0")
+        bajo, alto = 0, self.cantidad
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            actual, inicio, largo = self._entrada(medio)
+            if actual == buscada:
+                return inicio, largo
+            if actual < buscada:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return None
+
+    def __contains__(self, clave: str):
+        return self._buscar(clave) is not None
+
+    def __len__(self):
+        return self.cantidad
+
+    def claves(self):
+        for i in range(self.cantidad):
+            yield self._entrada(i)[0].rstrip(b"\0").decode("utf-8")
+
+    def leer(self, clave: str) -> bytes:
+        """Bytes del registro (KeyError si no existe)."""
+        posicion = self._buscar(clave)
+        if posicion is None:
+            raise KeyError(clave)
+        inicio, largo = posicion
+        return self._mapa[inicio:inicio + largo]
+
+    def json(self, clave: str):
+        """Registro JSON ya decodificado (se decodifica una sola vez)."""
+        datos = self._json.get(clave)
+        if datos is None:
+            datos = self._json[clave] = json.loads(self.leer(clave))
+        return datos
+
+    def imagen(self, nombre: str):
+        """La imagen imagen/<nombre> como PIL.Image."""
+        import io
+
+        from PIL import Image
+
+        imagen = Image.open(io.BytesIO(self.leer(f"imagen/{nombre}")))
+        imagen.load()
+        return imagen
+
+    def chunk(self, nombre: str, cx: int, cy: int):
+        """El pedazo chunk/<nombre>/<cx>_<cy> como PIL.Image, o None si no está."""
+        clave = f"chunk/{nombre}/{cx}_{cy}"
+        if clave not in self:
+            return None
+        import io
+
+        from PIL import Image
+
+        imagen = Image.open(io.BytesIO(self.leer(clave)))
+        imagen.load()
+        return imagen
+
+    def cerrar(self):
+        self._mapa.close()
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def construir_paquete(ruta: str, entradas) -> int:
+    """
+    Escribe un paquete con las entradas (clave, bytes). Se escribe a un
+    archivo temporal y se reemplaza al final, así que un paquete abierto
+    por el juego nunca queda a medio escribir.
+    """
+    entradas = sorted((clave.encode("utf-8"), datos) for clave, datos in entradas)
+    for i, (clave, _) in enumerate(entradas):
+        if len(clave) > LARGO_CLAVE:
+            raise ValueError(f"Clave demasiado larga: {clave.decode('utf-8')}")
+        if i and clave == entradas[i - 1][0]:
+            raise ValueError(f"Clave repetida: {clave.decode('utf-8')}")
+
+    temporal = ruta + ".tmp"
+    inicio = _CABECERA.size + len(entradas) * _ENTRADA.size
+    with open(temporal, "wb") as f:
+        f.write(_CABECERA.pack(MAGIC, VERSION, len(entradas)))
+        for clave, datos in entradas:
+            f.write(_ENTRADA.pack(clave, inicio, len(datos)))
+            inicio += len(datos)
+        for _, datos in entradas:
+            f.write(datos)
+    os.replace(temporal, ruta)
+    return len(entradas)
+
+
+def entradas_del_juego(ruta_especies: str = None, imagenes: dict = IMAGENES):
+    """Genera las entradas (clave, bytes) del paquete del juego."""
+    from Logic.Class.Pokedex import ESPECIES_JSON
+
+    with open(ruta_especies or ESPECIES_JSON, encoding="utf-8") as f:
+        especies = json.load(f)["especies"]
+    indice = [[e["id"], e["nombre"], e["tipos"], e.get("ubicaciones", [])] for e in especies]
+    yield "especies/indice", json.dumps(indice, ensure_ascii=False).encode("utf-8")
+    for e in especies:
+        yield f"especie/{e['id']}", json.dumps(e, ensure_ascii=False).encode("utf-8")
+    for nombre, ruta in imagenes.items():
+        with open(ruta, "rb") as f:
+            yield f"imagen/{nombre}", f.read()
+        if nombre in FONDOS:
+            yield from chunks_de_imagen(nombre, ruta)
+    from GUI.atlas import entradas_sprites
+
+    yield from entradas_sprites()
+
+
+def recortar_chunk(imagen, cx: int, cy: int, tamaño: int = TAMAÑO_CHUNK):
+    """El pedazo (cx, cy) de una PIL.Image; cy cuenta desde abajo."""
+    ancho, alto = imagen.size
+    izquierda = cx * tamaño
+    abajo = cy * tamaño
+    return imagen.crop((
+        izquierda, max(0, alto - abajo - tamaño), min(ancho, izquierda + tamaño), alto - abajo,
+    ))
+
+
+def chunks_de_imagen(nombre: str, ruta: str, tamaño: int = TAMAÑO_CHUNK):
+    """Genera (clave, PNG) de cada pedazo de la imagen."""
+    import io
+
+    from PIL import Image
+
+    with Image.open(ruta) as imagen:
+        imagen = imagen.convert("RGBA")
+        for cx in range(-(-imagen.width // tamaño)):
+            for cy in range(-(-imagen.height // tamaño)):
+                salida = io.BytesIO()
+                recortar_chunk(imagen, cx, cy, tamaño).save(salida, "PNG")
+                yield f"chunk/{nombre}/{cx}_{cy}", salida.getvalue()
+
+
+def fuentes_del_juego(imagenes: dict = IMAGENES) -> list:
+    """Los archivos con que se arma el paquete: especies, fondos (y sus chunks) y sprites."""
+    from GUI.atlas import SPRITES
+    from Logic.Class.Pokedex import ESPECIES_JSON
+
+    return [ESPECIES_JSON, *imagenes.values(), *(fuente.ruta for fuente in SPRITES.values())]
+
+
+def desactualizadas(ruta: str = PAQUETE, fuentes=None) -> list:
+    """Las fuentes modificadas después de armar el paquete (ruta tiene que existir)."""
+    armado = os.path.getmtime(ruta)
+    cambiadas = []
+    for fuente in fuentes_del_juego() if fuentes is None else fuentes:
+        try:
+            if os.path.getmtime(fuente) > armado:
+                cambiadas.append(fuente)
+        except OSError:
+            pass  # si falta una fuente, el paquete es lo único que queda
+    return cambiadas
+
+
+_paquete = None
+_revisado = False
+
+
+def paquete_juego():
+    """
+    El paquete del juego (abierto una sola vez), o None si no se ha armado
+    o quedó más viejo que alguno de sus archivos fuente; en ese caso se
+    avisa y se usan los archivos sueltos.
+    """
+    global _paquete, _revisado
+    if not _revisado:
+        _revisado = True
+        try:
+            cambiadas = desactualizadas(PAQUETE)
+            if cambiadas:
+                nombres = ", ".join(os.path.basename(fuente) for fuente in cambiadas)
+                print(f"⚠ El paquete de datos es más viejo que {nombres}: se usan los archivos "
+                      "sueltos (rearmarlo con python -m Logic.Class.Paquete)")
+                return None
+            _paquete = Paquete(PAQUETE)
+        except (OSError, ValueError):
+            return None
+    return _paquete
+
+
+# ================= ARMADO Y MEDICIÓN =================
+
+def medir_apertura(n: int = 50_000, ruta: str = "paquete_prueba.pak"):
+    """Abrir y leer una clave con pocos o muchos registros tarda lo mismo."""
+    import time
+
+    for cantidad in (100, n):
+        construir_paquete(ruta, ((f"especie/{i}", b"x" * 2_000) for i in range(cantidad)))
+        inicio = time.perf_counter()
+        with Paquete(ruta) as paquete:
+            paquete.leer(f"especie/{cantidad // 2}")
+        ms = (time.perf_counter() - inicio) * 1000
+        print(f"  {cantidad:>7,} registros ({os.path.getsize(ruta) / 1e6:6.1f} MB): "
+              f"abrir + leer uno {ms:.3f} ms")
+    os.remove(ruta)
+
+
+if __name__ == "__main__":
+    total = construir_paquete(PAQUETE, entradas_del_juego())
+    print(f"{PAQUETE}: {total} registros, {os.path.getsize(PAQUETE):,} bytes")
+    medir_apertura()
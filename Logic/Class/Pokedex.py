@@ -0,0 +1,260 @@
+"""
+Pokedex: todas las especies, cargadas una vez y con índices para consultar
+sin recorrer la lista.
+
+Los datos salen de Logic/Data/especies.json y no cambian durante el juego,
+así que todo se arma al cargar y después solo se lee:
+- por id y por nombre: diccionarios (el nombre se compara sin mayúsculas
+  ni tildes, "pikachu" == "Pikachú")
+- por tipo y por lugar del campus: índices invertidos (tipo -> ids)
+- búsqueda por prefijo para la caja de búsqueda: lista de nombres ordenada
+  y bisect, así cada tecla es una búsqueda binaria y no un recorrido
+
+Si el paquete de datos (Logic/Class/Paquete.py) está armado, al arrancar
+solo se lee el resumen de cada especie para los índices y los datos
+completos se cargan la primera vez que se consulta cada una.
+
+Medición con miles de especies:
+    python -m Logic.Class.Pokedex
+"""
+import json
+import os
+import unicodedata
+from bisect import bisect_left
+from types import MappingProxyType
+from typing import NamedTuple, Tuple
+
+from Logic.Class.Pokemon import SIN_TIPO, Pokemon
+from Logic.Class.Tipo import DATA_DIR, tabla_tipos
+
+ESPECIES_JSON = os.path.join(DATA_DIR, "especies.json")
+
+# Mayor que cualquier carácter de un nombre normalizado: cierra el rango del prefijo
+_FIN_PREFIJO = "\uffff"
+
+
+def normalizar(texto: str) -> str:
+    """Clave de búsqueda: sin tildes, sin mayúsculas y sin espacios de sobra."""
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_tildes.casefold().split())
+
+
+class Especie(NamedTuple):
+    """Una especie de la pokedex. tipos son ids de Logic.Class.Tipo."""
+
+    id: int
+    nombre: str
+    tipos: Tuple[int, ...]
+    base: Tuple[int, int, int, int]
+    ubicaciones: Tuple[str, ...]
+    descripcion: str
+
+    def crear_pokemon(self, nivel: int, movimientos: tuple = ()) -> Pokemon:
+        tipo2 = self.tipos[1] if len(self.tipos) > 1 else SIN_TIPO
+        return Pokemon(self.id, nivel, self.base, self.tipos[0], tipo2, movimientos)
+
+
+class Pokedex:
+    """
+    Registro inmutable de especies con sus índices.
+
+    resumenes son tuplas (id, nombre, tipos, ubicaciones) o directamente
+    Especie. Si se pasa cargar(id) -> Especie, cada especie completa se pide
+    recién la primera vez que se consulta (así carga desde el paquete de
+    datos); los índices solo necesitan el resumen.
+    """
+
+    def __init__(self, resumenes, cargar=None):
+        if cargar is None:
+            especies = list(resumenes)
+            self._especies = {e.id: e for e in especies}
+            resumenes = [(e.id, e.nombre, e.tipos, e.ubicaciones) for e in especies]
+        else:
+            self._especies = {}
+        resumenes = sorted(resumenes)
+        self._cargar = cargar
+        self._ids = frozenset(e[0] for e in resumenes)
+        if len(self._ids) != len(resumenes):
+            raise ValueError("Hay especies con el id repetido")
+        self._por_nombre = MappingProxyType({normalizar(e[1]): e[0] for e in resumenes})
+
+        por_tipo = {}
+        por_lugar = {}
+        for especie_id, _, tipos, ubicaciones in resumenes:
+            for tipo in tipos:
+                por_tipo.setdefault(tipo, []).append(especie_id)
+            for lugar in ubicaciones:
+                por_lugar.setdefault(normalizar(lugar), []).append(especie_id)
+        self._por_tipo = MappingProxyType({t: tuple(ids) for t, ids in por_tipo.items()})
+        self._por_lugar = MappingProxyType({l: tuple(ids) for l, ids in por_lugar.items()})
+        self.lugares = tuple(sorted({l for e in resumenes for l in e[3]}))
+        self.orden = tuple(e[0] for e in resumenes)
+
+        # Nombres normalizados ordenados + el id en la misma posición
+        ordenados = sorted((normalizar(e[1]), e[0]) for e in resumenes)
+        self._claves = tuple(clave for clave, _ in ordenados)
+        self._ids_por_clave = tuple(especie_id for _, especie_id in ordenados)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        """Especies en orden de id (con carga diferida, las carga todas)."""
+        return (self.por_id(i) for i in self.orden)
+
+    def __contains__(self, especie_id):
+        return especie_id in self._ids
+
+    def por_id(self, especie_id: int) -> Especie:
+        especie = self._especies.get(especie_id)
+        if especie is None:
+            if especie_id not in self._ids:
+                raise KeyError(especie_id)
+            especie = self._especies[especie_id] = self._cargar(especie_id)
+        return especie
+
+    @property
+    def cargadas(self) -> int:
+        """Cuántas especies completas hay en memoria."""
+        return len(self._especies)
+
+    def por_nombre(self, nombre: str):
+        """La especie con ese nombre, o None."""
+        especie_id = self._por_nombre.get(normalizar(nombre))
+        return None if especie_id is None else self.por_id(especie_id)
+
+    def _tipo_id(self, tipo) -> int:
+        return tabla_tipos().id(tipo) if isinstance(tipo, str) else tipo
+
+    def ids_de_tipo(self, tipo) -> tuple:
+        """Ids (ordenados) de las especies con ese tipo; tipo es nombre o id."""
+        return self._por_tipo.get(self._tipo_id(tipo), ())
+
+    def ids_en_lugar(self, lugar: str) -> tuple:
+        return self._por_lugar.get(normalizar(lugar), ())
+
+    def de_tipo(self, tipo) -> list:
+        return [self.por_id(i) for i in self.ids_de_tipo(tipo)]
+
+    def en_lugar(self, lugar: str) -> list:
+        return [self.por_id(i) for i in self.ids_en_lugar(lugar)]
+
+    def filtrar(self, tipo=None, lugar: str = None) -> list:
+        """Especies que cumplen todos los filtros dados (intersección de índices)."""
+        listas = []
+        if tipo is not None:
+            listas.append(self.ids_de_tipo(tipo))
+        if lugar is not None:
+            listas.append(self.ids_en_lugar(lugar))
+        if not listas:
+            return list(self)
+        listas.sort(key=len)
+        ids = set(listas[0])
+        for otra in listas[1:]:
+            ids.intersection_update(otra)
+        return [self.por_id(i) for i in sorted(ids)]
+
+    def buscar(self, prefijo: str, limite: int = 20) -> list:
+        """Especies cuyo nombre empieza con prefijo, en orden alfabético."""
+        prefijo = normalizar(prefijo)
+        if not prefijo:
+            return []
+        inicio = bisect_left(self._claves, prefijo)
+        fin = bisect_left(self._claves, prefijo + _FIN_PREFIJO, inicio)
+        fin = min(fin, inicio + limite)
+        return [self.por_id(i) for i in self._ids_por_clave[inicio:fin]]
+
+    # --- Carga ---
+
+    @classmethod
+    def desde_json(cls, ruta: str = ESPECIES_JSON) -> "Pokedex":
+        with open(ruta, encoding="utf-8") as f:
+            datos = json.load(f)
+        tipo_id = tabla_tipos().id
+        return cls(especie_desde_dict(e, tipo_id) for e in datos["especies"])
+
+    @classmethod
+    def desde_paquete(cls, paquete) -> "Pokedex":
+        """Pokedex sobre un Logic.Class.Paquete: solo lee el índice al crearla."""
+        tipo_id = tabla_tipos().id
+        resumenes = [
+            (especie_id, nombre, tuple(tipo_id(t) for t in tipos), tuple(ubicaciones))
+            for especie_id, nombre, tipos, ubicaciones in paquete.json("especies/indice")
+        ]
+        return cls(
+            resumenes,
+            cargar=lambda especie_id: especie_desde_dict(paquete.json(f"especie/{especie_id}"), tipo_id),
+        )
+
+
+def especie_desde_dict(e: dict, tipo_id) -> Especie:
+    return Especie(
+        e["id"], e["nombre"], tuple(tipo_id(t) for t in e["tipos"]), tuple(e["base"]),
+        tuple(e.get("ubicaciones", ())), e.get("descripcion", ""),
+    )
+
+
+_pokedex = None
+
+
+def pokedex() -> Pokedex:
+    """
+    Pokedex compartida por todo el juego (se carga una sola vez). Usa el
+    paquete de datos si está armado y al día; si no, especies.json.
+    """
+    global _pokedex
+    if _pokedex is None:
+        from Logic.Class.Paquete import paquete_juego
+
+        paquete = paquete_juego()
+        _pokedex = Pokedex.desde_paquete(paquete) if paquete else Pokedex.desde_json()
+    return _pokedex
+
+
+# ================= MEDICIÓN =================
+
+def benchmark(n: int = 5_000, consultas: int = 10_000):
+    import random
+    import time
+
+    rng = random.Random(3)
+    silabas = ["ka", "chu", "ra", "mon", "bul", "sa", "ur", "pi", "do", "gas", "ly", "zu", "bat", "ex"]
+    n_tipos = tabla_tipos().n
+    lugares = ("Zona Verde", "Auditorio", "Parqueo", "Biblioteca", "Cafetería")
+    especies = [
+        Especie(
+            i, "".join(rng.choice(silabas) for _ in range(rng.randint(2, 4))).capitalize() + str(i),
+            tuple(rng.sample(range(n_tipos), rng.randint(1, 2))),
+            (50, 50, 50, 50), tuple(rng.sample(lugares, rng.randint(0, 2))), "",
+        )
+        for i in range(1, n + 1)
+    ]
+    dex = Pokedex(especies)
+    prefijos = [normalizar(rng.choice(especies).nombre[:rng.randint(1, 4)]) for _ in range(consultas)]
+
+    def medir(nombre, funcion, args):
+        inicio = time.perf_counter()
+        for a in args:
+            funcion(a)
+        por_consulta = (time.perf_counter() - inicio) / len(args) * 1e6
+        print(f"  {nombre:<34} {por_consulta:8.2f} µs")
+
+    print(f"Pokedex con {n:,} especies, {consultas:,} consultas de cada tipo:")
+    medir("por_id", dex.por_id, [rng.randint(1, n) for _ in range(consultas)])
+    medir("por_nombre", dex.por_nombre, [rng.choice(especies).nombre for _ in range(consultas)])
+    medir("de_tipo", dex.de_tipo, [rng.randrange(n_tipos) for _ in range(consultas // 10)])
+    medir("filtrar(tipo, lugar)", lambda t: dex.filtrar(t, "Auditorio"),
+          [rng.randrange(n_tipos) for _ in range(consultas // 10)])
+    medir("buscar(prefijo)", dex.buscar, prefijos)
+    medir("buscar recorriendo la lista", lambda p: [
+        e for e in especies if normalizar(e.nombre).startswith(p)
+    ][:20], prefijos[:100])
+
+
+if __name__ == "__main__":
+    dex = pokedex()
+    print(f"{len(dex)} especies en {ESPECIES_JSON}; lugares: {', '.join(dex.lugares)}")
+    print("buscar('pi'):", [e.nombre for e in dex.buscar("pi")])
+    print("Eléctrico en el Auditorio:", [e.nombre for e in dex.filtrar("Eléctrico", "auditorio")])
+    benchmark()
@@ -0,0 +1,263 @@
+"""
+Pokemon individuales y grupos grandes de pokemon.
+
+- Pokemon: un pokemon suelto (el del jugador, el rival de un combate).
+  Usa __slots__, así cada instancia no carga un __dict__ propio.
+- PokemonPool: muchos pokemon guardados "por columnas" (un arreglo de NumPy
+  por estadística). Sirve para los eventos del campus con miles de pokemon
+  salvajes: curar o subir de nivel a todos es una operación sobre arreglos,
+  no un for sobre objetos.
+
+Medición de memoria por instancia con tracemalloc:
+    python Logic/Class/Pokemon.py
+"""
+from typing import Optional, Tuple
+
+SIN_TIPO = -1
+
+# Orden de las estadísticas base: (hp, ataque, defensa, velocidad)
+Stats = Tuple[int, int, int, int]
+
+
+def calcular_stats(base: Stats, nivel: int) -> Stats:
+    """Estadísticas reales a partir de las base y el nivel (sin IVs/EVs)."""
+    base_hp, base_ataque, base_defensa, base_velocidad = base
+    hp = 2 * base_hp * nivel // 100 + nivel + 10
+    ataque = 2 * base_ataque * nivel // 100 + 5
+    defensa = 2 * base_defensa * nivel // 100 + 5
+    velocidad = 2 * base_velocidad * nivel // 100 + 5
+    return hp, ataque, defensa, velocidad
+
+
+class Pokemon:
+    """Un pokemon. tipo1/tipo2 son ids de Logic.Class.Tipo (tipo2=-1 si no tiene)."""
+
+    __slots__ = (
+        "especie", "nivel", "base", "hp", "hp_max",
+        "ataque", "defensa", "velocidad", "tipo1", "tipo2", "movimientos",
+    )
+
+    def __init__(self, especie: int, nivel: int, base: Stats, tipo1: int,
+                 tipo2: int = SIN_TIPO, movimientos: tuple = (), hp: Optional[int] = None):
+        self.especie = especie
+        self.nivel = nivel
+        self.base = base
+        self.tipo1 = tipo1
+        self.tipo2 = tipo2
+        self.movimientos = movimientos
+        self.hp_max, self.ataque, self.defensa, self.velocidad = calcular_stats(base, nivel)
+        self.hp = self.hp_max if hp is None else hp
+
+    @property
+    def debilitado(self) -> bool:
+        return self.hp <= 0
+
+    def recibir_daño(self, daño: int):
+        self.hp = max(0, self.hp - daño)
+
+    def curar(self):
+        self.hp = self.hp_max
+
+    def subir_nivel(self, niveles: int = 1):
+        """Sube de nivel y recalcula estadísticas, conservando el daño recibido."""
+        daño = self.hp_max - self.hp
+        self.nivel = min(100, self.nivel + niveles)
+        self.hp_max, self.ataque, self.defensa, self.velocidad = calcular_stats(self.base, self.nivel)
+        self.hp = max(0, self.hp_max - daño)
+
+    def datos_especie(self):
+        """La Especie de la pokedex (nombre, descripción, ...), cargada al pedirla."""
+        from Logic.Class.Pokedex import pokedex
+
+        return pokedex().por_id(self.especie)
+
+    def copia(self) -> "Pokemon":
+        """Copia independiente (los combates no modifican el equipo original)."""
+        return Pokemon(
+            self.especie, self.nivel, self.base, self.tipo1, self.tipo2,
+            self.movimientos, hp=self.hp,
+        )
+
+    def __repr__(self):
+        return f"Pokemon(especie={self.especie}, nivel={self.nivel}, hp={self.hp}/{self.hp_max})"
+
+
+class PokemonPool:
+    """
+    Muchos pokemon en arreglos contiguos (struct-of-arrays).
+
+    El pokemon i está repartido en especie[i], nivel[i], hp[i], ... Las
+    operaciones masivas reciben un índice, una lista de índices, una máscara
+    de bool o nada (= todos). Los arreglos crecen al doble cuando se llenan.
+    """
+
+    # columna: tipo de dato de NumPy
+    CAMPOS = {
+        "especie": "int32",
+        "nivel": "int16",
+        "base_hp": "int16",
+        "base_ataque": "int16",
+        "base_defensa": "int16",
+        "base_velocidad": "int16",
+        "hp": "int32",
+        "hp_max": "int32",
+        "ataque": "int32",
+        "defensa": "int32",
+        "velocidad": "int32",
+        "tipo1": "int8",
+        "tipo2": "int8",
+    }
+
+    def __init__(self, capacidad: int = 64):
+        import numpy as np
+
+        self._np = np
+        self.cantidad = 0
+        self.capacidad = max(1, capacidad)
+        for campo, dtype in self.CAMPOS.items():
+            setattr(self, "_" + campo, np.zeros(self.capacidad, dtype=dtype))
+
+    def __len__(self):
+        return self.cantidad
+
+    def __getattr__(self, campo):
+        # pool.hp, pool.nivel, ...: vista de las filas ocupadas (sin copiar)
+        if campo in PokemonPool.CAMPOS:
+            return getattr(self, "_" + campo)[:self.cantidad]
+        raise AttributeError(campo)
+
+    def _crecer(self, minimo: int):
+        nueva = max(minimo, self.capacidad * 2)
+        for campo in self.CAMPOS:
+            viejo = getattr(self, "_" + campo)
+            nuevo = self._np.zeros(nueva, dtype=viejo.dtype)
+            nuevo[:self.cantidad] = viejo[:self.cantidad]
+            setattr(self, "_" + campo, nuevo)
+        self.capacidad = nueva
+
+    def agregar(self, especie: int, nivel: int, base: Stats, tipo1: int,
+                tipo2: int = SIN_TIPO) -> int:
+        """Agrega un pokemon con vida completa y devuelve su índice."""
+        if self.cantidad == self.capacidad:
+            self._crecer(self.cantidad + 1)
+        i = self.cantidad
+        self.cantidad += 1
+        self._especie[i] = especie
+        self._nivel[i] = nivel
+        self._base_hp[i], self._base_ataque[i], self._base_defensa[i], self._base_velocidad[i] = base
+        self._tipo1[i] = tipo1
+        self._tipo2[i] = tipo2
+        hp_max, self._ataque[i], self._defensa[i], self._velocidad[i] = calcular_stats(base, nivel)
+        self._hp_max[i] = self._hp[i] = hp_max
+        return i
+
+    def agregar_pokemon(self, pokemon: Pokemon) -> int:
+        i = self.agregar(pokemon.especie, pokemon.nivel, pokemon.base, pokemon.tipo1, pokemon.tipo2)
+        self._hp[i] = pokemon.hp
+        return i
+
+    def obtener(self, i: int) -> Pokemon:
+        """Arma un Pokemon suelto con los datos de la fila i (copia)."""
+        base = (
+            int(self._base_hp[i]), int(self._base_ataque[i]),
+            int(self._base_defensa[i]), int(self._base_velocidad[i]),
+        )
+        return Pokemon(
+            int(self._especie[i]), int(self._nivel[i]), base,
+            int(self._tipo1[i]), int(self._tipo2[i]), hp=int(self._hp[i]),
+        )
+
+    def _recalcular(self, cuales=None):
+        # Misma fórmula que calcular_stats, en arreglos
+        sel = slice(None) if cuales is None else cuales
+        nivel = self.nivel[sel].astype("int32")
+        self.hp_max[sel] = 2 * self.base_hp[sel].astype("int32") * nivel // 100 + nivel + 10
+        self.ataque[sel] = 2 * self.base_ataque[sel].astype("int32") * nivel // 100 + 5
+        self.defensa[sel] = 2 * self.base_defensa[sel].astype("int32") * nivel // 100 + 5
+        self.velocidad[sel] = 2 * self.base_velocidad[sel].astype("int32") * nivel // 100 + 5
+
+    # --- Operaciones masivas ---
+    # cuales: None (todos), un índice, una lista de índices o una máscara de bool
+
+    def curar(self, cuales=None):
+        sel = slice(None) if cuales is None else cuales
+        self.hp[sel] = self.hp_max[sel]
+
+    def recibir_daño(self, cuales, daño):
+        sel = slice(None) if cuales is None else cuales
+        self.hp[sel] = self._np.maximum(0, self.hp[sel] - daño)
+
+    def subir_nivel(self, cuales=None, niveles: int = 1):
+        """Sube de nivel (tope 100) conservando el daño recibido de cada uno."""
+        sel = slice(None) if cuales is None else cuales
+        daño = self.hp_max[sel] - self.hp[sel]
+        self.nivel[sel] = self._np.minimum(100, self.nivel[sel] + niveles)
+        self._recalcular(sel)
+        self.hp[sel] = self._np.maximum(0, self.hp_max[sel] - daño)
+
+    def debilitados(self):
+        """Máscara de bool con los pokemon sin vida."""
+        return self.hp <= 0
+
+    def bytes_por_pokemon(self) -> int:
+        return sum(getattr(self, "_" + campo).itemsize for campo in self.CAMPOS)
+
+
+# ================= MEDICIÓN DE MEMORIA =================
+
+class _PokemonConDict:
+    """Mismo pokemon pero con __dict__ normal, solo para comparar."""
+
+    def __init__(self, especie, nivel, base, tipo1, tipo2=SIN_TIPO, movimientos=(), hp=None):
+        self.especie = especie
+        self.nivel = nivel
+        self.base = base
+        self.tipo1 = tipo1
+        self.tipo2 = tipo2
+        self.movimientos = movimientos
+        self.hp_max, self.ataque, self.defensa, self.velocidad = calcular_stats(base, nivel)
+        self.hp = self.hp_max if hp is None else hp
+
+
+def medir_memoria(n: int = 10_000):
+    import random
+    import tracemalloc
+
+    import numpy  # noqa: F401  (que la importación no cuente en la medición)
+
+    rng = random.Random(1)
+    datos = [
+        (rng.randrange(1, 500), rng.randrange(1, 101),
+         (rng.randrange(20, 200), rng.randrange(20, 200), rng.randrange(20, 200), rng.randrange(20, 200)),
+         rng.randrange(18))
+        for _ in range(n)
+    ]
+
+    resultados = {}
+    for nombre, crear in (
+        ("dict", lambda: [_PokemonConDict(*d) for d in datos]),
+        ("__slots__", lambda: [Pokemon(*d) for d in datos]),
+    ):
+        tracemalloc.start()
+        objetos = crear()
+        usado, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        resultados[nombre] = usado / n
+        del objetos
+
+    tracemalloc.start()
+    pool = PokemonPool(n)
+    for d in datos:
+        pool.agregar(*d)
+    usado, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resultados["PokemonPool"] = usado / n
+
+    print(f"Memoria por pokemon ({n:,} instancias, medido con tracemalloc):")
+    for nombre, por_instancia in resultados.items():
+        print(f"  {nombre:<12} {por_instancia:8.1f} bytes")
+    return resultados
+
+
+if __name__ == "__main__":
+    medir_memoria()
@@ -0,0 +1,247 @@
+"""
+Repeticiones de combates: semilla + acciones en un binario compacto.
+
+Un combate de Logic.Class.Combate es determinista, así que para volver a
+jugarlo igual basta con guardar los equipos iniciales, la semilla y las
+acciones de cada turno (un byte por acción). Nada de fotos del estado.
+
+Formato del archivo (todo little-endian, struct):
+
+    cabecera    b"RPLY" + versión (H)
+    registros   uno detrás de otro, cada uno empieza con una etiqueta de 1 byte:
+      b"E"  equipo: cantidad de pokemon (B) y por cada uno
+            especie, nivel, 4 stats base, tipo1, tipo2, hp, cant. de movimientos
+            y por cada movimiento tipo, poder, precisión y el nombre en UTF-8
+      b"C"  combate: semilla (Q), id del equipo A y del B (H), max_turnos (H),
+            turnos (H), ganador (b) y 2 * turnos bytes de acciones
+
+Cada equipo distinto se escribe una sola vez (el primer registro "E" es el
+equipo 0, el segundo el 1, ...) y los combates lo referencian por id; con
+equipos repetidos un combate ocupa 17 bytes + 2 por turno.
+
+El lector es un generador que va registro por registro, así que un archivo
+con millones de combates se recorre sin cargarlo entero:
+
+    for registro in leer_repeticiones("combates.rply"):
+        ...
+
+Prueba (graba, recorre y reproduce una muestra):
+    python -m Logic.Class.Repeticion
+"""
+import struct
+
+from Logic.Class.Combate import Combate, decodificar_accion
+from Logic.Class.Movimiento import Movimiento
+from Logic.Class.Pokemon import Pokemon
+
+MAGIC = b"RPLY"
+VERSION = 1
+
+_CABECERA = struct.Struct("<4sH")
+_POKEMON = struct.Struct("<HB4BbbHB")
+_MOVIMIENTO = struct.Struct("<bBBB")
+_COMBATE = struct.Struct("<QHHHHb")
+
+ETIQUETA_EQUIPO = b"E"
+ETIQUETA_COMBATE = b"C"
+
+
+class RegistroCombate:
+    """Un combate grabado. acciones son los bytes crudos (2 por turno)."""
+
+    __slots__ = ("semilla", "equipo_a", "equipo_b", "max_turnos", "turnos", "ganador", "acciones")
+
+    def __init__(self, semilla, equipo_a, equipo_b, max_turnos, turnos, ganador, acciones):
+        self.semilla = semilla
+        self.equipo_a = equipo_a
+        self.equipo_b = equipo_b
+        self.max_turnos = max_turnos
+        self.turnos = turnos
+        self.ganador = ganador
+        self.acciones = acciones
+
+    def turnos_jugados(self):
+        """Genera ((tipo, indice) de A, (tipo, indice) de B) por turno."""
+        acciones = self.acciones
+        for i in range(0, len(acciones), 2):
+            yield decodificar_accion(acciones[i]), decodificar_accion(acciones[i + 1])
+
+    def __repr__(self):
+        return f"RegistroCombate(semilla={self.semilla}, turnos={self.turnos}, ganador={self.ganador})"
+
+
+# --- Equipos <-> bytes ---
+
+def codificar_equipo(equipo) -> bytes:
+    partes = [bytes((len(equipo),))]
+    for p in equipo:
+        partes.append(_POKEMON.pack(
+            p.especie, p.nivel, *p.base, p.tipo1, p.tipo2, p.hp, len(p.movimientos)
+        ))
+        for m in p.movimientos:
+            nombre = m.nombre.encode("utf-8")[:255]
+            partes.append(_MOVIMIENTO.pack(m.tipo, m.poder, m.precision, len(nombre)))
+            partes.append(nombre)
+    return b"".join(partes)
+
+
+def _leer(f, n: int) -> bytes:
+    datos = f.read(n)
+    if len(datos) != n:
+        raise ValueError("Archivo de repeticiones truncado")
+    return datos
+
+
+def _leer_equipo(f) -> tuple:
+    equipo = []
+    for _ in range(_leer(f, 1)[0]):
+        especie, nivel, b_hp, b_atk, b_def, b_vel, tipo1, tipo2, hp, n_mov = _POKEMON.unpack(
+            _leer(f, _POKEMON.size)
+        )
+        movimientos = []
+        for _ in range(n_mov):
+            tipo, poder, precision, largo = _MOVIMIENTO.unpack(_leer(f, _MOVIMIENTO.size))
+            movimientos.append(Movimiento(_leer(f, largo).decode("utf-8"), tipo, poder, precision))
+        equipo.append(Pokemon(
+            especie, nivel, (b_hp, b_atk, b_def, b_vel), tipo1, tipo2, tuple(movimientos), hp=hp
+        ))
+    return tuple(equipo)
+
+
+# --- Escritura y lectura ---
+
+class EscritorRepeticiones:
+    """
+    Graba combates terminados en un archivo nuevo. Usar con `with`, o llamar
+    cerrar() al final. Se graban los equipos tal como entraron al combate
+    (Combate.iniciales guarda copias), así que da igual si los equipos
+    originales cambiaron después.
+    """
+
+    def __init__(self, ruta: str):
+        self._archivo = open(ruta, "wb")
+        self._archivo.write(_CABECERA.pack(MAGIC, VERSION))
+        self._equipos = {}
+        self.combates = 0
+
+    def _id_equipo(self, equipo) -> int:
+        datos = codificar_equipo(equipo)
+        equipo_id = self._equipos.get(datos)
+        if equipo_id is None:
+            equipo_id = len(self._equipos)
+            if equipo_id > 0xFFFF:
+                raise ValueError("Demasiados equipos distintos en un solo archivo")
+            self._equipos[datos] = equipo_id
+            self._archivo.write(ETIQUETA_EQUIPO)
+            self._archivo.write(datos)
+        return equipo_id
+
+    def escribir(self, combate: Combate):
+        if not combate.terminado:
+            raise ValueError("Solo se graban combates terminados")
+        equipo_a = self._id_equipo(combate.iniciales[0])
+        equipo_b = self._id_equipo(combate.iniciales[1])
+        f = self._archivo
+        f.write(ETIQUETA_COMBATE)
+        f.write(_COMBATE.pack(
+            combate.semilla, equipo_a, equipo_b, combate.max_turnos, combate.turno, combate.ganador
+        ))
+        f.write(combate.historial)
+        self.combates += 1
+
+    def cerrar(self):
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def leer_repeticiones(ruta: str):
+    """Genera un RegistroCombate por combate del archivo, en orden."""
+    with open(ruta, "rb") as f:
+        magic, version = _CABECERA.unpack(_leer(f, _CABECERA.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{ruta} no es un archivo de repeticiones v{VERSION}")
+        equipos = []
+        while True:
+            etiqueta = f.read(1)
+            if not etiqueta:
+                return
+            if etiqueta == ETIQUETA_EQUIPO:
+                equipos.append(_leer_equipo(f))
+            elif etiqueta == ETIQUETA_COMBATE:
+                semilla, a, b, max_turnos, turnos, ganador = _COMBATE.unpack(
+                    _leer(f, _COMBATE.size)
+                )
+                yield RegistroCombate(
+                    semilla, equipos[a], equipos[b], max_turnos, turnos, ganador,
+                    _leer(f, 2 * turnos),
+                )
+            else:
+                raise ValueError(f"Registro desconocido {etiqueta!r} en {ruta}")
+
+
+def reproducir(registro: RegistroCombate, verificar: bool = True) -> Combate:
+    """
+    Vuelve a jugar el combate y lo devuelve terminado. Con verificar=True
+    revisa que el ganador y los turnos sean los grabados (si no, el motor
+    cambió desde que se grabó la repetición).
+    """
+    combate = Combate(registro.equipo_a, registro.equipo_b, registro.semilla, registro.max_turnos)
+    for accion_a, accion_b in registro.turnos_jugados():
+        combate.jugar_turno(accion_a, accion_b)
+    if verificar and (combate.ganador, combate.turno) != (registro.ganador, registro.turnos):
+        raise ValueError(
+            f"La repetición no coincide: grabado ganador={registro.ganador} en "
+            f"{registro.turnos} turnos, reproducido ganador={combate.ganador} en {combate.turno}"
+        )
+    return combate
+
+
+# ================= PRUEBA =================
+
+def prueba(ruta: str = "repeticiones_prueba.rply", n: int = 20_000, muestra: int = 1_000):
+    import os
+    import random
+    import time
+
+    from Logic.Class.Combate import equipos_de_ejemplo, jugar_combate, politica_aleatoria
+
+    equipo_a, equipo_b = equipos_de_ejemplo()
+    rng = random.Random(7)
+    inicio = time.perf_counter()
+    with EscritorRepeticiones(ruta) as escritor:
+        for _ in range(n):
+            jugar_combate(
+                equipo_a, equipo_b, rng.getrandbits(63),
+                politica_aleatoria, politica_aleatoria, escritor=escritor,
+            )
+    t_grabar = time.perf_counter() - inicio
+    tamaño = os.path.getsize(ruta)
+
+    inicio = time.perf_counter()
+    victorias = [0, 0, 0]
+    for registro in leer_repeticiones(ruta):
+        victorias[registro.ganador] += 1
+    t_leer = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for i, registro in enumerate(leer_repeticiones(ruta)):
+        if i == muestra:
+            break
+        reproducir(registro)
+    t_reproducir = time.perf_counter() - inicio
+
+    print(f"{n:,} combates grabados en {t_grabar:.1f} s")
+    print(f"Archivo: {tamaño:,} bytes ({tamaño / n:.1f} bytes por combate)")
+    print(f"Recorrido completo: {t_leer:.2f} s ({n / t_leer:,.0f} combates/s); "
+          f"A {victorias[0]:,}, B {victorias[1]:,}, empates {victorias[-1]:,}")
+    print(f"{muestra:,} repeticiones reproducidas y verificadas en {t_reproducir:.2f} s")
+    os.remove(ruta)
+
+
+if __name__ == "__main__":
+    prueba()
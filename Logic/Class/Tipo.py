@@ -0,0 +1,138 @@
+"""
+Tipos de pokemon y tabla de efectividad.
+
+Cada tipo se guarda como un entero pequeño (su posición en la lista de
+Logic/Data/tipos.json) y la efectividad como una matriz densa de n x n
+floats en un array('f') plano: efectividad[atacante * n + defensor].
+Así cada consulta es un solo índice, sin diccionarios anidados.
+
+La primera vez que se carga, la tabla se arma desde el JSON y se guarda en
+un binario (tipos.bin) junto al JSON. Las siguientes veces se lee el
+binario directamente, a menos que el JSON haya cambiado.
+"""
+import json
+import os
+import struct
+from array import array
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data")
+TIPOS_JSON = os.path.join(DATA_DIR, "tipos.json")
+TIPOS_CACHE = os.path.join(DATA_DIR, "tipos.bin")
+
+# Cabecera del binario: firma, versión, cantidad de tipos, tamaño y mtime del
+# JSON de origen (para saber si el caché quedó viejo) y largo de los nombres
+_CACHE_MAGIC = b"TIPO"
+_CACHE_VERSION = 1
+_CACHE_HEADER = struct.Struct("<4sHHqqI")
+
+
+class TablaTipos:
+    """Registro de tipos + matriz de efectividad precalculada."""
+
+    __slots__ = ("nombres", "ids", "n", "valores", "_matriz")
+
+    def __init__(self, nombres, valores: array):
+        self.nombres = tuple(nombres)
+        self.ids = {nombre: i for i, nombre in enumerate(self.nombres)}
+        self.n = len(self.nombres)
+        if len(valores) != self.n * self.n:
+            raise ValueError("La matriz de efectividad no es de n x n")
+        self.valores = valores
+        self._matriz = None
+
+    def id(self, nombre: str) -> int:
+        return self.ids[nombre]
+
+    def nombre(self, tipo_id: int) -> str:
+        return self.nombres[tipo_id]
+
+    def efectividad(self, atacante: int, defensor: int) -> float:
+        """Multiplicador de un ataque de tipo atacante contra un tipo defensor."""
+        return self.valores[atacante * self.n + defensor]
+
+    def efectividad_doble(self, atacante: int, defensor1: int, defensor2: int = -1) -> float:
+        """Contra un pokemon de uno o dos tipos (defensor2=-1 si solo tiene uno)."""
+        fila = atacante * self.n
+        if defensor2 < 0 or defensor2 == defensor1:
+            return self.valores[fila + defensor1]
+        return self.valores[fila + defensor1] * self.valores[fila + defensor2]
+
+    def matriz(self):
+        """
+        La misma tabla como arreglo de NumPy (n, n) sin copiar los datos,
+        para indexar lotes: tabla.matriz()[atacantes, defensores].
+        """
+        if self._matriz is None:
+            import numpy as np
+
+            self._matriz = np.frombuffer(self.valores, dtype=np.float32).reshape(self.n, self.n)
+        return self._matriz
+
+    # --- Carga ---
+
+    @classmethod
+    def desde_json(cls, ruta: str = TIPOS_JSON) -> "TablaTipos":
+        with open(ruta, encoding="utf-8") as f:
+            datos = json.load(f)
+        nombres = datos["tipos"]
+        ids = {nombre: i for i, nombre in enumerate(nombres)}
+        n = len(nombres)
+        valores = array("f", [1.0]) * (n * n)
+        for atacante, fila in datos["efectividad"].items():
+            for defensor, multiplicador in fila.items():
+                valores[ids[atacante] * n + ids[defensor]] = multiplicador
+        return cls(nombres, valores)
+
+    def guardar_cache(self, ruta_cache: str, ruta_json: str):
+        estado = os.stat(ruta_json)
+        nombres = "\0".join(self.nombres).encode("utf-8")
+        cabecera = _CACHE_HEADER.pack(
+            _CACHE_MAGIC, _CACHE_VERSION, self.n, estado.st_size, estado.st_mtime_ns, len(nombres)
+        )
+        with open(ruta_cache, "wb") as f:
+            f.write(cabecera)
+            f.write(nombres)
+            self.valores.tofile(f)
+
+    @classmethod
+    def desde_cache(cls, ruta_cache: str, ruta_json: str):
+        """Lee el binario; devuelve None si no existe o no corresponde al JSON."""
+        try:
+            estado = os.stat(ruta_json)
+            with open(ruta_cache, "rb") as f:
+                magic, version, n, tamaño, mtime, largo = _CACHE_HEADER.unpack(
+                    f.read(_CACHE_HEADER.size)
+                )
+                if (magic, version, tamaño, mtime) != (
+                    _CACHE_MAGIC, _CACHE_VERSION, estado.st_size, estado.st_mtime_ns
+                ):
+                    return None
+                nombres = f.read(largo).decode("utf-8").split("\0")
+                valores = array("f")
+                valores.fromfile(f, n * n)
+        except (OSError, struct.error, EOFError, UnicodeDecodeError):
+            return None
+        return cls(nombres, valores)
+
+
+def cargar_tabla_tipos(ruta_json: str = TIPOS_JSON, ruta_cache: str = TIPOS_CACHE) -> TablaTipos:
+    """Carga la tabla desde el binario o, si no sirve, desde el JSON (y rehace el binario)."""
+    tabla = TablaTipos.desde_cache(ruta_cache, ruta_json)
+    if tabla is None:
+        tabla = TablaTipos.desde_json(ruta_json)
+        try:
+            tabla.guardar_cache(ruta_cache, ruta_json)
+        except OSError:
+            pass  # sin permiso de escritura: se usa igual, solo que sin caché
+    return tabla
+
+
+_tabla = None
+
+
+def tabla_tipos() -> TablaTipos:
+    """Tabla compartida por todo el juego (se carga una sola vez)."""
+    global _tabla
+    if _tabla is None:
+        _tabla = cargar_tabla_tipos()
+    return _tabla
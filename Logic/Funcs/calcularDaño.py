@@ -0,0 +1,121 @@
+"""
+Cálculo de daño.
+
+Fórmula (la de los juegos de la 5ª generación en adelante):
+
+    base  = floor(floor(floor(2 * nivel / 5 + 2) * poder * ataque / defensa) / 50) + 2
+    daño  = floor(base * critico * aleatorio * stab * tipo)
+
+donde aleatorio va de 0.85 a 1.0, critico es 1.5 o 1, stab es 1.5 si el
+movimiento es del mismo tipo que el pokemon y tipo es el multiplicador de
+efectividad (0, 0.25, 0.5, 1, 2, 4). Si el ataque afecta (tipo > 0) siempre
+hace al menos 1 de daño.
+
+Hay dos versiones con los mismos resultados:
+- calcularDaño: un golpe, puro Python, para el combate en vivo.
+- calcularDañoLote: arreglos de NumPy, millones de golpes en una llamada,
+  para balancear estadísticas.
+
+Benchmark de las dos versiones:
+    python "Logic/Funcs/calcularDaño.py"
+"""
+import math
+import random
+
+ALEATORIO_MIN = 0.85
+ALEATORIO_MAX = 1.0
+MULTIPLICADOR_CRITICO = 1.5
+
+
+def calcularDaño(nivel: int, ataque: int, defensa: int, poder: int,
+                 tipo: float = 1.0, stab: float = 1.0, aleatorio: float = None,
+                 critico: bool = False, rng: random.Random = None) -> int:
+    """Daño de un golpe. Si no se pasa aleatorio se sortea con rng (o random)."""
+    if poder <= 0 or tipo == 0:
+        return 0
+    if aleatorio is None:
+        aleatorio = (rng or random).uniform(ALEATORIO_MIN, ALEATORIO_MAX)
+
+    base = math.floor(math.floor(math.floor(2 * nivel / 5 + 2) * poder * ataque / defensa) / 50) + 2
+    if critico:
+        base = base * MULTIPLICADOR_CRITICO
+    daño = math.floor(base * aleatorio * stab * tipo)
+    return max(daño, 1)
+
+
+def calcularDañoLote(nivel, ataque, defensa, poder, tipo=1.0, stab=1.0,
+                     aleatorio=None, critico=None, rng=None):
+    """
+    Igual que calcularDaño pero con arreglos: cada argumento puede ser un
+    escalar o un arreglo (se combinan con broadcasting de NumPy) y devuelve
+    un arreglo de int64 con un daño por elemento.
+
+    aleatorio=None sortea un valor por golpe con rng (numpy.random.Generator).
+    critico puede ser un arreglo de bool.
+    """
+    import numpy as np
+
+    nivel = np.asarray(nivel, dtype=np.float64)
+    ataque = np.asarray(ataque, dtype=np.float64)
+    defensa = np.asarray(defensa, dtype=np.float64)
+    poder = np.asarray(poder, dtype=np.float64)
+    tipo = np.asarray(tipo, dtype=np.float64)
+    stab = np.asarray(stab, dtype=np.float64)
+
+    shape = np.broadcast_shapes(
+        nivel.shape, ataque.shape, defensa.shape, poder.shape, tipo.shape, stab.shape,
+        np.shape(aleatorio) if aleatorio is not None else (),
+        np.shape(critico) if critico is not None else (),
+    )
+    if aleatorio is None:
+        rng = rng or np.random.default_rng()
+        aleatorio = rng.uniform(ALEATORIO_MIN, ALEATORIO_MAX, size=shape)
+    aleatorio = np.asarray(aleatorio, dtype=np.float64)
+
+    # Mismo orden de operaciones que la versión escalar (mismos redondeos)
+    base = np.floor(np.floor(np.floor(2 * nivel / 5 + 2) * poder * ataque / defensa) / 50) + 2
+    if critico is not None:
+        base = np.where(critico, base * MULTIPLICADOR_CRITICO, base)
+    daño = np.floor(base * aleatorio * stab * tipo)
+
+    afecta = (poder > 0) & (tipo != 0)
+    return np.where(afecta, np.maximum(daño, 1), 0).astype(np.int64)
+
+
+# ================= BENCHMARK =================
+
+def benchmark(n: int = 1_000_000, seed: int = 1):
+    import time
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    nivel = rng.integers(1, 101, n)
+    ataque = rng.integers(5, 256, n)
+    defensa = rng.integers(5, 256, n)
+    poder = rng.integers(20, 151, n)
+    tipo = rng.choice([0.0, 0.25, 0.5, 1.0, 2.0, 4.0], n)
+    stab = rng.choice([1.0, 1.5], n)
+    aleatorio = rng.uniform(ALEATORIO_MIN, ALEATORIO_MAX, n)
+    critico = rng.random(n) < 1 / 24
+
+    columnas = [a.tolist() for a in (nivel, ataque, defensa, poder, tipo, stab, aleatorio, critico)]
+    start = time.perf_counter()
+    escalar = [
+        calcularDaño(l, a, d, p, t, s, r, c)
+        for l, a, d, p, t, s, r, c in zip(*columnas)
+    ]
+    t_escalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    lote = calcularDañoLote(nivel, ataque, defensa, poder, tipo, stab, aleatorio, critico)
+    t_lote = time.perf_counter() - start
+
+    assert lote.tolist() == escalar, "las dos versiones no coinciden"
+    print(f"{n:,} evaluaciones de daño")
+    print(f"Escalar: {t_escalar:.3f} s ({n / t_escalar:,.0f} golpes/s)")
+    print(f"Lote:    {t_lote:.3f} s ({n / t_lote:,.0f} golpes/s)")
+    print(f"Aceleración: {t_escalar / t_lote:.0f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,218 @@
+# admin_usuarios.py
+"""
+Herramienta de administración de cuentas (reemplaza ver_usuarios.py y
+borrar_user.py).
+
+Todo se procesa por partes, así que la memoria usada no depende del tamaño
+de la tabla: el listado y la exportación recorren la tabla por páginas
+(paginación por id, sin OFFSET) y la importación y el borrado van en
+lotes de executemany, un lote por transacción.
+
+Ejemplos:
+    python admin_usuarios.py listar --pagina 50
+    python admin_usuarios.py listar --desde-id 1200 --limite 100
+    python admin_usuarios.py exportar usuarios.jsonl
+    python admin_usuarios.py importar usuarios.csv
+    python admin_usuarios.py borrar correos.txt
+    python admin_usuarios.py borrar --email alguien@gmail.com
+
+Los hashes de contraseña nunca se muestran en el listado; solo viajan en
+exportar/importar, para poder mover cuentas entre bases.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+from itertools import islice
+
+import auth_db
+
+CHUNK_SIZE = 5_000
+
+EXPORT_FIELDS = ("id", "email", "profile_name", "password_hash", "created_at")
+
+
+def iter_users(after_id: int = 0, page_size: int = CHUNK_SIZE, with_hash: bool = False):
+    """
+    Recorre los usuarios en orden de id, de a page_size filas por consulta.
+    Cada página sigue desde el último id visto (WHERE id > ?), así que cada
+    consulta es una búsqueda en la clave primaria y no un OFFSET que recorre
+    todo lo anterior.
+    """
+    columns = "id, email, profile_name, created_at"
+    if with_hash:
+        columns = "id, email, profile_name, password_hash, created_at"
+    conn = auth_db.get_connection()
+    last_id = after_id
+    while True:
+        rows = conn.execute(
+            f"SELECT {columns} FROM users WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, page_size),
+        ).fetchall()
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1][0]
+
+
+def list_users(after_id: int = 0, limit=None, page_size: int = 50):
+    shown = 0
+    for user_id, email, profile_name, created_at in islice(
+        iter_users(after_id, page_size), limit
+    ):
+        print(f"{user_id:>8}  {email:<40} {profile_name:<24} {created_at}")
+        shown += 1
+        if shown % page_size == 0 and limit is None and sys.stdout.isatty():
+            if input(f"-- {shown} usuarios, Enter para seguir (q para salir) --").lower() == "q":
+                break
+    print(f"\n{shown} usuario(s) mostrados.")
+
+
+# --- Exportar / importar ---
+
+def _format_from_path(path: str) -> str:
+    return "jsonl" if path.lower().endswith((".jsonl", ".json")) else "csv"
+
+
+def export_users(path: str) -> int:
+    """Escribe todos los usuarios (con hash) en CSV o JSONL, página por página."""
+    fmt = _format_from_path(path)
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_FIELDS)
+            for row in iter_users(with_hash=True):
+                writer.writerow(row)
+                count += 1
+        else:
+            for row in iter_users(with_hash=True):
+                f.write(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + "\n")
+                count += 1
+    print(f"✅ {count} usuario(s) exportados a {path}")
+    return count
+
+
+def _read_records(path: str):
+    """Genera diccionarios desde un CSV o JSONL sin cargar el archivo entero."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if _format_from_path(path) == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_users(path: str, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Importa usuarios desde CSV/JSONL (mismas columnas que exportar, el id se
+    ignora). Las filas cuyo correo o perfil ya existen se saltan.
+    """
+    now = datetime.now().isoformat()
+    rows = (
+        (
+            record["email"].strip().lower(),
+            record["profile_name"].strip(),
+            record["password_hash"],
+            record.get("created_at") or now,
+        )
+        for record in _read_records(path)
+    )
+    inserted = 0
+    skipped = 0
+    for chunk in _chunks(rows, chunk_size):
+        with auth_db.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO users (email, profile_name, password_hash, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                chunk,
+            )
+            added = conn.total_changes - before
+        inserted += added
+        skipped += len(chunk) - added
+    print(f"✅ {inserted} usuario(s) importados, {skipped} saltados (ya existían).")
+    return inserted
+
+
+# --- Borrar ---
+
+def _read_emails(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            email = line.strip().lower()
+            if email and not email.startswith("#"):
+                yield (email,)
+
+
+def delete_users(emails, chunk_size: int = CHUNK_SIZE) -> int:
+    """Borra por correo, en lotes de chunk_size por transacción."""
+    deleted = 0
+    for chunk in _chunks(emails, chunk_size):
+        with auth_db.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany("DELETE FROM users WHERE email = ?", chunk)
+            deleted += conn.total_changes - before
+    return deleted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Administración de cuentas de PokeU")
+    parser.add_argument("--db", default=auth_db.DB_NAME, help="ruta de la base (auth.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_list = sub.add_parser("listar", help="listar usuarios (sin hashes)")
+    p_list.add_argument("--desde-id", type=int, default=0, help="empezar después de este id")
+    p_list.add_argument("--limite", type=int, default=None)
+    p_list.add_argument("--pagina", type=int, default=50)
+
+    p_export = sub.add_parser("exportar", help="exportar a .csv o .jsonl")
+    p_export.add_argument("archivo")
+
+    p_import = sub.add_parser("importar", help="importar desde .csv o .jsonl")
+    p_import.add_argument("archivo")
+    p_import.add_argument("--lote", type=int, default=CHUNK_SIZE)
+
+    p_delete = sub.add_parser("borrar", help="borrar usuarios por correo")
+    p_delete.add_argument("archivo", nargs="?", help="archivo con un correo por línea")
+    p_delete.add_argument("--email", action="append", default=[])
+
+    args = parser.parse_args()
+    if not os.path.exists(args.db) and args.command != "importar":
+        parser.error(f"no existe la base {args.db}")
+    auth_db.DB_NAME = args.db
+    auth_db.init_db()
+
+    if args.command == "listar":
+        list_users(args.desde_id, args.limite, args.pagina)
+    elif args.command == "exportar":
+        export_users(args.archivo)
+    elif args.command == "importar":
+        import_users(args.archivo, args.lote)
+    elif args.command == "borrar":
+        if not args.archivo and not args.email:
+            parser.error("indica un archivo de correos o --email")
+        emails = [(email.strip().lower(),) for email in args.email]
+        deleted = delete_users(emails)
+        if args.archivo:
+            deleted += delete_users(_read_emails(args.archivo))
+        if deleted:
+            print(f"✅ {deleted} usuario(s) eliminados.")
+        else:
+            print("⚠ No se encontró ningún usuario con esos correos.")
+
+
+if __name__ == "__main__":
+    main()
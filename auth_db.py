@@ -1,19 +1,75 @@
 # auth_db.py
 import sqlite3
 import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Optional, Tuple
 import re
 
 DB_NAME = "auth.db"
 
-def get_connection():
-    return sqlite3.connect(DB_NAME)
+# Segundos que una escritura espera si otro cliente tiene la base bloqueada
+BUSY_TIMEOUT = 5.0
+
+# --- Conexiones ---
+# Cada hilo abre UNA conexión y la reutiliza en todas las funciones de este
+# módulo. sqlite3 guarda en caché las sentencias preparadas de cada conexión
+# (por texto SQL), así que las consultas de abajo se compilan una sola vez.
+
+_local = threading.local()
+
+def _open_connection(db_name: str) -> sqlite3.Connection:
+    # isolation_level=None: modo autocommit, las transacciones se abren a
+    # mano con transaction() para que cada registro sea una sola transacción
+    conn = sqlite3.connect(
+        db_name, timeout=BUSY_TIMEOUT, isolation_level=None, cached_statements=128
+    )
+    # WAL: los lectores no bloquean al escritor ni al revés
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def get_connection() -> sqlite3.Connection:
+    """Devuelve la conexión de este hilo, abriéndola la primera vez."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.db_name != DB_NAME:
+        close_connection()
+        conn = _open_connection(DB_NAME)
+        _local.conn = conn
+        _local.db_name = DB_NAME
+    return conn
+
+def close_connection():
+    """Cierra la conexión de este hilo (si había una abierta)."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+@contextmanager
+def transaction():
+    """
+    Transacción de escritura: BEGIN IMMEDIATE ... COMMIT (o ROLLBACK si falla).
+    IMMEDIATE toma el bloqueo de escritura al empezar, así dos registros a la
+    vez se ponen en fila (hasta BUSY_TIMEOUT) en vez de fallar a la mitad.
+    """
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
 
 def init_db():
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
+    conn.execute("""
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             email TEXT UNIQUE NOT NULL,
@@ -22,8 +78,56 @@ def init_db():
             created_at TEXT NOT NULL
         )
     """)
-    conn.commit()
-    conn.close()
+    migrate_db()
+
+# --- Migraciones ---
+# PRAGMA user_version guarda hasta qué migración llegó cada auth.db.
+
+def _migration_profile_nocase(conn: sqlite3.Connection):
+    """
+    v1: nombre de perfil único SIN distinguir mayúsculas ("Ash" == "ash").
+
+    El índice único con COLLATE NOCASE hace que el login por perfil sea una
+    búsqueda en índice aunque se ignoren mayúsculas. Si una base vieja ya
+    tiene perfiles que solo difieren en mayúsculas, los más nuevos se
+    renombran agregando "_<id>" (o "_<id>_2", "_<id>_3"... si ese nombre
+    también está ocupado) para poder crear el índice.
+    """
+    duplicates = conn.execute("""
+        SELECT id, profile_name FROM users
+        WHERE id NOT IN (
+            SELECT min(id) FROM users GROUP BY profile_name COLLATE NOCASE
+        )
+        ORDER BY id
+    """).fetchall()
+    for user_id, profile_name in duplicates:
+        new_name = f"{profile_name}_{user_id}"
+        suffix = 1
+        while conn.execute(
+            "SELECT 1 FROM users WHERE profile_name = ? COLLATE NOCASE", (new_name,)
+        ).fetchone() is not None:
+            suffix += 1
+            new_name = f"{profile_name}_{user_id}_{suffix}"
+        conn.execute("UPDATE users SET profile_name = ? WHERE id = ?", (new_name, user_id))
+        print(f"⚠ Perfil '{profile_name}' repetido (mayúsculas): renombrado a '{new_name}'")
+
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_profile_nocase "
+        "ON users (profile_name COLLATE NOCASE)"
+    )
+
+MIGRATIONS = [
+    _migration_profile_nocase,
+]
+
+def migrate_db():
+    """Aplica las migraciones que falten, cada una en su transacción."""
+    conn = get_connection()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        with transaction() as conn:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
 
 # --- Utilidades ---
 
@@ -35,8 +139,65 @@ def is_valid_email(email: str) -> bool:
         return False
     return email.endswith(ALLOWED_DOMAINS)
 
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+# --- Contraseñas ---
+# Formato guardado: "pbkdf2_sha256$<iteraciones>$<sal hex>$<hash hex>".
+# Las filas viejas tienen un SHA-256 sin sal (64 caracteres hex); se aceptan
+# una vez más y se vuelven a hashear con PBKDF2 al iniciar sesión.
+# El costo se puede ajustar por máquina con AUTH_PBKDF2_ITERATIONS
+# (ver calibrate_iterations()).
+
+PASSWORD_SCHEME = "pbkdf2_sha256"
+PBKDF2_ITERATIONS = int(os.getenv("AUTH_PBKDF2_ITERATIONS", "600000"))
+SALT_BYTES = 16
+
+def _pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+
+def hash_password(password: str, iterations: Optional[int] = None) -> str:
+    """Hash lento y con sal. Tarda a propósito: las vistas lo usan vía AuthService."""
+    iterations = iterations or PBKDF2_ITERATIONS
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = _pbkdf2(password, salt, iterations)
+    return f"{PASSWORD_SCHEME}${iterations}${salt.hex()}${digest.hex()}"
+
+def verify_password(password: str, stored_hash: str) -> Tuple[bool, bool]:
+    """
+    Compara la contraseña con el hash guardado.
+    Devuelve (coincide, hay_que_rehashear).
+    """
+    if "$" not in stored_hash:
+        # Fila vieja: SHA-256 sin sal
+        legacy = hashlib.sha256(password.encode("utf-8")).hexdigest()
+        return hmac.compare_digest(legacy, stored_hash), True
+
+    parts = stored_hash.split("$")
+    if len(parts) != 4 or parts[0] != PASSWORD_SCHEME:
+        return False, False
+    _, iterations, salt_hex, digest_hex = parts
+    try:
+        iterations = int(iterations)
+        salt = bytes.fromhex(salt_hex)
+        expected = bytes.fromhex(digest_hex)
+    except ValueError:
+        return False, False  # hash dañado: se trata como contraseña incorrecta
+    if iterations < 1:
+        return False, False
+    digest = _pbkdf2(password, salt, iterations)
+    ok = hmac.compare_digest(digest, expected)
+    return ok, iterations < PBKDF2_ITERATIONS
+
+def calibrate_iterations(target_seconds: float = 0.25, sample: int = 20_000) -> int:
+    """
+    Cuántas iteraciones de PBKDF2 tardan ~target_seconds en esta máquina.
+    Sirve para elegir AUTH_PBKDF2_ITERATIONS en las PCs del laboratorio.
+    """
+    salt = secrets.token_bytes(SALT_BYTES)
+    _pbkdf2("calibracion", salt, sample)  # calentar
+    start = time.perf_counter()
+    _pbkdf2("calibracion", salt, sample)
+    per_iteration = (time.perf_counter() - start) / sample
+    # Redondeado a miles, nunca por debajo del mínimo razonable
+    return max(100_000, int(round(target_seconds / per_iteration, -3)))
 
 def is_valid_profile_name(profile_name: str) -> bool:
     profile_name = profile_name.strip()
@@ -70,22 +231,49 @@ def validate_password(password: str) -> Tuple[bool, str]:
 
 def email_exists(email: str) -> bool:
     email = email.strip().lower()
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM users WHERE email = ?", (email,))
-    row = cur.fetchone()
-    conn.close()
+    row = get_connection().execute(
+        "SELECT 1 FROM users WHERE email = ?", (email,)
+    ).fetchone()
     return row is not None
 
 def profile_name_exists(profile_name: str) -> bool:
     profile_name = profile_name.strip()
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM users WHERE profile_name = ?", (profile_name,))
-    row = cur.fetchone()
-    conn.close()
+    row = get_connection().execute(
+        "SELECT 1 FROM users WHERE profile_name = ? COLLATE NOCASE", (profile_name,)
+    ).fetchone()
     return row is not None
 
+def find_conflict(email: str, profile_name: str) -> Optional[str]:
+    """
+    Revisa correo y perfil en UNA sola consulta (usa los dos índices UNIQUE).
+    Devuelve "email", "profile_name" o None si ambos están libres.
+    """
+    email = email.strip().lower()
+    profile_name = profile_name.strip()
+    row = get_connection().execute(
+        "SELECT max(email = ?), max(profile_name = ? COLLATE NOCASE) FROM users "
+        "WHERE email = ? OR profile_name = ? COLLATE NOCASE",
+        (email, profile_name, email, profile_name)
+    ).fetchone()
+    if row[0]:
+        return "email"
+    if row[1]:
+        return "profile_name"
+    return None
+
+def _conflicting_field(error: sqlite3.IntegrityError) -> Optional[str]:
+    """Saca la columna del mensaje 'UNIQUE constraint failed: users.<columna>'."""
+    message = str(error)
+    for field in ("email", "profile_name"):
+        if f"users.{field}" in message:
+            return field
+    return None
+
+CONFLICT_MESSAGES = {
+    "email": "Ya existe una cuenta con ese correo",
+    "profile_name": "Ese nombre de perfil ya está en uso, elige otro",
+}
+
 # --- Funciones principales ---
 
 def register_user(email: str, password: str, profile_name: str) -> Tuple[bool, str]:
@@ -106,29 +294,27 @@ def register_user(email: str, password: str, profile_name: str) -> Tuple[bool, s
     if not is_valid_profile_name(profile_name):
         return False, "El nombre de perfil debe tener al menos 3 caracteres"
 
-    conn = get_connection()
-    cur = conn.cursor()
-
-    # Verificar email y perfil por si acaso (aunque ya debimos comprobar antes)
-    if email_exists(email):
-        conn.close()
-        return False, "Ya existe una cuenta con ese correo"
-
-    if profile_name_exists(profile_name):
-        conn.close()
-        return False, "Ese nombre de perfil ya está en uso, elige otro"
+    password_hash = hash_password(password)
 
+    # Un solo INSERT atómico: los UNIQUE de la tabla hacen la verificación de
+    # correo y perfil, sin consultas previas ni ventana para carreras.
+    # El error de SQLite dice qué columna chocó.
     try:
-        cur.execute(
+        get_connection().execute(
             "INSERT INTO users (email, profile_name, password_hash, created_at) VALUES (?, ?, ?, ?)",
-            (email, profile_name, hash_password(password), datetime.now().isoformat())
+            (email, profile_name, password_hash, datetime.now().isoformat())
         )
-        conn.commit()
         return True, "Usuario registrado correctamente"
-    except sqlite3.IntegrityError:
-        return False, "Error al registrar usuario (correo o perfil ya en uso)"
-    finally:
-        conn.close()
+    except sqlite3.IntegrityError as e:
+        field = _conflicting_field(e)
+        if field is None:
+            return False, "Error al registrar usuario (correo o perfil ya en uso)"
+        return False, CONFLICT_MESSAGES[field]
+
+# Búsqueda del login: usa idx_users_profile_nocase (ver benchmark_auth.py)
+LOGIN_QUERY = (
+    "SELECT id, password_hash, profile_name FROM users WHERE profile_name = ? COLLATE NOCASE"
+)
 
 def login_user(profile_name: str, password: str) -> Tuple[bool, str, Optional[str]]:
     """
@@ -137,22 +323,22 @@ def login_user(profile_name: str, password: str) -> Tuple[bool, str, Optional[st
     Si ok=True, profile_name tendrá el nombre del perfil.
     """
     profile_name = profile_name.strip()
-    conn = get_connection()
-    cur = conn.cursor()
 
-    # Ahora buscamos por profile_name, NO por email
-    cur.execute(
-        "SELECT password_hash, profile_name FROM users WHERE profile_name = ?",
-        (profile_name,)
-    )
-    row = cur.fetchone()
-    conn.close()
+    # Ahora buscamos por profile_name, NO por email (sin distinguir mayúsculas)
+    row = get_connection().execute(LOGIN_QUERY, (profile_name,)).fetchone()
 
     if row is None:
         return False, "No existe una cuenta con ese usuario", None
 
-    stored_hash, stored_profile = row
-    if stored_hash == hash_password(password):
-        return True, "Inicio de sesión exitoso", stored_profile
-    else:
+    user_id, stored_hash, stored_profile = row
+    ok, needs_rehash = verify_password(password, stored_hash)
+    if not ok:
         return False, "Contraseña incorrecta", None
+
+    if needs_rehash:
+        # Hash viejo o con menos iteraciones: se actualiza ahora que tenemos la contraseña
+        get_connection().execute(
+            "UPDATE users SET password_hash = ? WHERE id = ?",
+            (hash_password(password), user_id)
+        )
+    return True, "Inicio de sesión exitoso", stored_profile
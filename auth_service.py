@@ -0,0 +1,66 @@
+# auth_service.py
+"""
+Fachada asíncrona sobre auth_db para las vistas de arcade.
+
+Las vistas nunca llaman a SQLite (ni al hash de contraseñas) directamente:
+piden el trabajo al AuthService, reciben un Future y revisan future.done()
+en su on_update mientras dibujan un spinner. Así una base lenta o un disco
+ocupado no se nota como frames perdidos.
+
+Para probar cómo se comporta la interfaz con una base lenta se puede
+inyectar latencia artificial:
+    AUTH_FAKE_LATENCY=1.5 python main.py
+tests/test_vistas_auth.py hace lo mismo con las vistas de login y
+registro y revisa los resultados y que ningún frame se trabe esperando;
+tests/test_auth_service.py prueba el servicio solo, sin ventana.
+"""
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+import auth_db
+
+
+class AuthService:
+    """
+    Ejecuta las funciones de auth_db en hilos propios y devuelve Futures.
+
+    Cada hilo del pool tiene su propia conexión SQLite (ver
+    auth_db.get_connection), y en modo WAL pueden leer a la vez.
+    latency agrega una espera artificial antes de cada operación.
+    """
+
+    def __init__(self, workers: Optional[int] = None, latency: Optional[float] = None):
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
+        if latency is None:
+            latency = float(os.getenv("AUTH_FAKE_LATENCY", "0"))
+        self.latency = latency
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="auth")
+
+    def _call(self, fn, *args):
+        if self.latency:
+            time.sleep(self.latency)
+        return fn(*args)
+
+    def submit(self, fn, *args) -> Future:
+        return self.executor.submit(self._call, fn, *args)
+
+    def init_db(self) -> Future:
+        return self.submit(auth_db.init_db)
+
+    def login(self, profile_name: str, password: str) -> Future:
+        """Future con (ok, mensaje, profile_name_o_None)."""
+        return self.submit(auth_db.login_user, profile_name, password)
+
+    def register(self, email: str, password: str, profile_name: str) -> Future:
+        """Future con (ok, mensaje)."""
+        return self.submit(auth_db.register_user, email, password, profile_name)
+
+    def find_conflict(self, email: str, profile_name: str) -> Future:
+        """Future con "email", "profile_name" o None."""
+        return self.submit(auth_db.find_conflict, email, profile_name)
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -0,0 +1,144 @@
+# benchmark_auth.py
+"""
+Micro-benchmark de la capa auth_db.
+
+Crea (o reutiliza) una base de prueba con muchos usuarios y mide cuántos
+registros por segundo aguanta register_user, comparado con el camino viejo
+(email_exists + profile_name_exists desde la vista y otra vez dentro del
+registro, y luego el INSERT). También comprueba con EXPLAIN QUERY PLAN que el
+login por perfil sea una búsqueda en índice y mide su latencia.
+
+Uso:
+    python benchmark_auth.py --users 1000000 --registrations 5000
+
+Nunca toca auth.db: por defecto trabaja sobre bench_auth.db.
+
+El hash de contraseñas (PBKDF2) es lento a propósito y taparía el costo de
+la base, así que el benchmark baja las iteraciones (--kdf-iterations).
+Con --calibrate solo sugiere AUTH_PBKDF2_ITERATIONS para esta máquina.
+"""
+import argparse
+import os
+import time
+from datetime import datetime
+
+import auth_db
+
+
+def populate(total_users: int, chunk: int = 50_000):
+    """Llena la tabla hasta tener total_users filas (hash de relleno)."""
+    conn = auth_db.get_connection()
+    existing = conn.execute("SELECT count(*) FROM users").fetchone()[0]
+    if existing >= total_users:
+        return existing
+
+    fake_hash = auth_db.hash_password("Relleno1!")
+    created_at = datetime.now().isoformat()
+    start = time.perf_counter()
+    for first in range(existing, total_users, chunk):
+        last = min(first + chunk, total_users)
+        with auth_db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO users (email, profile_name, password_hash, created_at) VALUES (?, ?, ?, ?)",
+                (
+                    (f"relleno{i}@gmail.com", f"relleno{i}", fake_hash, created_at)
+                    for i in range(first, last)
+                ),
+            )
+    print(f"Base poblada con {total_users} usuarios en {time.perf_counter() - start:.1f} s")
+    return total_users
+
+
+def _old_register(email, password, profile_name):
+    """Camino de antes: dos consultas en la vista + dos en register_user + INSERT."""
+    if auth_db.email_exists(email) or auth_db.profile_name_exists(profile_name):
+        return False
+    if auth_db.email_exists(email) or auth_db.profile_name_exists(profile_name):
+        return False
+    auth_db.get_connection().execute(
+        "INSERT INTO users (email, profile_name, password_hash, created_at) VALUES (?, ?, ?, ?)",
+        (email, profile_name, auth_db.hash_password(password), datetime.now().isoformat())
+    )
+    return True
+
+
+def _new_register(email, password, profile_name):
+    """Camino nuevo: una consulta en la vista + el INSERT atómico."""
+    if auth_db.find_conflict(email, profile_name) is not None:
+        return False
+    return auth_db.register_user(email, password, profile_name)[0]
+
+
+def bench_register(registrations: int):
+    run = int(time.time())
+    password = "Abcdef1!"
+    results = {}
+    for name, register in (("viejo", _old_register), ("nuevo", _new_register)):
+        start = time.perf_counter()
+        for i in range(registrations):
+            ok = register(f"bench{run}_{name}{i}@gmail.com", password, f"bench{run}_{name}{i}")
+            assert ok, "el registro de prueba no debería chocar"
+        elapsed = time.perf_counter() - start
+        results[name] = registrations / elapsed
+
+    # Duplicados: el INSERT falla por el UNIQUE y se informa el campo
+    ok, msg = auth_db.register_user(f"bench{run}_nuevo0@gmail.com", password, "otro_perfil")
+    assert not ok and msg == auth_db.CONFLICT_MESSAGES["email"], msg
+
+    for name, rate in results.items():
+        print(f"Registro {name}: {rate:,.0f} registros/s")
+    return results
+
+
+def check_login_plan():
+    """El login tiene que buscar en idx_users_profile_nocase, nunca recorrer la tabla."""
+    plan = auth_db.get_connection().execute(
+        "EXPLAIN QUERY PLAN " + auth_db.LOGIN_QUERY, ("Ash",)
+    ).fetchall()
+    details = [row[-1] for row in plan]
+    assert any("USING INDEX idx_users_profile_nocase" in d for d in details), details
+    assert not any(d.startswith("SCAN") for d in details), details
+    print("Plan del login:", "; ".join(details))
+
+
+def bench_login(logins: int, total_users: int):
+    """Latencia media de login_user (sin contar el hash de la contraseña)."""
+    names = [f"RELLENO{(i * 7919) % total_users}" for i in range(logins)]
+    conn = auth_db.get_connection()
+    start = time.perf_counter()
+    for name in names:
+        row = conn.execute(auth_db.LOGIN_QUERY, (name,)).fetchone()
+        assert row is not None, name
+    elapsed = time.perf_counter() - start
+    print(f"Búsqueda de login (mayúsculas distintas): {elapsed / logins * 1e6:.1f} µs por login")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", default="bench_auth.db")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--registrations", type=int, default=5_000)
+    parser.add_argument("--kdf-iterations", type=int, default=1_000)
+    parser.add_argument("--calibrate", type=float, metavar="SEGUNDOS",
+                        help="sugerir iteraciones de PBKDF2 para este tiempo por hash")
+    args = parser.parse_args()
+
+    if args.calibrate:
+        iterations = auth_db.calibrate_iterations(args.calibrate)
+        print(f"AUTH_PBKDF2_ITERATIONS={iterations}")
+        return
+
+    if os.path.abspath(args.db) == os.path.abspath("auth.db"):
+        parser.error("no uses auth.db para el benchmark")
+
+    auth_db.DB_NAME = args.db
+    auth_db.PBKDF2_ITERATIONS = args.kdf_iterations
+    auth_db.init_db()
+    populate(args.users)
+    check_login_plan()
+    bench_login(args.registrations, args.users)
+    bench_register(args.registrations)
+
+
+if __name__ == "__main__":
+    main()
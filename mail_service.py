@@ -0,0 +1,379 @@
+# mail_service.py
+"""
+Envío de correos (códigos de verificación) fuera del hilo de la interfaz.
+
+La vista no llama a smtplib directamente: encola un trabajo en el
+MailDispatcher, que lo envía desde un hilo de fondo con reintentos y
+espera exponencial. Los cambios de estado se entregan a la vista cuando
+ésta llama a dispatcher.poll() desde su on_update, así los callbacks
+siempre corren en el hilo de arcade.
+
+El hilo de fondo usa un SMTPMailer, que mantiene abierta una conexión ya
+autenticada (starttls + login una sola vez) y la reutiliza para todos los
+correos que van llegando, reconectando si el servidor la cerró.
+
+Para probar sin Gmail se puede levantar un servidor SMTP local, por ejemplo
+    python -m aiosmtpd -n -l localhost:1025
+y usar SMTPSettings("localhost", 1025, starttls=False). Es lo que hace
+tests/test_mail_service.py (envío normal y reintento tras un error 451):
+    python -m pytest -q tests/test_mail_service.py
+"""
+import os
+import queue
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+from typing import Callable, Optional
+
+# Estados de un trabajo de correo
+PENDING = "pendiente"
+SENDING = "enviando"
+SENT = "enviado"
+FAILED = "error"
+
+# Errores que no se arreglan reintentando
+PERMANENT_ERRORS = (smtplib.SMTPAuthenticationError, smtplib.SMTPRecipientsRefused)
+
+
+class SMTPSettings:
+    """Datos de conexión al servidor SMTP."""
+
+    def __init__(self, server: str, port: int, user: Optional[str] = None,
+                 password: Optional[str] = None, starttls: bool = True,
+                 timeout: float = 15.0):
+        self.server = server
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls) -> "SMTPSettings":
+        """Lee SMTP_SERVER, SMTP_PORT, SMTP_USER, SMTP_PASSWORD y SMTP_STARTTLS."""
+        return cls(
+            server=os.getenv("SMTP_SERVER", "smtp.gmail.com"),
+            port=int(os.getenv("SMTP_PORT", "587")),
+            user=os.getenv("SMTP_USER"),
+            password=os.getenv("SMTP_PASSWORD"),
+            starttls=os.getenv("SMTP_STARTTLS", "1") != "0",
+        )
+
+
+def build_verification_message(sender: str, to_email: str, code: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = "Código de verificación - Juego Campus UGB"
+    msg["From"] = sender
+    msg["To"] = to_email
+    msg.set_content(
+        f"Hola!\n\n"
+        f"Tu código de verificación para crear la cuenta es: {code}\n\n"
+        "Si no solicitaste esto, puedes ignorar este mensaje."
+    )
+    return msg
+
+
+class MailerStats:
+    """Contadores de rendimiento de un SMTPMailer."""
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.connections = 0
+        self.send_time = 0.0  # segundos gastados en conectar + enviar
+
+    @property
+    def messages_per_second(self) -> float:
+        if self.send_time == 0:
+            return 0.0
+        return self.sent / self.send_time
+
+    def __str__(self):
+        return (
+            f"{self.sent} enviados, {self.failed} fallidos, "
+            f"{self.connections} conexiones, {self.messages_per_second:.1f} msg/s"
+        )
+
+
+class SMTPMailer:
+    """
+    Conexión SMTP persistente reutilizada entre mensajes.
+
+    El saludo TLS y el login se hacen una sola vez por conexión. Si la
+    conexión estuvo ociosa más de idle_check segundos se comprueba con NOOP
+    antes de usarla, y si el servidor la cortó se reconecta y se reintenta
+    el envío una vez. No es seguro usar la misma instancia desde varios
+    hilos; en el juego solo la usa el hilo del MailDispatcher.
+    """
+
+    def __init__(self, settings: SMTPSettings, idle_check: float = 30.0):
+        self.settings = settings
+        self.idle_check = idle_check
+        self.server: Optional[smtplib.SMTP] = None
+        self.last_used = 0.0
+        self.stats = MailerStats()
+
+    @property
+    def sender(self) -> str:
+        return self.settings.user or "pokeugb@localhost"
+
+    def connect(self):
+        self.close()
+        settings = self.settings
+        server = smtplib.SMTP(settings.server, settings.port, timeout=settings.timeout)
+        try:
+            if settings.starttls:
+                server.starttls()
+            if settings.user and settings.password:
+                server.login(settings.user, settings.password)
+        except BaseException:
+            server.close()
+            raise
+        self.server = server
+        self.last_used = time.monotonic()
+        self.stats.connections += 1
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                self.server.close()
+            self.server = None
+
+    def _ensure_connection(self):
+        if self.server is None:
+            self.connect()
+        elif time.monotonic() - self.last_used > self.idle_check:
+            try:
+                self.server.noop()
+            except (smtplib.SMTPServerDisconnected, OSError):
+                self.connect()
+
+    def send(self, msg: EmailMessage):
+        start = time.perf_counter()
+        try:
+            self._ensure_connection()
+            try:
+                self.server.send_message(msg)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                # El servidor cerró la conexión ociosa: una reconexión y otro intento
+                self.connect()
+                self.server.send_message(msg)
+        except PERMANENT_ERRORS:
+            # La sesión sigue sana (p. ej. destinatario rechazado)
+            self.stats.failed += 1
+            raise
+        except (smtplib.SMTPException, OSError):
+            # Estado de la sesión desconocido: la próxima vez se reconecta
+            self.stats.failed += 1
+            self.close()
+            raise
+        finally:
+            self.stats.send_time += time.perf_counter() - start
+        self.last_used = time.monotonic()
+        self.stats.sent += 1
+
+    def send_batch(self, messages) -> list:
+        """
+        Envía varios mensajes en la misma sesión.
+
+        Devuelve una lista de (mensaje, excepción) con los que fallaron.
+        """
+        failures = []
+        for msg in messages:
+            try:
+                self.send(msg)
+            except (smtplib.SMTPException, OSError) as e:
+                failures.append((msg, e))
+        return failures
+
+    def send_verification_code(self, to_email: str, code: str):
+        self.send(build_verification_message(self.sender, to_email, code))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MailJob:
+    """Un correo en la cola del dispatcher y su estado actual."""
+
+    def __init__(self, to_email: str, code: str,
+                 on_status: Optional[Callable[["MailJob", str], None]] = None):
+        self.to_email = to_email
+        self.code = code
+        self.on_status = on_status
+        self.status = PENDING
+        self.attempts = 0
+        self.error: Optional[Exception] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SENT, FAILED)
+
+
+class MailDispatcher:
+    """
+    Hilo de fondo que envía los correos encolados.
+
+    Cada trabajo se intenta hasta max_attempts veces; entre intentos se
+    espera backoff, 2*backoff, 4*backoff... segundos. Los callbacks
+    on_status(job, status) no se llaman desde el hilo de fondo: quedan en
+    una cola y se ejecutan en poll(), que la vista llama en su on_update.
+
+    Todos los trabajos que se acumulan en la cola se envían por la misma
+    conexión del mailer; si no llega nada en idle_close segundos la conexión
+    se cierra para no dejarla colgada en el servidor.
+    """
+
+    def __init__(self, settings: SMTPSettings, max_attempts: int = 3,
+                 backoff: float = 1.0, idle_close: float = 60.0,
+                 mailer: Optional[SMTPMailer] = None):
+        self.settings = settings
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.idle_close = idle_close
+        self.mailer = mailer or SMTPMailer(settings)
+        self.jobs: "queue.Queue[Optional[MailJob]]" = queue.Queue()
+        self.events: "queue.Queue[tuple[MailJob, str]]" = queue.Queue()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.thread is None:
+            self.stop_event.clear()
+            self.thread = threading.Thread(
+                target=self._run, name="mail-dispatcher", daemon=True
+            )
+            self.thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Detiene el hilo; los trabajos que falten quedan sin enviar."""
+        if self.thread is not None:
+            self.stop_event.set()
+            self.jobs.put(None)
+            self.thread.join(timeout)
+            self.thread = None
+
+    def submit(self, to_email: str, code: str,
+               on_status: Optional[Callable[[MailJob, str], None]] = None) -> MailJob:
+        job = MailJob(to_email, code, on_status)
+        self.start()
+        self.jobs.put(job)
+        return job
+
+    def poll(self) -> int:
+        """Entrega los cambios de estado pendientes. Devuelve cuántos entregó."""
+        delivered = 0
+        while True:
+            try:
+                job, status = self.events.get_nowait()
+            except queue.Empty:
+                return delivered
+            if job.on_status is not None:
+                job.on_status(job, status)
+            delivered += 1
+
+    # --- hilo de fondo ---
+
+    def _notify(self, job: MailJob, status: str):
+        job.status = status
+        self.events.put((job, status))
+
+    def _next_batch(self) -> list:
+        """Espera un trabajo y se lleva también los que ya estén en cola."""
+        try:
+            batch = [self.jobs.get(timeout=self.idle_close)]
+        except queue.Empty:
+            self.mailer.close()
+            batch = [self.jobs.get()]
+        while True:
+            try:
+                batch.append(self.jobs.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _run(self):
+        try:
+            while not self.stop_event.is_set():
+                for job in self._next_batch():
+                    if job is None or self.stop_event.is_set():
+                        return
+                    self._deliver(job)
+        finally:
+            self.mailer.close()
+
+    def _deliver(self, job: MailJob):
+        delay = self.backoff
+        while True:
+            job.attempts += 1
+            self._notify(job, SENDING)
+            try:
+                self.mailer.send_verification_code(job.to_email, job.code)
+            except PERMANENT_ERRORS as e:
+                job.error = e
+                self._notify(job, FAILED)
+                return
+            except (smtplib.SMTPException, OSError) as e:
+                job.error = e
+                if job.attempts >= self.max_attempts or self.stop_event.wait(delay):
+                    self._notify(job, FAILED)
+                    return
+                delay *= 2
+            else:
+                job.error = None
+                self._notify(job, SENT)
+                return
+
+
+# ================= BENCHMARK =================
+
+def _send_one_shot(settings: SMTPSettings, msg: EmailMessage):
+    """Como se enviaba antes: conexión, starttls y login para cada mensaje."""
+    with smtplib.SMTP(settings.server, settings.port, timeout=settings.timeout) as server:
+        if settings.starttls:
+            server.starttls()
+        if settings.user and settings.password:
+            server.login(settings.user, settings.password)
+        server.send_message(msg)
+
+
+def benchmark(settings: SMTPSettings, count: int = 50):
+    """
+    Compara una conexión por correo (como antes) contra el SMTPMailer.
+
+    Usar contra un servidor local, no contra Gmail:
+        python -m aiosmtpd -n -l localhost:1025
+        python mail_service.py localhost 1025 50
+    """
+    messages = [
+        build_verification_message("pokeugb@localhost", f"bench{i}@gmail.com", "0000")
+        for i in range(count)
+    ]
+
+    start = time.perf_counter()
+    for msg in messages:
+        _send_one_shot(settings, msg)
+    one_shot = count / (time.perf_counter() - start)
+
+    with SMTPMailer(settings) as mailer:
+        failures = mailer.send_batch(messages)
+
+    print(f"Una conexión por correo: {one_shot:.1f} msg/s")
+    print(f"SMTPMailer:              {mailer.stats}")
+    if failures:
+        print(f"Fallaron {len(failures)} correos, p. ej.: {failures[0][1]}")
+    return one_shot, mailer.stats
+
+
+if __name__ == "__main__":
+    import sys
+
+    host = sys.argv[1] if len(sys.argv) > 1 else "localhost"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 1025
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    benchmark(SMTPSettings(host, port, starttls=False), count)
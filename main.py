@@ -1,32 +1,45 @@
+import time
+
+# Para el reporte de arranque (python main.py --tiempos): se toma antes de
+# importar arcade, que es casi todo lo que tarda en abrir la ventana
+_INICIO = time.perf_counter()
+
 import arcade
 import arcade.gui
+import arcade.shape_list
+import pyglet
+import math
 import random
-import smtplib
-from email.message import EmailMessage
 import os
-from dotenv import load_dotenv
+import sys
 
 from arcade.gui.experimental.password_input import UIPasswordInput
 
 from auth_db import (
-    init_db,
-    register_user,
-    login_user,
     is_valid_email,
     is_valid_profile_name,
     validate_password,
-    email_exists,
-    profile_name_exists,
 )
+from auth_service import AuthService
 
-# ================= CARGAR .env =================
-load_dotenv()
+# El campus (GUI/, Logic/) y el correo (mail_service: smtplib, email, dotenv)
+# no se importan aquí: se cargan la primera vez que se usan, así la ventana
+# de login abre sin esperar por ellos.
+_TIEMPO_IMPORTS = time.perf_counter() - _INICIO
 
 # ================= CONFIGURACIÓN GENERAL =================
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 SCREEN_TITLE = "Login UGB - Juego Pokemon Campus"
 
+# Probabilidad de encontrar un pokemon salvaje en cada paso sobre pasto alto
+PROBABILIDAD_ENCUENTRO = 0.1
+
+# Cámara del campus: escala y qué fracción de la distancia al jugador
+# recorre en cada frame
+ZOOM_CAMPUS = 1.0
+SUAVIZADO_CAMARA = 0.2
+
 # Paleta de colores temática (no Pokemon oficial, solo estilo gamer)
 COLOR_BG_TOP = (10, 20, 40)
 COLOR_BG_BOTTOM = (30, 40, 90)
@@ -37,56 +50,59 @@ COLOR_ACCENT_SOFT = (130, 220, 200)
 COLOR_TEXT_SOFT = (210, 220, 245)
 
 # ===== CONFIGURACIÓN DE CORREO (GMAIL) =====
-SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
-SMTP_USER = os.getenv("SMTP_USER")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-
-if not SMTP_USER or not SMTP_PASSWORD:
-    raise ValueError(
-        "ERROR: SMTP_USER o SMTP_PASSWORD no están definidos.\n"
-        "Crea un archivo .env en la carpeta del proyecto con:\n"
-        "SMTP_SERVER=smtp.gmail.com\n"
-        "SMTP_PORT=587\n"
-        "SMTP_USER=pokeugb@gmail.com\n"
-        "SMTP_PASSWORD=TU_APP_PASSWORD_DE_GMAIL\n"
-    )
+# Se lee del .env recién cuando hay que mandar un código (ver mail_dispatcher)
+AYUDA_SMTP = (
+    "SMTP_USER o SMTP_PASSWORD no están definidos.\n"
+    "Crea un archivo .env en la carpeta del proyecto con:\n"
+    "SMTP_SERVER=smtp.gmail.com\n"
+    "SMTP_PORT=587\n"
+    "SMTP_USER=pokeugb@gmail.com\n"
+    "SMTP_PASSWORD=TU_APP_PASSWORD_DE_GMAIL\n"
+)
 
 
-def send_verification_code(to_email: str, code: str):
+def mail_dispatcher(window):
     """
-    Envía un correo con el código de verificación.
+    El MailDispatcher de la ventana. Se crea la primera vez que se manda un
+    correo (ahí se importan smtplib y email y se lee el .env). Devuelve None
+    si faltan las credenciales: el login funciona igual, solo el registro
+    necesita correo.
     """
-    msg = EmailMessage()
-    msg["Subject"] = "Código de verificación - Juego Campus UGB"
-    msg["From"] = SMTP_USER
-    msg["To"] = to_email
-    msg.set_content(
-        f"Hola!\n\n"
-        f"Tu código de verificación para crear la cuenta es: {code}\n\n"
-        "Si no solicitaste esto, puedes ignorar este mensaje."
-    )
+    if window.mail_dispatcher is None:
+        from dotenv import load_dotenv
+        from mail_service import MailDispatcher, SMTPSettings
 
-    with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-        server.starttls()
-        server.login(SMTP_USER, SMTP_PASSWORD)
-        server.send_message(msg)
+        load_dotenv()
+        settings = SMTPSettings.from_env()
+        if not settings.user or not settings.password:
+            print("ERROR:", AYUDA_SMTP)
+            return None
+        window.mail_dispatcher = MailDispatcher(settings)
+    return window.mail_dispatcher
 
 
 # ================= HELPERS DE DIBUJO =================
+# Las pantallas de menú no cambian entre frames, así que en vez de dibujar
+# en modo inmediato (una llamada por rectángulo) se construye la geometría
+# una sola vez en un ShapeElementList y se redibuja en un par de llamadas.
+
+def add_centered_rect_filled(shapes, cx, cy, width, height, color):
+    """Agrega un rectángulo centrado en (cx, cy) a la lista de formas."""
+    shapes.append(
+        arcade.shape_list.create_rectangle_filled(cx, cy, width, height, color)
+    )
 
-def draw_centered_rect_filled(cx, cy, width, height, color):
-    """Atajo para dibujar rectángulos centrados usando draw_lrbt_rectangle_filled."""
-    half_w = width / 2
-    half_h = height / 2
-    left = cx - half_w
-    right = cx + half_w
-    bottom = cy - half_h
-    top = cy + half_h
-    arcade.draw_lrbt_rectangle_filled(left, right, bottom, top, color)
+
+def add_arc_filled(shapes, x, y, radius, start_angle, end_angle, color, segments=24):
+    """Agrega un sector circular relleno (ángulos en grados)."""
+    points = [(x, y)]
+    for i in range(segments + 1):
+        angle = math.radians(start_angle + (end_angle - start_angle) * i / segments)
+        points.append((x + math.cos(angle) * radius, y + math.sin(angle) * radius))
+    shapes.append(arcade.shape_list.create_polygon(points, color))
 
 
-def draw_gradient_background():
+def add_gradient_background(shapes, width, height):
     """Fondo con degradado vertical y cuadritos tipo 'pixel'."""
     steps = 16
     for i in range(steps):
@@ -94,143 +110,249 @@ def draw_gradient_background():
         r = int(COLOR_BG_TOP[0] + (COLOR_BG_BOTTOM[0] - COLOR_BG_TOP[0]) * t)
         g = int(COLOR_BG_TOP[1] + (COLOR_BG_BOTTOM[1] - COLOR_BG_TOP[1]) * t)
         b = int(COLOR_BG_TOP[2] + (COLOR_BG_BOTTOM[2] - COLOR_BG_TOP[2]) * t)
-        y_bottom = (SCREEN_HEIGHT / steps) * i
-        y_top = y_bottom + (SCREEN_HEIGHT / steps)
-
-        # lrbt = left, right, bottom, top
-        arcade.draw_lrbt_rectangle_filled(
-            0, SCREEN_WIDTH, y_bottom, y_top, (r, g, b)
+        strip_h = height / steps
+        add_centered_rect_filled(
+            shapes, width / 2, strip_h * i + strip_h / 2, width, strip_h, (r, g, b)
         )
 
     # Cuadritos decorativos (HUD gamer)
-    for x in range(0, SCREEN_WIDTH, 80):
+    for x in range(0, width, 80):
         # Cuadro inferior
-        draw_centered_rect_filled(
-            x + 10, 40, 18, 18, COLOR_ACCENT_SOFT
-        )
+        add_centered_rect_filled(shapes, x + 10, 40, 18, 18, COLOR_ACCENT_SOFT)
         # Cuadro superior
-        draw_centered_rect_filled(
-            x + 30, SCREEN_HEIGHT - 40, 12, 12, COLOR_ACCENT_SOFT
-        )
+        add_centered_rect_filled(shapes, x + 30, height - 40, 12, 12, COLOR_ACCENT_SOFT)
 
 
-def draw_pokeball_like(x, y, radius=40):
+def add_pokeball_like(shapes, x, y, radius=40):
     """No es un pokeball oficial, solo un círculo temático gamer."""
     # Parte superior
-    arcade.draw_arc_filled(
-        x, y, radius * 2, radius * 2, (220, 60, 90), 0, 180
-    )
+    add_arc_filled(shapes, x, y, radius, 0, 180, (220, 60, 90))
     # Parte inferior
-    arcade.draw_arc_filled(
-        x, y, radius * 2, radius * 2, (245, 245, 245), 180, 360
-    )
+    add_arc_filled(shapes, x, y, radius, 180, 360, (245, 245, 245))
     # Línea central
-    draw_centered_rect_filled(
-        x, y, radius * 2, radius * 0.18, (15, 15, 25)
-    )
+    add_centered_rect_filled(shapes, x, y, radius * 2, radius * 0.18, (15, 15, 25))
     # Centro
-    arcade.draw_circle_filled(x, y, radius * 0.38, (245, 245, 245))
-    arcade.draw_circle_filled(x, y, radius * 0.2, (180, 210, 255))
+    shapes.append(arcade.shape_list.create_ellipse_filled(
+        x, y, radius * 0.76, radius * 0.76, (245, 245, 245), num_segments=32
+    ))
+    shapes.append(arcade.shape_list.create_ellipse_filled(
+        x, y, radius * 0.4, radius * 0.4, (180, 210, 255), num_segments=32
+    ))
 
 
-def draw_panel_border(x_center, y_center, width, height, color, thickness=3):
+def add_panel_border(shapes, x_center, y_center, width, height, color, thickness=3):
     """Borde con cuatro rectángulos finos."""
     half_w = width / 2
     half_h = height / 2
 
     # Arriba
-    draw_centered_rect_filled(
-        x_center,
-        y_center + half_h - thickness / 2,
-        width,
-        thickness,
-        color,
+    add_centered_rect_filled(
+        shapes, x_center, y_center + half_h - thickness / 2, width, thickness, color
     )
     # Abajo
-    draw_centered_rect_filled(
-        x_center,
-        y_center - half_h + thickness / 2,
-        width,
-        thickness,
-        color,
+    add_centered_rect_filled(
+        shapes, x_center, y_center - half_h + thickness / 2, width, thickness, color
     )
     # Izquierda
-    draw_centered_rect_filled(
-        x_center - half_w + thickness / 2,
-        y_center,
-        thickness,
-        height - 2 * thickness,
-        color,
+    add_centered_rect_filled(
+        shapes, x_center - half_w + thickness / 2, y_center,
+        thickness, height - 2 * thickness, color,
     )
     # Derecha
-    draw_centered_rect_filled(
-        x_center + half_w - thickness / 2,
-        y_center,
-        thickness,
-        height - 2 * thickness,
-        color,
+    add_centered_rect_filled(
+        shapes, x_center + half_w - thickness / 2, y_center,
+        thickness, height - 2 * thickness, color,
     )
 
 
-def draw_menu_panel(title: str, subtitle: str = ""):
-    """Panel central reutilizable para login / registro / verificación."""
+class Spinner:
+    """Arco que gira mientras hay una operación en segundo plano."""
+
+    def __init__(self, x, y, radius=10, color=COLOR_ACCENT):
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.color = color
+        self.angle = 0.0
+
+    def update(self, delta_time):
+        self.angle = (self.angle - 360 * delta_time) % 360
+
+    def draw(self):
+        arcade.draw_arc_outline(
+            self.x, self.y, self.radius * 2, self.radius * 2, self.color,
+            self.angle, self.angle + 270, border_width=3, num_segments=24,
+        )
+
+
+class MenuBackground:
+    """
+    Fondo + panel central de login / registro / verificación, precalculados.
+
+    La geometría vive en un ShapeElementList (un solo buffer en la GPU) y los
+    textos fijos en un Batch de pyglet. Se construye la primera vez que se
+    dibuja y solo se reconstruye si cambia el tamaño de la ventana
+    (o si se llama a rebuild() a mano, por ejemplo desde on_resize).
+    """
+
     panel_w = 550
     panel_h = 380
-    cx = SCREEN_WIDTH // 2
-    cy = SCREEN_HEIGHT // 2
-
-    # Panel principal
-    draw_centered_rect_filled(cx, cy, panel_w, panel_h, COLOR_PANEL)
-    draw_panel_border(cx, cy, panel_w, panel_h, COLOR_PANEL_BORDER, thickness=3)
-
-    # Franja superior (lrbt = left, right, bottom, top)
-    header_h = 80
-    left = cx - panel_w / 2
-    right = cx + panel_w / 2
-    bottom = cy + panel_h / 2 - header_h
-    top = cy + panel_h / 2
-    arcade.draw_lrbt_rectangle_filled(
-        left, right, bottom, top, (30, 45, 95)
-    )
 
-    # "Pokeball" decorativa a la izquierda
-    draw_pokeball_like(cx - panel_w / 2 + 70, cy + panel_h / 2 - 40, radius=28)
-
-    # Título
-    arcade.draw_text(
-        title,
-        cx - panel_w / 2 + 120,
-        cy + panel_h / 2 - 40,
-        arcade.color.WHITE,
-        20,
-        anchor_x="left",
-        anchor_y="center",
-        bold=True,
-    )
+    def __init__(self, title: str = "", subtitle: str = "", footer: str = ""):
+        self.title = title
+        self.subtitle = subtitle
+        self.footer = footer
+        self.size = None
+        self.shapes = None
+        self.text_batch = None
+        # Referencias a los arcade.Text para que el batch no los pierda
+        self.texts = []
+
+    def rebuild(self, width: int, height: int):
+        """Vuelve a generar toda la geometría para una ventana de width x height."""
+        self.size = (width, height)
+        self.shapes = arcade.shape_list.ShapeElementList()
+        self.text_batch = pyglet.graphics.Batch()
+        self.texts = []
+
+        add_gradient_background(self.shapes, width, height)
+        self.build_panel(width, height)
+
+        if self.footer:
+            self.add_text(
+                self.footer, width // 2, 50, COLOR_TEXT_SOFT, 11, anchor_x="center"
+            )
+
+    def build_panel(self, width: int, height: int):
+        """Panel central reutilizable para login / registro / verificación."""
+        panel_w = self.panel_w
+        panel_h = self.panel_h
+        cx = width // 2
+        cy = height // 2
+
+        # Panel principal
+        add_centered_rect_filled(self.shapes, cx, cy, panel_w, panel_h, COLOR_PANEL)
+        add_panel_border(self.shapes, cx, cy, panel_w, panel_h, COLOR_PANEL_BORDER, thickness=3)
+
+        # Franja superior
+        header_h = 80
+        add_centered_rect_filled(
+            self.shapes, cx, cy + panel_h / 2 - header_h / 2, panel_w, header_h, (30, 45, 95)
+        )
+
+        # "Pokeball" decorativa a la izquierda
+        add_pokeball_like(self.shapes, cx - panel_w / 2 + 70, cy + panel_h / 2 - 40, radius=28)
+
+        # Título
+        self.add_text(
+            self.title,
+            cx - panel_w / 2 + 120,
+            cy + panel_h / 2 - 40,
+            arcade.color.WHITE,
+            20,
+            anchor_x="left",
+            anchor_y="center",
+            bold=True,
+        )
+
+        if self.subtitle:
+            self.add_text(
+                self.subtitle,
+                cx,
+                cy + panel_h / 2 - 100,
+                COLOR_TEXT_SOFT,
+                12,
+                anchor_x="center",
+            )
+
+        # Borde interior decorativo
+        inner_w = panel_w - 24
+        inner_h = panel_h - 24
+        add_panel_border(self.shapes, cx, cy, inner_w, inner_h, COLOR_ACCENT, thickness=2)
+
+    def add_text(self, text, x, y, color, size, **kwargs):
+        self.texts.append(
+            arcade.Text(text, x, y, color, size, batch=self.text_batch, **kwargs)
+        )
+
+    def draw(self):
+        window = arcade.get_window()
+        if self.size != (window.width, window.height):
+            self.rebuild(window.width, window.height)
+        self.shapes.draw()
+        self.text_batch.draw()
+
+
+class WelcomeBackground(MenuBackground):
+    """Fondo de la pantalla de bienvenida (panel sin franja ni pokeball)."""
 
-    if subtitle:
-        arcade.draw_text(
-            subtitle,
+    panel_w = 560
+    panel_h = 320
+
+    def build_panel(self, width: int, height: int):
+        cx = width // 2
+        cy = height // 2 + 20
+
+        add_centered_rect_filled(self.shapes, cx, cy, self.panel_w, self.panel_h, COLOR_PANEL)
+        add_panel_border(
+            self.shapes, cx, cy, self.panel_w, self.panel_h, COLOR_PANEL_BORDER, thickness=3
+        )
+
+        # Título del juego
+        self.add_text(
+            self.title,
             cx,
-            cy + panel_h / 2 - 100,
-            COLOR_TEXT_SOFT,
-            12,
+            cy + self.panel_h / 2 - 50,
+            arcade.color.WHITE,
+            28,
             anchor_x="center",
+            bold=True,
         )
 
-    # Borde interior decorativo
-    inner_w = panel_w - 24
-    inner_h = panel_h - 24
-    draw_panel_border(cx, cy, inner_w, inner_h, COLOR_ACCENT, thickness=2)
+        # Barra decorativa
+        add_centered_rect_filled(self.shapes, cx, cy - 95, 260, 10, (35, 160, 120))
 
 
 # ================= VISTAS =================
+# Cada vista se construye una sola vez por ventana (UIManager, widgets,
+# fondos) y después se reutiliza: on_show_view la deja lista para volver a
+# usarse y activa su UIManager, on_hide_view lo desactiva para que una
+# vista oculta no siga recibiendo clics.
+
+def vista(window, clase):
+    """La instancia de `clase` de esta ventana (se crea la primera vez)."""
+    instancia = window.vistas.get(clase)
+    if instancia is None:
+        instancia = window.vistas[clase] = clase()
+    return instancia
+
+
+def mostrar(window, clase):
+    window.show_view(vista(window, clase))
+
+
+def descartar(future):
+    """
+    Suelta un trabajo del AuthService que la vista ya no espera (se fue a
+    otra vista o empezó otro intento). Si todavía no empezó se cancela; si
+    ya corre termina solo y su resultado no se lee. Devuelve None para
+    asignarlo: self.login_future = descartar(self.login_future).
+    """
+    if future is not None:
+        future.cancel()
+    return None
+
 
 class LoginView(arcade.View):
     def __init__(self):
         super().__init__()
         self.ui_manager = arcade.gui.UIManager()
-        self.ui_manager.enable()
+
+        self.background = MenuBackground(
+            "Login Campus UGB",
+            "Ingresa tu usuario y contraseña para comenzar la aventura",
+            "¿Aún no tienes cuenta? Regístrate con tu correo Gmail.",
+        )
 
         center_y = SCREEN_HEIGHT // 2
 
@@ -298,48 +420,74 @@ class LoginView(arcade.View):
         self.ui_manager.add(register_link_button)
         self.ui_manager.add(self.status_label)
 
+        # Login en curso (la base y el hash corren en el AuthService)
+        self.login_future = None
+        self.spinner = Spinner(SCREEN_WIDTH // 2 - 255, center_y - 170)
+
+    def on_show_view(self):
+        # El usuario se queda escrito (útil al cerrar sesión); la contraseña no
+        self.password_input.text = ""
+        self.status_label.text = ""
+        self.ui_manager.enable()
+
+    def on_hide_view(self):
+        self.ui_manager.disable()
+        # Una vista oculta no recibe on_update: un login que terminara
+        # después entraría al juego la próxima vez que se muestre
+        self.login_future = descartar(self.login_future)
+
     def on_click_login(self, event):
+        if self.login_future is not None:
+            return
+
         # Ahora usamos el nombre de perfil para loguear
         username = self.username_input.text.strip()
         password = self.password_input.text
 
-        ok, msg, profile_name = login_user(username, password)
+        self.status_label.text = "Verificando..."
+        self.login_future = self.window.auth_service.login(username, password)
+
+    def on_update(self, delta_time):
+        if self.login_future is None:
+            return
+        if not self.login_future.done():
+            self.spinner.update(delta_time)
+            return
+        future, self.login_future = self.login_future, None
+
+        ok, msg, profile_name = future.result()
         self.status_label.text = msg
 
         if ok:
             # Podrías recuperar el email si quisieras, pero por ahora solo guardamos el perfil
             self.window.current_user_email = None
             self.window.current_profile_name = profile_name
-            game_view = GameView()
-            self.window.show_view(game_view)
+            mostrar(self.window, GameView)
 
     def on_click_go_to_register(self, event):
-        register_view = RegisterView()
-        self.window.show_view(register_view)
+        mostrar(self.window, RegisterView)
+
+    def on_resize(self, width, height):
+        self.background.rebuild(width, height)
 
     def on_draw(self):
         self.clear()
-        draw_gradient_background()
-        draw_menu_panel(
-            "Login Campus UGB",
-            "Ingresa tu usuario y contraseña para comenzar la aventura",
-        )
-        arcade.draw_text(
-            "¿Aún no tienes cuenta? Regístrate con tu correo Gmail.",
-            SCREEN_WIDTH // 2,
-            50,
-            COLOR_TEXT_SOFT,
-            11,
-            anchor_x="center",
-        )
+        self.background.draw()
         self.ui_manager.draw()
+        if self.login_future is not None:
+            self.spinner.draw()
 
 
 class RegisterView(arcade.View):
     def __init__(self):
         super().__init__()
         self.ui_manager = arcade.gui.UIManager()
-        self.ui_manager.enable()
+
+        self.background = MenuBackground(
+            "Registro de Entrenador UGB",
+            "Crea tu cuenta y valida tu correo para entrar al campus",
+            "Consejo: Usa un nombre de perfil único para que tus amigos te encuentren.",
+        )
 
         center_y = SCREEN_HEIGHT // 2
 
@@ -347,6 +495,12 @@ class RegisterView(arcade.View):
         self.pending_email = None
         self.pending_password = None
         self.pending_profile = None
+        self.pending_code = None
+        # Consulta de correo/perfil en curso (AuthService) y correo en vuelo
+        # (el envío corre en el hilo del MailDispatcher)
+        self.conflict_future = None
+        self.mail_job = None
+        self.spinner = Spinner(SCREEN_WIDTH // 2 - 255, center_y - 180)
 
         # ===== Inputs =====
         self.email_input = arcade.gui.UIInputText(
@@ -424,7 +578,22 @@ class RegisterView(arcade.View):
         self.ui_manager.add(back_button)
         self.ui_manager.add(self.status_label)
 
+    def on_show_view(self):
+        self.password_input.text = ""
+        self.status_label.text = ""
+        self.ui_manager.enable()
+
+    def on_hide_view(self):
+        self.ui_manager.disable()
+        # Lo que estaba en curso ya no abre la verificación (on_mail_status
+        # ignora los correos que no son self.mail_job)
+        self.conflict_future = descartar(self.conflict_future)
+        self.mail_job = None
+
     def on_click_send_code(self, event):
+        if self.conflict_future is not None or self.mail_job is not None:
+            return  # ya hay un código en camino
+
         email = self.email_input.text.strip()
         password = self.password_input.text
         profile_name = self.profile_input.text.strip()
@@ -440,61 +609,90 @@ class RegisterView(arcade.View):
         if not ok_pass:
             self.status_label.text = msg_pass
             return
-        if email_exists(email):
+        self.pending_email = email
+        self.pending_password = password
+        self.pending_profile = profile_name
+        self.status_label.text = "Revisando disponibilidad..."
+        self.conflict_future = self.window.auth_service.find_conflict(email, profile_name)
+
+    def on_conflict_checked(self, conflict):
+        if conflict == "email":
             self.status_label.text = "Ya existe una cuenta con ese correo"
             return
-        if profile_name_exists(profile_name):
+        if conflict == "profile_name":
             self.status_label.text = "Ese nombre de perfil ya está en uso"
             return
 
-        # Generar y enviar código
+        dispatcher = mail_dispatcher(self.window)
+        if dispatcher is None:
+            self.status_label.text = "El envío de correos no está configurado (revisa el archivo .env)."
+            return
+
+        # Generar y encolar el código; la ventana sigue dibujando mientras se envía
         code = f"{random.randint(0, 9999):04d}"
-        try:
-            send_verification_code(email, code)
-            self.pending_email = email
-            self.pending_password = password
-            self.pending_profile = profile_name
-            verify_view = VerifyCodeView(code, email, password, profile_name)
+        self.pending_code = code
+        self.status_label.text = "Enviando código..."
+        self.mail_job = dispatcher.submit(self.pending_email, code, self.on_mail_status)
+
+    def on_mail_status(self, job, status):
+        from mail_service import FAILED, SENDING, SENT  # ya importado por el dispatcher
+
+        if job is not self.mail_job:
+            return  # correo de un intento anterior
+        if status == SENDING and job.attempts > 1:
+            self.status_label.text = f"Reintentando envío del código ({job.attempts})..."
+        elif status == SENT:
+            self.mail_job = None
+            verify_view = vista(self.window, VerifyCodeView)
+            verify_view.preparar(
+                self.pending_code, self.pending_email, self.pending_password, self.pending_profile
+            )
             self.window.show_view(verify_view)
-        except Exception as e:
-            print("Error enviando correo:", e)
+        elif status == FAILED:
+            self.mail_job = None
+            print("Error enviando correo:", job.error)
             self.status_label.text = "No se pudo enviar el código. Revisa la configuración del correo."
 
+    def on_update(self, delta_time):
+        if self.conflict_future is not None and self.conflict_future.done():
+            future, self.conflict_future = self.conflict_future, None
+            self.on_conflict_checked(future.result())
+        if self.window.mail_dispatcher is not None:
+            self.window.mail_dispatcher.poll()
+        self.spinner.update(delta_time)
+
     def on_click_back(self, event):
-        login_view = LoginView()
-        self.window.show_view(login_view)
+        mostrar(self.window, LoginView)
+
+    def on_resize(self, width, height):
+        self.background.rebuild(width, height)
 
     def on_draw(self):
         self.clear()
-        draw_gradient_background()
-        draw_menu_panel(
-            "Registro de Entrenador UGB",
-            "Crea tu cuenta y valida tu correo para entrar al campus",
-        )
-        arcade.draw_text(
-            "Consejo: Usa un nombre de perfil único para que tus amigos te encuentren.",
-            SCREEN_WIDTH // 2,
-            50,
-            COLOR_TEXT_SOFT,
-            11,
-            anchor_x="center",
-        )
+        self.background.draw()
         self.ui_manager.draw()
+        if self.conflict_future is not None or self.mail_job is not None:
+            self.spinner.draw()
 
 
 class VerifyCodeView(arcade.View):
-    def __init__(self, verification_code, email, password, profile):
+    def __init__(self):
         super().__init__()
         self.ui_manager = arcade.gui.UIManager()
-        self.ui_manager.enable()
 
-        center_y = SCREEN_HEIGHT // 2
+        self.background = MenuBackground(
+            "Verificar código",
+            "Ingresa el código que fue enviado a tu correo",
+            "Si no ves el correo, revisa la bandeja de spam.",
+        )
 
-        self.verification_code = verification_code
-        self.pending_email = email
-        self.pending_password = password
-        self.pending_profile = profile
+        center_y = SCREEN_HEIGHT // 2
 
+        # Los datos del registro en curso llegan con preparar()
+        self.verification_code = None
+        self.pending_email = None
+        self.pending_password = None
+        self.pending_profile = None
 
         # Input para código
         self.code_input = arcade.gui.UIInputText(
@@ -536,48 +734,87 @@ class VerifyCodeView(arcade.View):
         self.ui_manager.add(back_button)
         self.ui_manager.add(self.status_label)
 
+        self.register_future = None
+        self.spinner = Spinner(SCREEN_WIDTH // 2 - 255, center_y - 105)
+
+    def preparar(self, verification_code, email, password, profile):
+        """Datos del registro que se va a verificar (antes de mostrar la vista)."""
+        self.register_future = descartar(self.register_future)
+        self.verification_code = verification_code
+        self.pending_email = email
+        self.pending_password = password
+        self.pending_profile = profile
+        self.code_input.text = ""
+        self.status_label.text = ""
+
+    def on_show_view(self):
+        self.ui_manager.enable()
+
+    def on_hide_view(self):
+        self.ui_manager.disable()
+        # Si el registro termina con la vista oculta, su resultado no debe
+        # llegar con los datos de otro registro (ver preparar)
+        self.register_future = descartar(self.register_future)
+
     def on_click_verify(self, event):
+        if self.register_future is not None:
+            return
+
         user_code = self.code_input.text.strip()
         if user_code != self.verification_code:
             self.status_label.text = "Código incorrecto. Intenta de nuevo."
             return
 
-        # Registrar usuario
-        ok, msg = register_user(self.pending_email, self.pending_password, self.pending_profile)
+        # Registrar usuario (en segundo plano, el hash es lento)
+        self.status_label.text = "Creando tu cuenta..."
+        self.register_future = self.window.auth_service.register(
+            self.pending_email, self.pending_password, self.pending_profile
+        )
+
+    def on_update(self, delta_time):
+        if self.register_future is None:
+            return
+        if not self.register_future.done():
+            self.spinner.update(delta_time)
+            return
+        future, self.register_future = self.register_future, None
+
+        ok, msg = future.result()
         self.status_label.text = msg
         if ok:
             self.window.current_user_email = self.pending_email
             self.window.current_profile_name = self.pending_profile
-            game_view = GameView()
-            self.window.show_view(game_view)
+            mostrar(self.window, GameView)
 
     def on_click_back(self, event):
-        register_view = RegisterView()
-        self.window.show_view(register_view)
+        mostrar(self.window, RegisterView)
+
+    def on_resize(self, width, height):
+        self.background.rebuild(width, height)
 
     def on_draw(self):
         self.clear()
-        draw_gradient_background()
-        draw_menu_panel(
-            "Verificar código",
-            "Ingresa el código que fue enviado a tu correo",
-        )
-        arcade.draw_text(
-            "Si no ves el correo, revisa la bandeja de spam.",
-            SCREEN_WIDTH // 2,
-            50,
-            COLOR_TEXT_SOFT,
-            11,
-            anchor_x="center",
-        )
+        self.background.draw()
         self.ui_manager.draw()
+        if self.register_future is not None:
+            self.spinner.draw()
 
 
 class GameView(arcade.View):
     def __init__(self):
         super().__init__()
         self.ui_manager = arcade.gui.UIManager()
-        self.ui_manager.enable()
+
+        self.background = WelcomeBackground("UGB CAMPUS QUEST")
+        # El saludo depende del perfil, así que se actualiza en on_show_view
+        self.welcome_text = arcade.Text(
+            "",
+            SCREEN_WIDTH // 2,
+            SCREEN_HEIGHT // 2 + 90,
+            COLOR_ACCENT,
+            20,
+            anchor_x="center",
+        )
 
         center_y = SCREEN_HEIGHT // 2
 
@@ -604,126 +841,295 @@ class GameView(arcade.View):
 
     def on_show_view(self):
         arcade.set_background_color(COLOR_BG_BOTTOM)
+        profile = getattr(self.window, "current_profile_name", "Entrenador")
+        self.welcome_text.text = f"Bienvenido/a, {profile}"
+        self.ui_manager.enable()
+
+    def on_hide_view(self):
+        self.ui_manager.disable()
 
     def on_click_start(self, event):
-        first_game_view = FirstGameView()
-        self.window.show_view(first_game_view)
+        # La primera vez arma el campus (todas las zonas); después vuelve
+        # a la misma vista, con el jugador donde lo dejó
+        mostrar(self.window, FirstGameView)
 
     def on_click_logout(self, event):
         self.window.current_user_email = None
         self.window.current_profile_name = None
-        login_view = LoginView()
-        self.window.show_view(login_view)
+        # El próximo entrenador empieza el campus desde el inicio
+        self.window.vistas.pop(FirstGameView, None)
+        mostrar(self.window, LoginView)
+
+    def on_resize(self, width, height):
+        self.background.rebuild(width, height)
+        self.welcome_text.position = (width // 2, height // 2 + 90)
 
     def on_draw(self):
         self.clear()
-        draw_gradient_background()
-
-        panel_w = 560
-        panel_h = 320
-        cx = SCREEN_WIDTH // 2
-        cy = SCREEN_HEIGHT // 2 + 20
+        self.background.draw()
+        self.welcome_text.draw()
+        self.ui_manager.draw()
 
-        draw_centered_rect_filled(cx, cy, panel_w, panel_h, COLOR_PANEL)
-        draw_panel_border(cx, cy, panel_w, panel_h, COLOR_PANEL_BORDER, thickness=3)
 
-        profile = getattr(self.window, "current_profile_name", "Entrenador")
+class FirstGameView(arcade.View):
+    """
+    El campus: la zona actual con el jugador y una cámara que lo sigue (el
+    fondo se carga por pedazos alrededor). El jugador camina mientras se
+    mantienen apretadas las flechas (o WASD), con paso de simulación fijo
+    (GUI/movimiento.py). F3 muestra las capas de colisión, pasto y warps,
+    ESC vuelve a la bienvenida.
+    """
 
-        # Título del juego
-        arcade.draw_text(
-            "UGB CAMPUS QUEST",
-            cx,
-            cy + panel_h / 2 - 50,
-            arcade.color.WHITE,
-            28,
-            anchor_x="center",
-            bold=True,
-        )
+    TECLAS_MOVIMIENTO = {
+        arcade.key.UP: (0, 1), arcade.key.W: (0, 1),
+        arcade.key.DOWN: (0, -1), arcade.key.S: (0, -1),
+        arcade.key.LEFT: (-1, 0), arcade.key.A: (-1, 0),
+        arcade.key.RIGHT: (1, 0), arcade.key.D: (1, 0),
+    }
 
-        arcade.draw_text(
-            f"Bienvenido/a, {profile}",
-            cx,
-            cy + 70,
-            COLOR_ACCENT,
-            20,
-            anchor_x="center",
+    def __init__(self):
+        super().__init__()
+        from GUI.Escenarios import GestorEscenarios
+        from GUI.movimiento import BucleFijo, EstadoTeclas
+        from GUI.recursos import textura
+
+        # Todas las zonas se suben a la GPU aquí; cambiar de zona después es inmediato
+        self.escenarios = GestorEscenarios()
+        self.escenarios.precargar()
+        self.escenario = None
+        self.debug = False
+
+        self.jugador = arcade.Sprite(textura("player"))
+        self.jugador_lista = arcade.SpriteList()
+        self.jugador_lista.append(self.jugador)
+        self.teclas = EstadoTeclas(self.TECLAS_MOVIMIENTO)
+        self.bucle = BucleFijo()
+        self.caminante = None
+
+        self.camara = arcade.Camera2D()
+        self.titulo_text = arcade.Text("", 20, SCREEN_HEIGHT - 36, arcade.color.WHITE, 18)
+        self.ayuda_text = arcade.Text(
+            "Flechas: caminar   F3: capas   ESC: volver",
+            20, 16, (220, 240, 220), 12,
         )
-
-        # Barra decorativa
-        draw_centered_rect_filled(
-            cx, cy - 95, 260, 10, (35, 160, 120)
+        self.mensaje_text = arcade.Text(
+            "", SCREEN_WIDTH // 2, 60, COLOR_ACCENT, 16, anchor_x="center"
         )
+        self.mensaje_tiempo = 0.0
+        self.entrar("zona_verde")
+
+    def entrar(self, clave, celda=None):
+        from GUI.movimiento import Caminante
+
+        self.escenario = self.escenarios.cambiar(clave)
+        mapa = self.escenario.mapa
+        self.jugador.scale = 2 * mapa.tile / self.jugador.texture.height
+        self.caminante = Caminante(self.escenario.grilla, mapa.ancho, mapa.alto, mapa.tile)
+        self.colocar(celda or mapa.inicio)
+        self.titulo_text.text = mapa.nombre
+        self.ajustar_camara(self.window.width, self.window.height)
+        self.escenario.actualizar(self.camara)
+
+    def colocar(self, celda):
+        """Pone los pies del jugador en el centro de la baldosa."""
+        from GUI.movimiento import ALTO_PIES
+
+        x, y = self.escenario.mapa.centro(*celda)
+        self.caminante.colocar(x, y - ALTO_PIES / 2)
+        self.dibujar_jugador(0.0)
+
+    def dibujar_jugador(self, alpha):
+        x, y = self.caminante.interpolado(alpha)
+        self.jugador.position = (x, y + self.jugador.height / 2)
+
+    def ajustar_camara(self, width, height):
+        self.camara.match_window()
+        self.camara.zoom = ZOOM_CAMPUS
+        self.seguir_jugador(1.0)
+
+    def seguir_jugador(self, suavizado=SUAVIZADO_CAMARA):
+        """
+        Acerca la cámara al jugador (suavizado=1 la pone encima de una vez),
+        sin mostrar nada fuera del mapa; si el mapa es más chico que la
+        ventana, lo centra.
+        """
+        mapa = self.escenario.mapa
+        medio_ancho = self.camara.viewport_width / self.camara.zoom / 2
+        medio_alto = self.camara.viewport_height / self.camara.zoom / 2
+        x, y = self.jugador.position
+        if mapa.ancho > 2 * medio_ancho:
+            x = min(max(x, medio_ancho), mapa.ancho - medio_ancho)
+        else:
+            x = mapa.ancho / 2
+        if mapa.alto > 2 * medio_alto:
+            y = min(max(y, medio_alto), mapa.alto - medio_alto)
+        else:
+            y = mapa.alto / 2
+        cx, cy = self.camara.position
+        self.camara.position = (cx + (x - cx) * suavizado, cy + (y - cy) * suavizado)
+
+    def mostrar_mensaje(self, texto, segundos=2.0):
+        self.mensaje_text.text = texto
+        self.mensaje_tiempo = segundos
+
+    def paso_fijo(self, dt):
+        """Un paso de simulación; warps y encuentros al pisar otra baldosa."""
+        if not self.caminante.paso(dt, self.teclas.direccion()):
+            return
+        mapa = self.escenario.mapa
+        col, fila = self.caminante.celda
+        warp = mapa.warp_en(col, fila)
+        if warp is not None:
+            self.entrar(warp.destino, warp.llegada)
+            self.mostrar_mensaje(
+                f"{self.escenario.mapa.nombre} ({self.escenarios.ms_ultimo_cambio:.2f} ms)"
+            )
+        elif mapa.es_pasto(col, fila) and random.random() < PROBABILIDAD_ENCUENTRO:
+            from Logic.Class.Pokedex import pokedex
+
+            especies = pokedex().en_lugar(mapa.nombre)
+            if especies:
+                self.mostrar_mensaje(f"¡Un {random.choice(especies).nombre} salvaje apareció!")
 
-        self.ui_manager.draw()
+    def on_show_view(self):
+        arcade.set_background_color((20, 60, 30))
 
+    def on_hide_view(self):
+        self.teclas.limpiar()
 
-class FirstGameView(arcade.View):
-    def __init__(self):
-        super().__init__()
+    def on_resize(self, width, height):
+        self.ajustar_camara(width, height)
+        self.titulo_text.position = (20, height - 36)
+        self.mensaje_text.position = (width // 2, 60)
 
-    def on_show_view(self):
-        arcade.set_background_color((20, 60, 30))
+    def on_update(self, delta_time):
+        alpha = self.bucle.avanzar(delta_time, self.paso_fijo)
+        self.dibujar_jugador(alpha)
+        self.seguir_jugador()
+        self.escenario.actualizar(self.camara)
+        if self.mensaje_tiempo > 0:
+            self.mensaje_tiempo -= delta_time
 
     def on_draw(self):
         self.clear()
+        with self.camara.activate():
+            self.escenario.draw(self.debug)
+            self.jugador_lista.draw(pixelated=True)
 
-        # Fondo tipo césped sencillo
-        for y in range(0, SCREEN_HEIGHT, 40):
-            for x in range(0, SCREEN_WIDTH, 40):
-                if (x // 40 + y // 40) % 2 == 0:
-                    color = (34, 139, 34)
-                else:
-                    color = (24, 119, 34)
-
-                # lrbt = left, right, bottom, top
-                arcade.draw_lrbt_rectangle_filled(
-                    x, x + 40, y, y + 40, color
-                )
-
-        arcade.draw_text(
-            "Primer mapa del juego (placeholder)",
-            SCREEN_WIDTH // 2,
-            SCREEN_HEIGHT - 80,
-            arcade.color.WHITE,
-            22,
-            anchor_x="center",
-        )
-        arcade.draw_text(
-            "Aquí podrás cargar el mapa del campus, NPCs, rutas, etc.",
-            SCREEN_WIDTH // 2,
-            SCREEN_HEIGHT - 120,
-            (220, 240, 220),
-            14,
-            anchor_x="center",
-        )
-
-        arcade.draw_text(
-            "Presiona ESC para volver a la pantalla de bienvenida.",
-            SCREEN_WIDTH // 2,
-            60,
-            (220, 240, 220),
-            14,
-            anchor_x="center",
-        )
+        self.titulo_text.draw()
+        self.ayuda_text.draw()
+        if self.mensaje_tiempo > 0:
+            self.mensaje_text.draw()
 
     def on_key_press(self, key, modifiers):
         if key == arcade.key.ESCAPE:
-            welcome_view = GameView()
-            self.window.show_view(welcome_view)
+            mostrar(self.window, GameView)
+        elif key == arcade.key.F3:
+            self.debug = not self.debug
+        else:
+            self.teclas.presionar(key)
+
+    def on_key_release(self, key, modifiers):
+        self.teclas.soltar(key)
+
+
+# ================= REPORTE DE ARRANQUE =================
+
+def desglose_imports(modulo: str = "main", limite: int = 12) -> list:
+    """
+    [(módulo, ms acumulados)] de lo que importa `modulo`, de mayor a menor:
+    corre python -X importtime en otro proceso y se queda con los imports
+    directos del módulo.
+    """
+    import subprocess
+
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True,
+    ).stderr
+    directos = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, nombre = linea.split("|")
+        if not acumulado.strip().isdigit():
+            continue  # la cabecera
+        profundidad = (len(nombre) - len(nombre.lstrip()) - 1) // 2
+        if profundidad == 1:
+            directos.append((nombre.strip(), int(acumulado) / 1000))
+        elif profundidad == 0:
+            if nombre.strip() == modulo:
+                break
+            directos = []
+    return sorted(directos, key=lambda par: -par[1])[:limite]
+
+
+class ReporteArranque:
+    """
+    Cuánto tarda cada etapa desde que se empieza a cargar main.py hasta que
+    se ve el login (python main.py --tiempos). El primer frame se marca con
+    on_refresh, que pyglet manda después de on_draw.
+    """
+
+    def __init__(self):
+        self.etapas = [("imports de main.py", _TIEMPO_IMPORTS * 1000)]
+        self._anterior = _INICIO + _TIEMPO_IMPORTS
+
+    def marcar(self, etapa: str):
+        ahora = time.perf_counter()
+        self.etapas.append((etapa, (ahora - self._anterior) * 1000))
+        self._anterior = ahora
+
+    def al_primer_frame(self, window):
+        def on_refresh(delta_time):
+            window.remove_handler("on_refresh", on_refresh)
+            self.marcar("primer frame (login)")
+            self.imprimir()
+
+        window.push_handlers(on_refresh=on_refresh)
+
+    def imprimir(self):
+        print("Arranque hasta el login:")
+        for etapa, ms in self.etapas:
+            print(f"  {etapa:<26} {ms:8.1f} ms")
+        print(f"  {'total':<26} {sum(ms for _, ms in self.etapas):8.1f} ms")
+        # El desglose corre otro intérprete: en un hilo, para no trabar la ventana
+        import threading
+
+        def desglose():
+            print("Imports de main.py (python -X importtime, acumulado):")
+            for nombre, ms in desglose_imports():
+                print(f"  {nombre:<26} {ms:8.1f} ms")
+
+        threading.Thread(target=desglose, daemon=True).start()
 
 
 # ================= FUNCIÓN PRINCIPAL =================
 
-def main():
-    init_db()  # crea la tabla de usuarios si no existe
+def main(tiempos: bool = False):
+    arranque = ReporteArranque()
+    auth_service = AuthService()
+    init_future = auth_service.init_db()  # crea la tabla de usuarios si no existe
 
     window = arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
     window.current_user_email = None
     window.current_profile_name = None
-    login_view = LoginView()
+    window.auth_service = auth_service
+    window.mail_dispatcher = None  # se crea con el primer correo (mail_dispatcher)
+    window.vistas = {}
+    arranque.marcar("ventana")
+    init_future.result()  # la base tiene que estar lista antes del primer login
+    arranque.marcar("base de datos lista")
+    login_view = vista(window, LoginView)
+    arranque.marcar("LoginView")
     window.show_view(login_view)
+    if tiempos:
+        arranque.al_primer_frame(window)
     arcade.run()
+    if window.mail_dispatcher is not None:
+        window.mail_dispatcher.stop(timeout=1)
+    auth_service.shutdown(wait=False)
 
 
 if __name__ == "__main__":
-    main()
+    main(tiempos="--tiempos" in sys.argv)
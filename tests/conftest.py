@@ -0,0 +1,13 @@
+"""
+Pruebas automáticas del juego:
+    python -m pytest -q
+
+Los módulos se importan desde la raíz del proyecto, igual que al correr
+main.py. Las pruebas de las vistas abren una ventana de arcade, así que en
+un servidor sin pantalla hay que correrlas con
+    xvfb-run python -m pytest -q
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,94 @@
+"""Índice NOCASE del login y migración de perfiles repetidos en auth_db."""
+import sqlite3
+
+import pytest
+
+import auth_db
+
+
+@pytest.fixture
+def base(tmp_path, monkeypatch):
+    """Ruta de una auth.db vacía para este test (la conexión se cierra al final)."""
+    ruta = str(tmp_path / "auth.db")
+    monkeypatch.setattr(auth_db, "DB_NAME", ruta)
+    monkeypatch.setattr(auth_db, "PBKDF2_ITERATIONS", 1_000)
+    yield ruta
+    auth_db.close_connection()
+
+
+def crear_base_vieja(ruta, perfiles):
+    """Una auth.db de antes de la migración v1: perfiles únicos solo con mayúsculas exactas."""
+    conn = sqlite3.connect(ruta)
+    conn.execute("""
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            profile_name TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO users (id, email, profile_name, password_hash, created_at) "
+        "VALUES (?, ?, ?, 'x', '2024-01-01')",
+        [(i, f"user{i}@gmail.com", perfil) for i, perfil in enumerate(perfiles, start=1)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def perfiles(ruta):
+    conn = sqlite3.connect(ruta)
+    try:
+        return dict(conn.execute("SELECT id, profile_name FROM users"))
+    finally:
+        conn.close()
+
+
+def test_login_usa_el_indice_nocase(base):
+    auth_db.init_db()
+    plan = auth_db.get_connection().execute(
+        "EXPLAIN QUERY PLAN " + auth_db.LOGIN_QUERY, ("Ash",)
+    ).fetchall()
+    detalles = [fila[-1] for fila in plan]
+    assert any("USING INDEX idx_users_profile_nocase" in d for d in detalles), detalles
+    assert not any(d.startswith("SCAN") for d in detalles), detalles
+
+
+def test_migracion_renombra_repetidos_sin_chocar(base):
+    # "ash" (id 2) se renombraría a "ash_2", pero ya hay un "ASH_2" (id 3);
+    # y "Ash_2" (id 4) repite a "ASH_2" y su "Ash_2_4" choca con el id 5
+    crear_base_vieja(base, ["Ash", "ash", "ASH_2", "Ash_2", "ash_2_4", "Misty"])
+
+    auth_db.init_db()
+
+    nombres = perfiles(base)
+    assert nombres[1] == "Ash" and nombres[3] == "ASH_2" and nombres[6] == "Misty"
+    assert nombres[2] == "ash_2_2"
+    assert nombres[4] == "Ash_2_4_2"
+    assert nombres[5] == "ash_2_4"
+    en_minusculas = [n.lower() for n in nombres.values()]
+    assert len(set(en_minusculas)) == len(en_minusculas)
+    assert auth_db.get_connection().execute("PRAGMA user_version").fetchone()[0] == len(auth_db.MIGRATIONS)
+
+    # Con el índice creado, otro perfil que solo cambia mayúsculas se rechaza
+    ok, msg = auth_db.register_user("nuevo@gmail.com", "Abcdef1!", "MISTY")
+    assert not ok and msg == auth_db.CONFLICT_MESSAGES["profile_name"]
+
+
+@pytest.mark.parametrize("guardado", [
+    "pbkdf2_sha256$abc$zz$yy",
+    "pbkdf2_sha256$1000$zz$yy",
+    "pbkdf2_sha256$0$00$00",
+    "pbkdf2_sha256$-5$00$00",
+    "pbkdf2_sha256$1000$00$ñ",
+])
+def test_hash_danado_es_contrasena_incorrecta(base, guardado):
+    assert auth_db.verify_password("Abcdef1!", guardado) == (False, False)
+
+    auth_db.init_db()
+    auth_db.get_connection().execute(
+        "INSERT INTO users (email, profile_name, password_hash, created_at) "
+        "VALUES ('ash@gmail.com', 'Ash', ?, '2024-01-01')", (guardado,)
+    )
+    assert auth_db.login_user("Ash", "Abcdef1!") == (False, "Contraseña incorrecta", None)
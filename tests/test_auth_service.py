@@ -0,0 +1,98 @@
+"""AuthService sin ventana: hilos, latencia inyectada, conexiones y cierre."""
+import threading
+import time
+
+import pytest
+
+import auth_db
+from auth_service import AuthService
+
+CLAVE = "Abcdef1!"
+
+
+@pytest.fixture
+def base(tmp_path, monkeypatch):
+    """Una base de prueba que ya tiene a "Ash"."""
+    monkeypatch.setattr(auth_db, "DB_NAME", str(tmp_path / "auth.db"))
+    monkeypatch.setattr(auth_db, "PBKDF2_ITERATIONS", 1_000)
+    auth_db.init_db()
+    assert auth_db.register_user("ash@gmail.com", CLAVE, "Ash")[0]
+    yield
+    auth_db.close_connection()
+
+
+@pytest.fixture
+def servicio():
+    """servicio(**opciones) -> AuthService que se cierra al terminar el test."""
+    creados = []
+
+    def crear(**opciones):
+        creados.append(AuthService(**opciones))
+        return creados[-1]
+
+    yield crear
+    for service in creados:
+        service.shutdown()
+
+
+def test_el_trabajo_corre_fuera_del_hilo_que_lo_pide(base, servicio):
+    service = servicio(workers=2, latency=0)
+    hilo = service.submit(threading.current_thread).result(timeout=5)
+
+    assert hilo is not threading.current_thread()
+    assert hilo.name.startswith("auth")
+    assert service.login("ash", CLAVE).result(timeout=5) == (True, "Inicio de sesión exitoso", "Ash")
+
+
+def test_auth_fake_latency_retrasa_cada_operacion(base, servicio, monkeypatch):
+    monkeypatch.setenv("AUTH_FAKE_LATENCY", "0.3")
+    service = servicio(workers=2)
+    assert service.latency == 0.3
+
+    inicio = time.perf_counter()
+    login = service.login("Ash", "Otra1234!")
+    conflicto = service.find_conflict("misty@gmail.com", "ASH")
+    assert time.perf_counter() - inicio < 0.05   # pedir no bloquea
+    assert not login.done() and not conflicto.done()
+
+    assert login.result(timeout=5) == (False, "Contraseña incorrecta", None)
+    assert conflicto.result(timeout=5) == "profile_name"
+    assert time.perf_counter() - inicio >= 0.3
+
+
+def test_una_conexion_por_hilo_del_pool(base, servicio):
+    service = servicio(workers=3, latency=0.05)   # la espera reparte el trabajo entre los hilos
+
+    def conexion():
+        return threading.get_ident(), auth_db.get_connection()
+
+    resultados = [f.result(timeout=5) for f in [service.submit(conexion) for _ in range(12)]]
+
+    por_hilo = {}
+    for hilo, conn in resultados:
+        por_hilo.setdefault(hilo, set()).add(id(conn))
+    assert 1 < len(por_hilo) <= 3
+    assert all(len(conexiones) == 1 for conexiones in por_hilo.values())
+    assert len({id(conn) for _, conn in resultados}) == len(por_hilo)
+    assert auth_db.get_connection() not in {conn for _, conn in resultados}
+
+
+def test_shutdown_sin_esperar_cancela_lo_pendiente(base, servicio):
+    service = servicio(workers=1, latency=0.3)
+    en_curso = service.login("Ash", CLAVE)
+    pendientes = [service.register(f"user{i}@gmail.com", CLAVE, f"user{i}") for i in range(3)]
+    time.sleep(0.05)   # el primero ya está corriendo
+
+    service.shutdown(wait=False)
+
+    assert all(f.cancelled() for f in pendientes)
+    assert en_curso.result(timeout=5) == (True, "Inicio de sesión exitoso", "Ash")
+    assert auth_db.find_conflict("user0@gmail.com", "user0") is None   # nunca se registraron
+
+
+def test_hash_danado_llega_como_respuesta_no_como_excepcion(base, servicio):
+    auth_db.get_connection().execute(
+        "UPDATE users SET password_hash = 'pbkdf2_sha256$abc$zz$yy' WHERE profile_name = 'Ash'"
+    )
+    service = servicio(workers=1, latency=0)
+    assert service.login("Ash", CLAVE).result(timeout=5) == (False, "Contraseña incorrecta", None)
@@ -0,0 +1,57 @@
+"""Combate y simulación Monte Carlo con lados que no tienen nada que hacer."""
+import pytest
+
+from Logic.Class.Combate import (
+    CAMBIAR, EMPATE, Combate, equipos_de_ejemplo, jugar_combate, politica_aleatoria,
+    politica_mas_daño, simular_batallas,
+)
+from Logic.Class.Pokemon import Pokemon
+from Logic.Class.Repeticion import EscritorRepeticiones, leer_repeticiones, reproducir
+from Logic.Class.Tipo import tabla_tipos
+
+
+def sin_movimientos(especie: int = 132):
+    """Un pokemon que no sabe ningún movimiento."""
+    return Pokemon(especie, 30, (48, 48, 48, 48), tabla_tipos().id("Normal"))
+
+
+def test_sin_movimientos_ni_cambios_solo_puede_quedarse():
+    _, equipo_b = equipos_de_ejemplo()
+    combate = Combate([sin_movimientos()], equipo_b, semilla=3)
+
+    assert combate.acciones(0) == [(CAMBIAR, 0)]
+    assert politica_mas_daño(combate, 0, None) == (CAMBIAR, 0)
+    hp = combate.activo(0).hp
+    combate.jugar_turno((CAMBIAR, 0), (CAMBIAR, 1))
+    assert combate.activos[0] == 0 and combate.activo(0).hp == hp
+
+
+@pytest.mark.parametrize("politica", [politica_aleatoria, politica_mas_daño])
+def test_el_combate_termina_y_se_puede_reproducir(politica, tmp_path):
+    _, equipo_b = equipos_de_ejemplo()
+    ganador, turnos = jugar_combate([sin_movimientos()], equipo_b, 11, politica, politica)
+    assert ganador == 1 and turnos > 0
+
+    ruta = str(tmp_path / "combates.rply")
+    with EscritorRepeticiones(ruta) as escritor:
+        jugar_combate([sin_movimientos()], equipo_b, 11, politica, politica, escritor=escritor)
+    (registro,) = leer_repeticiones(ruta)
+    assert reproducir(registro).ganador == 1
+
+
+def test_dos_lados_sin_movimientos_empatan_por_turnos():
+    combate = Combate([sin_movimientos()], [sin_movimientos(133)], semilla=1, max_turnos=20)
+    while not combate.terminado:
+        combate.jugar_turno(politica_aleatoria(combate, 0, combate.rng),
+                            politica_aleatoria(combate, 1, combate.rng))
+    assert combate.ganador == EMPATE and combate.turno == 20
+
+
+def test_simulacion_en_procesos_no_se_cae():
+    equipo_a, equipo_b = equipos_de_ejemplo()
+    equipo_a = [sin_movimientos()] + equipo_a[1:]   # el primero no puede atacar
+    resultado = simular_batallas(
+        equipo_a, equipo_b, 200, semilla=5, procesos=2,
+        politica_a=politica_aleatoria, politica_b=politica_aleatoria, tamaño_lote=50,
+    )
+    assert resultado.total == 200
@@ -0,0 +1,149 @@
+"""MailDispatcher contra un servidor SMTP local (aiosmtpd), sin Gmail."""
+import email
+import email.policy
+import socket
+import time
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller
+
+from mail_service import (
+    FAILED, SENDING, SENT, MailDispatcher, SMTPMailer, SMTPSettings, build_verification_message,
+)
+
+
+class Buzon:
+    """Handler de aiosmtpd que guarda lo que llega. Los primeros `fallos` DATA responden 451."""
+
+    def __init__(self, fallos: int = 0):
+        self.fallos = fallos
+        self.sobres = []
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.fallos:
+            self.fallos -= 1
+            return "451 4.3.0 Error temporal, intente luego"
+        self.sobres.append(envelope)
+        return "250 OK"
+
+
+def puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def servidor():
+    """
+    levantar(fallos, ociosa) -> (buzón, SMTPSettings) de un servidor en
+    localhost. Con ociosa el servidor corta las conexiones que pasan esos
+    segundos sin comandos.
+    """
+    controladores = []
+
+    def levantar(fallos: int = 0, ociosa: float = 300):
+        buzon = Buzon(fallos)
+        controlador = Controller(buzon, hostname="127.0.0.1", port=puerto_libre(), timeout=ociosa)
+        controlador.start()
+        controladores.append(controlador)
+        return buzon, SMTPSettings("127.0.0.1", controlador.port, starttls=False, timeout=5)
+
+    yield levantar
+    for controlador in controladores:
+        controlador.stop()
+
+
+def enviar(settings, backoff: float = 0.05, limite: float = 10.0):
+    """Encola un código y llama a poll() como lo hace la vista hasta que termina."""
+    dispatcher = MailDispatcher(settings, backoff=backoff)
+    estados = []
+    try:
+        inicio = time.monotonic()
+        job = dispatcher.submit("ash@gmail.com", "4821", lambda j, estado: estados.append(estado))
+        while not estados or estados[-1] not in (SENT, FAILED):
+            assert time.monotonic() - inicio < limite, f"el correo no terminó: {estados}"
+            dispatcher.poll()
+            time.sleep(0.005)
+        return job, estados, time.monotonic() - inicio, dispatcher.mailer.stats
+    finally:
+        dispatcher.stop(timeout=2)
+
+
+def leer(sobre):
+    return email.message_from_bytes(sobre.content, policy=email.policy.default)
+
+
+def test_envia_el_codigo(servidor):
+    buzon, settings = servidor()
+    job, estados, _, stats = enviar(settings)
+
+    assert estados == [SENDING, SENT]
+    assert job.attempts == 1 and job.error is None
+    assert len(buzon.sobres) == 1
+    sobre = buzon.sobres[0]
+    assert sobre.mail_from == "pokeugb@localhost"
+    assert sobre.rcpt_tos == ["ash@gmail.com"]
+    mensaje = leer(sobre)
+    assert mensaje["To"] == "ash@gmail.com"
+    assert "4821" in mensaje.get_content()
+    assert stats.sent == 1 and stats.connections == 1
+
+
+def test_error_temporal_se_reintenta_con_espera(servidor):
+    buzon, settings = servidor(fallos=1)
+    job, estados, segundos, stats = enviar(settings, backoff=0.2)
+
+    assert estados == [SENDING, SENDING, SENT]
+    assert job.attempts == 2 and job.error is None
+    assert segundos >= 0.2   # esperó el backoff antes del segundo intento
+    assert len(buzon.sobres) == 1
+    assert "4821" in leer(buzon.sobres[0]).get_content()
+    # Después del 451 la sesión se descarta y el reintento va por una conexión nueva
+    assert stats.failed == 1 and stats.sent == 1 and stats.connections == 2
+
+
+def codigos(buzon) -> list:
+    return [leer(sobre).get_content().split(": ")[1].split()[0] for sobre in buzon.sobres]
+
+
+def test_varios_correos_por_una_sola_conexion(servidor):
+    buzon, settings = servidor()
+    with SMTPMailer(settings) as mailer:
+        for i in range(5):
+            mailer.send_verification_code(f"user{i}@gmail.com", f"000{i}")
+
+    assert mailer.stats.sent == 5 and mailer.stats.failed == 0
+    assert mailer.stats.connections == 1
+    assert [sobre.rcpt_tos for sobre in buzon.sobres] == [[f"user{i}@gmail.com"] for i in range(5)]
+    assert codigos(buzon) == [f"000{i}" for i in range(5)]
+
+
+def test_send_batch_entrega_todos(servidor):
+    buzon, settings = servidor()
+    mensajes = [
+        build_verification_message("pokeugb@localhost", f"lote{i}@gmail.com", f"{i:04d}")
+        for i in range(20)
+    ]
+    with SMTPMailer(settings) as mailer:
+        fallidos = mailer.send_batch(mensajes)
+
+    assert fallidos == []
+    assert mailer.stats.sent == 20 and mailer.stats.connections == 1
+    assert codigos(buzon) == [f"{i:04d}" for i in range(20)]
+
+
+@pytest.mark.parametrize("idle_check", [0.1, 60.0], ids=["noop", "al-enviar"])
+def test_reconecta_si_el_servidor_corto_la_conexion_ociosa(servidor, idle_check):
+    # Con idle_check corto el NOOP descubre el corte; con uno largo lo descubre send_message
+    buzon, settings = servidor(ociosa=0.3)
+    with SMTPMailer(settings, idle_check=idle_check) as mailer:
+        mailer.send_verification_code("ash@gmail.com", "1111")
+        time.sleep(0.8)   # el servidor cierra la conexión ociosa
+        mailer.send_verification_code("ash@gmail.com", "2222")
+
+    assert mailer.stats.sent == 2 and mailer.stats.failed == 0
+    assert mailer.stats.connections == 2
+    assert codigos(buzon) == ["1111", "2222"]
@@ -0,0 +1,61 @@
+"""Movimiento con paso fijo (GUI/movimiento.py), sin ventana."""
+import math
+
+import pytest
+
+from GUI.colisiones import PARED, Cuerpo, HashEspacial, Rect
+from GUI.movimiento import ANCHO_PIES, MAX_ATRASO, PASO, VELOCIDAD, BucleFijo, Caminante, simular
+
+DIAGONAL = VELOCIDAD / math.sqrt(2)
+
+
+def caminante_con_pared(x_pared: float = 300):
+    """Un caminante en (50, 100) y una pared de todo el alto en x_pared."""
+    grilla = HashEspacial()
+    grilla.agregar(Cuerpo(PARED, Rect(x_pared, 0, 20, 1_000)))
+    caminante = Caminante(grilla, 1_000, 1_000, 20)
+    caminante.colocar(50, 100)
+    return caminante
+
+
+@pytest.mark.parametrize("fps, tirones", [
+    (30, ()),
+    (60, ()),
+    (144, ()),
+    (60, ((0.5, 0.2), (1.2, 0.1))),
+])
+def test_mismo_recorrido_a_cualquier_fps(fps, tirones):
+    (x, y), pasos = simular(caminante_con_pared(), 2.0, fps, (1, 1), tirones)
+
+    assert pasos == round(2.0 / PASO)
+    assert x == pytest.approx(50 + 2.0 * DIAGONAL, abs=1e-6)
+    assert y == pytest.approx(100 + 2.0 * DIAGONAL, abs=1e-6)
+
+
+def test_se_detiene_en_la_pared_y_se_desliza():
+    caminante = caminante_con_pared(300)
+    simular(caminante, 5.0, 60, (1, 1))
+
+    assert caminante.x + ANCHO_PIES / 2 == pytest.approx(300)   # pegado, sin atravesarla
+    assert caminante.y == pytest.approx(100 + 5.0 * DIAGONAL)   # el eje libre siguió igual
+
+
+def test_frame_muy_largo_simula_solo_max_atraso():
+    bucle = BucleFijo()
+    pasos = []
+    alpha = bucle.avanzar(1.0, pasos.append)
+
+    assert len(pasos) == round(MAX_ATRASO / PASO)
+    assert all(dt == PASO for dt in pasos)
+    assert 0.0 <= alpha < 1.0
+
+
+def test_interpolado_entre_pasos():
+    caminante = caminante_con_pared()
+    bucle = BucleFijo()
+    alpha = bucle.avanzar(1.5 * PASO, lambda dt: caminante.paso(dt, (1, 0)))
+
+    assert alpha == pytest.approx(0.5)
+    x, y = caminante.interpolado(alpha)
+    assert x == pytest.approx(50 + 0.5 * VELOCIDAD * PASO)
+    assert y == 100
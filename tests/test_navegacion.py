@@ -0,0 +1,79 @@
+"""Rutas A* repartidas entre frames (GUI/navegacion.py), sin ventana."""
+import heapq
+import random
+import time
+
+from GUI import navegacion
+from GUI.navegacion import PRESUPUESTO_MS, BusquedaAStar, GrillaNavegacion, PlanificadorRutas
+
+
+def grilla_con_paredes(columnas: int = 160, filas: int = 100, semilla: int = 7):
+    """Un campo abierto con un 20% de baldosas bloqueadas al azar."""
+    rng = random.Random(semilla)
+    return GrillaNavegacion(columnas, filas, [rng.random() < 0.2 for _ in range(columnas * filas)])
+
+
+def pedidos(grilla, n: int, semilla: int = 3):
+    rng = random.Random(semilla)
+    libres = [grilla.celda(i) for i, c in enumerate(grilla.caminable) if c]
+    return [(rng.choice(libres), rng.choice(libres)) for _ in range(n)]
+
+
+class RelojFalso:
+    """Un perf_counter que solo avanza al expandir nodos: de 2 a 4 µs cada uno."""
+
+    def __init__(self, semilla: int = 1):
+        self.ahora = 0.0
+        self._rng = random.Random(semilla)
+
+    def perf_counter(self) -> float:
+        return self.ahora
+
+    def heappop(self, abiertos):
+        self.ahora += self._rng.uniform(2e-6, 4e-6)
+        return heapq.heappop(abiertos)
+
+
+def test_el_peor_frame_no_se_pasa_del_presupuesto(monkeypatch):
+    # Con el reloj de verdad la máquina mete ruido (otro proceso, el GC); con
+    # uno falso, cada frame mide solo el trabajo de A*
+    reloj = RelojFalso()
+    monkeypatch.setattr(navegacion, "time", reloj)
+    monkeypatch.setattr(navegacion, "heappop", reloj.heappop)
+    grilla = grilla_con_paredes()
+    planificador = PlanificadorRutas(grilla)
+    solicitudes = [planificador.pedir(a, b) for a, b in pedidos(grilla, 30)]
+
+    frames = []
+    while len(planificador):
+        inicio = reloj.ahora
+        planificador.procesar()
+        frames.append((reloj.ahora - inicio) * 1000)
+
+    assert all(s.lista for s in solicitudes)
+    assert len(frames) > 10                      # el trabajo no entraba en un frame
+    assert max(frames) <= PRESUPUESTO_MS
+    assert sum(frames) / len(frames) > 0.75 * PRESUPUESTO_MS   # sin dejar el frame vacío
+
+
+def test_con_limite_vencido_avanza_una_tanda():
+    grilla = grilla_con_paredes()
+    busqueda = BusquedaAStar(grilla, *pedidos(grilla, 1)[0])
+
+    assert not busqueda.avanzar(limite=time.perf_counter(), tanda=16)
+    assert busqueda.expandidos == 16 and busqueda.segundos_tanda > 0
+    busqueda.avanzar()
+    assert busqueda.ruta == grilla.ruta(busqueda.inicio, busqueda.fin)
+
+
+def test_una_tanda_carisima_no_traba_la_cola():
+    grilla = grilla_con_paredes()
+    planificador = PlanificadorRutas(grilla)
+    solicitudes = [planificador.pedir(a, b) for a, b in pedidos(grilla, 5)]
+    planificador._segundos_tanda = 1.0   # una tanda que tardó un segundo entero
+
+    for _ in range(10_000):
+        if not len(planificador):
+            break
+        planificador.procesar()
+    assert all(s.lista for s in solicitudes)
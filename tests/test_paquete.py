@@ -0,0 +1,46 @@
+"""Paquete de datos: lectura por clave y detección de fuentes más nuevas."""
+import os
+
+import pytest
+
+from Logic.Class.Paquete import (
+    IMAGENES, Paquete, construir_paquete, desactualizadas, fuentes_del_juego,
+)
+
+
+def test_leer_por_clave(tmp_path):
+    ruta = str(tmp_path / "datos.pak")
+    construir_paquete(ruta, [("especie/2", b"dos"), ("especie/1", b"uno"), ("atlas/sprites", b"{}")])
+    with Paquete(ruta) as paquete:
+        assert len(paquete) == 3
+        assert paquete.leer("especie/1") == b"uno"
+        assert "especie/3" not in paquete
+        with pytest.raises(KeyError):
+            paquete.leer("especie/3")
+
+
+def test_fuente_modificada_despues_de_armar(tmp_path):
+    fuentes = []
+    for nombre in ("especies.json", "Zona_Verde.png", "player.png"):
+        fuente = tmp_path / nombre
+        fuente.write_bytes(b"x")
+        os.utime(fuente, (1_000, 1_000))
+        fuentes.append(str(fuente))
+    ruta = str(tmp_path / "datos.pak")
+    construir_paquete(ruta, [("especies/indice", b"[]")])
+    os.utime(ruta, (2_000, 2_000))
+
+    assert desactualizadas(ruta, fuentes) == []
+    os.utime(fuentes[1], (3_000, 3_000))   # se editó un fondo
+    assert desactualizadas(ruta, fuentes) == [fuentes[1]]
+    assert desactualizadas(ruta, fuentes + [str(tmp_path / "no_existe.png")]) == [fuentes[1]]
+
+
+def test_fuentes_incluyen_fondos_y_sprites():
+    from GUI.atlas import SPRITES
+    from Logic.Class.Pokedex import ESPECIES_JSON
+
+    fuentes = fuentes_del_juego()
+    assert ESPECIES_JSON in fuentes
+    assert set(IMAGENES.values()) <= set(fuentes)
+    assert {fuente.ruta for fuente in SPRITES.values()} <= set(fuentes)
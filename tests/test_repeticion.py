@@ -0,0 +1,35 @@
+"""Una repetición vuelve a jugar el combate tal como fue."""
+import random
+
+from Logic.Class.Combate import Combate, equipos_de_ejemplo, politica_mas_daño
+from Logic.Class.Repeticion import EscritorRepeticiones, leer_repeticiones, reproducir
+
+
+def jugar(combate: Combate, semilla: int):
+    rng = random.Random(semilla)
+    while not combate.terminado:
+        combate.jugar_turno(politica_mas_daño(combate, 0, rng), politica_mas_daño(combate, 1, rng))
+
+
+def test_cambios_al_equipo_despues_de_empezar_no_cambian_la_repeticion(tmp_path):
+    equipo_a, equipo_b = equipos_de_ejemplo()
+    niveles = [p.nivel for p in equipo_a]
+    combate = Combate(equipo_a, equipo_b, semilla=1234)
+
+    # El dueño sigue usando su equipo antes de que se grabe el combate
+    for pokemon in equipo_a:
+        pokemon.subir_nivel(40)
+        pokemon.recibir_daño(15)
+    jugar(combate, 99)
+
+    ruta = str(tmp_path / "combates.rply")
+    with EscritorRepeticiones(ruta) as escritor:
+        escritor.escribir(combate)
+    (registro,) = leer_repeticiones(ruta)
+
+    assert [p.nivel for p in registro.equipo_a] == niveles
+    assert all(p.hp == p.hp_max for p in registro.equipo_a)
+    repetido = reproducir(registro)   # verifica ganador y turnos
+    assert bytes(repetido.historial) == bytes(combate.historial)
+    assert [p.hp for p in repetido.equipos[0]] == [p.hp for p in combate.equipos[0]]
+    assert [p.hp for p in repetido.equipos[1]] == [p.hp for p in combate.equipos[1]]
@@ -0,0 +1,180 @@
+"""
+Las vistas de login y registro con una base lenta: cada llamada a auth_db
+tarda LATENCIA segundos (AuthService(latency=...)) y la vista sigue
+corriendo on_update a 60 fps mientras espera, sin frames trabados.
+
+Necesitan pantalla (xvfb-run en un servidor). El AuthService solo, sin
+ventana, se prueba en tests/test_auth_service.py.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+arcade = pytest.importorskip("arcade")
+if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+    pytest.skip("Las vistas necesitan pantalla: xvfb-run python -m pytest", allow_module_level=True)
+
+import auth_db
+import main
+from auth_service import AuthService
+
+LATENCIA = 0.3
+FPS = 60
+CLAVE = "Abcdef1!"
+
+
+@pytest.fixture(scope="module")
+def ventana():
+    window = arcade.Window(main.SCREEN_WIDTH, main.SCREEN_HEIGHT, "pruebas", visible=False)
+    yield window
+    window.close()
+
+
+@pytest.fixture
+def window(ventana, tmp_path, monkeypatch):
+    """La ventana como la deja main(), con una base de prueba que ya tiene a "Ash"."""
+    monkeypatch.setattr(auth_db, "DB_NAME", str(tmp_path / "auth.db"))
+    monkeypatch.setattr(auth_db, "PBKDF2_ITERATIONS", 1_000)
+    auth_db.init_db()
+    assert auth_db.register_user("ash@gmail.com", CLAVE, "Ash")[0]
+
+    service = AuthService(workers=2, latency=LATENCIA)
+    ventana.current_user_email = None
+    ventana.current_profile_name = None
+    ventana.auth_service = service
+    ventana.mail_dispatcher = None
+    ventana.vistas = {}
+    yield ventana
+    service.shutdown()
+    auth_db.close_connection()
+
+
+def correr_frames(window, listo, limite: float = 5.0) -> list:
+    """
+    Llama a on_update de la vista actual a FPS hasta que listo() sea True,
+    como lo hace arcade.run(). Devuelve cuánto tardó cada frame.
+    """
+    tiempos = []
+    fin = time.perf_counter() + limite
+    while not listo():
+        assert time.perf_counter() < fin, "la operación no terminó"
+        inicio = time.perf_counter()
+        window.current_view.on_update(1 / FPS)
+        tiempos.append(time.perf_counter() - inicio)
+        time.sleep(max(0.0, 1 / FPS - tiempos[-1]))
+    return tiempos
+
+
+def revisar_ritmo(tiempos: list):
+    """Mientras se esperaba a la base corrieron frames y ninguno se trabó."""
+    # Al menos la mitad de los frames que caben en la latencia (el sleep es impreciso)
+    assert len(tiempos) >= LATENCIA * FPS / 2
+    espera = tiempos[:-1]   # el último frame recibe el resultado y cambia de vista
+    assert max(espera) < 1 / FPS, f"frame de {max(espera) * 1000:.1f} ms esperando a la base"
+    assert max(tiempos) < LATENCIA
+
+
+def iniciar_sesion(window, usuario: str, clave: str):
+    login = main.vista(window, main.LoginView)
+    window.show_view(login)
+    login.username_input.text = usuario
+    login.password_input.text = clave
+    login.on_click_login(None)
+    return login
+
+
+def test_login_sin_trabar_frames(window):
+    inicio = time.perf_counter()
+    login = iniciar_sesion(window, "ash", CLAVE)   # el perfil no distingue mayúsculas
+    assert login.status_label.text == "Verificando..."
+
+    tiempos = correr_frames(window, lambda: window.current_view is not login)
+
+    assert time.perf_counter() - inicio >= LATENCIA
+    assert isinstance(window.current_view, main.GameView)
+    assert window.current_profile_name == "Ash"
+    revisar_ritmo(tiempos)
+
+
+def test_login_con_clave_incorrecta(window):
+    login = iniciar_sesion(window, "Ash", "Otra1234!")
+
+    tiempos = correr_frames(window, lambda: login.login_future is None)
+
+    assert window.current_view is login
+    assert login.status_label.text == "Contraseña incorrecta"
+    assert window.current_profile_name is None
+    revisar_ritmo(tiempos)
+
+
+def test_registro_con_correo_en_uso(window):
+    registro = main.vista(window, main.RegisterView)
+    window.show_view(registro)
+    registro.email_input.text = "ash@gmail.com"
+    registro.password_input.text = CLAVE
+    registro.profile_input.text = "Brock"
+    registro.on_click_send_code(None)
+
+    tiempos = correr_frames(window, lambda: registro.conflict_future is None)
+
+    assert registro.status_label.text == "Ya existe una cuenta con ese correo"
+    assert registro.mail_job is None and window.mail_dispatcher is None
+    revisar_ritmo(tiempos)
+
+
+def test_verificar_codigo_crea_la_cuenta(window):
+    verificar = main.vista(window, main.VerifyCodeView)
+    verificar.preparar("1234", "misty@gmail.com", CLAVE, "Misty")
+    window.show_view(verificar)
+    verificar.code_input.text = "1234"
+    verificar.on_click_verify(None)
+
+    tiempos = correr_frames(window, lambda: window.current_view is not verificar)
+
+    assert isinstance(window.current_view, main.GameView)
+    assert window.current_user_email == "misty@gmail.com"
+    assert window.current_profile_name == "Misty"
+    assert auth_db.find_conflict("misty@gmail.com", "misty") == "email"
+    revisar_ritmo(tiempos)
+
+
+def esperar(window, segundos: float) -> list:
+    fin = time.perf_counter() + segundos
+    return correr_frames(window, lambda: time.perf_counter() >= fin)
+
+
+def test_login_pendiente_se_descarta_al_ir_al_registro(window):
+    login = iniciar_sesion(window, "Ash", CLAVE)
+    login.on_click_go_to_register(None)
+    main.mostrar(window, main.LoginView)   # y vuelve antes de que la base responda
+
+    esperar(window, 2 * LATENCIA)
+
+    assert window.current_view is login
+    assert login.login_future is None
+    assert window.current_profile_name is None
+
+
+def test_registro_pendiente_no_usa_los_datos_del_siguiente(window):
+    verificar = main.vista(window, main.VerifyCodeView)
+    verificar.preparar("1234", "misty@gmail.com", CLAVE, "Misty")
+    window.show_view(verificar)
+    verificar.code_input.text = "1234"
+    verificar.on_click_verify(None)
+    verificar.on_click_back(None)
+
+    # Otro registro antes de que termine el primero: el clic no se ignora
+    verificar.preparar("5678", "brock@gmail.com", CLAVE, "Brock")
+    window.show_view(verificar)
+    verificar.code_input.text = "5678"
+    verificar.on_click_verify(None)
+    assert verificar.status_label.text == "Creando tu cuenta..."
+
+    correr_frames(window, lambda: window.current_view is not verificar)
+
+    assert isinstance(window.current_view, main.GameView)
+    assert window.current_user_email == "brock@gmail.com"
+    assert window.current_profile_name == "Brock"
+    assert auth_db.find_conflict("brock@gmail.com", "Brock") == "email"